@@ -96,6 +96,10 @@ These take the forms::
   Bhhmm+ddmm
   Gddd.d+dd.d
 
+deg_to_IAU_str() makes the part after the letter.  For whole catalogs the
+iau submodule has IAU_names(longitude,latitude,format,prefix), which makes
+a bytes array of names, and IAUNameIndex, which finds catalog rows by name.
+
 Functions
 =========
 
@@ -106,6 +110,7 @@ Methods to convert to and from ISO times::
 
   format_ISO_time(year,doy,timestr)
   ISOtime2datetime(ISOtime):
+  ISOtime_array(ISOtimes)
 
 VSR Times
 ---------
@@ -114,6 +119,7 @@ To and from various VSR time formats::
 
   incr_VSR_timestamp(timestr)  incr_VSR_timestring(timestr)
   make_VSR_timestring()
+  VSR_ticks(count,period)      (ticks submodule; an async generator)
   VSR_to_datetime(VSR_time_tuple)
   VSR_to_timetuple(VSR_tuple)
   VSR_timestring_to_ISOtime(timestr)
@@ -122,6 +128,8 @@ To and from various VSR time formats::
   VSR_tuple_to_MPL(year,doy,seconds)
   VSR_tuple_to_datetime(year,doy,start_sec)
   VSR_tuple_to_timestamp(year,doy,start_sec)
+  VSR_array_to_timestamp(year,doy,seconds)
+  VSR_array_to_datetime64(year,doy,seconds)
   VSR_timestamp()
 
 Time strings
@@ -130,6 +138,7 @@ Time strings
 Various functions to convert to and from time strings::
 
   DDDMM_to_dec_deg(DDDMM)
+  decimal_to_sexagesimal(decimal,places,decimals,signed,lead)
   HHMM_to_timetuple(time_string)
   HHMM_to_dec_deg(HHMM)
   HHMMSS_to_seconds(string)
@@ -137,6 +146,97 @@ Various functions to convert to and from time strings::
   timetuple_to_HHMM(time)
   YYYYDDD_datecode(year, midfix, doy)
 
+Formatting arrays of times
+--------------------------
+
+From the formatters submodule, patterns like "%Y %j %5S" compiled once to
+write whole arrays of times as fixed-width strings::
+
+  compile_format(pattern).format(times)
+  format_times(times,pattern)
+
+Time arrays
+-----------
+
+TimeArray, from the timearray submodule, holds times once as int64
+nanoseconds and gives them as UNIX, MJD, JD, matplotlib, datetime64, VSR or
+ISO times, computing each form when it is first used::
+
+  TimeArray.from_vsr(year,doy,seconds).mjd
+
+The interop submodule passes them to and from pandas and Arrow, if those are
+installed, sharing the int64 buffer::
+
+  to_pandas(times,kind)        from_pandas(index)
+  to_arrow(times,kind)         from_arrow(array)
+
+Leap seconds
+------------
+
+From the leapseconds submodule, with a bundled table which can be updated
+from an IERS or NIST file::
+
+  load_leap_seconds(path)
+  TAI_minus_UTC(UnixTime)
+  UTC_to_TAI(UnixTime)         TAI_to_UTC(TAI)
+  UTC_to_GPS(UnixTime)         GPS_to_UTC(GPS)
+  TAI_to_GPS(TAI)              GPS_to_TAI(GPS)
+
+Log archives
+------------
+
+From the archive submodule, the times in many large log files, parsed from
+memory maps in a pool of processes and sorted, with the file and line of
+each::
+
+  extract_timestamps(paths,"logtime",year=year,doy=doy,workers=8)
+
+TimestampCache, from the cache submodule, keeps the times parsed from a file
+as memory mapped .npy files until the file changes::
+
+  extract_timestamps(paths,"logtime",year=year,doy=doy,cache=True)
+  TimestampCache().load(path,parser_name,parse)
+
+Columns of unknown format
+-------------------------
+
+From the detect submodule, the format of a column of time strings found from
+a sample, then every row parsed at once, with a mask of the rows which are
+not in that format::
+
+  detect_format(sample)
+  parse_column(values,year=year,doy=doy).times
+
+Schedules
+---------
+
+From the schedule submodule, an index of the passes in DSN schedules (date
+YYYY-DDD, start and end HHMM) answering which are active at given times::
+
+  index = load_schedule(path)
+  index.at(UnixTime)    index.overlapping(begin,end)    index.active(times)
+
+Time zones
+----------
+
+Shared tzinfo instances: utc, and fixed offsets by name in 'timezones',
+including the standard times of the DSN complexes (GDSCC, CDSCC, MDSCC).
+Times of day in a zone are found for whole arrays with one addition::
+
+  get_timezone(zone)           station_timezone(dss)
+  register_timezone(name,hours)
+  local_time_of_day(times,zone)
+  local_HHMM(times,zone)
+
+Instrumentation
+---------------
+
+The instrument submodule counts and times the calls to the functions when
+enabled, by enable() or by setting DATESTIMES_INSTRUMENT, and costs nothing
+otherwise::
+
+  instrument.enable(names)     instrument.report()     instrument.dump(path)
+
 Miscellaneous
 -------------
 
@@ -147,7 +247,11 @@ Various useful functions::
   format_now()
   get_current_week()
   get_date()
+  GMST(time,mjd=False,radians=False)
   logtime_to_timetuple(time_string)
+  LST(time,longitude,mjd=False,radians=False)
+  iter_logtimes(logfile,year,doy)
+  logtime_chunks(logfile,year,doy)
   logtime()
   macro_log_time_to_UnixTime(year,timestr)
   mpldate2doy(mpldate)
@@ -155,7 +259,12 @@ Various useful functions::
   nowgmt()
   now_string()
   parse_date(ses_date)
+  midnight_cache_clear()
+  midnight_cache_info()
   seconds(timedelta)
+  set_clock_precision(precision=None,names=None)
+  set_day_table_range(first_year,last_year)
+  set_midnight_cache_size(maxsize)
   time_int_to_decimal(time)
   timestamp_to_str_with_ms(TS)
   timetuple_to_datetime(timetuple)
@@ -165,17 +274,98 @@ Various useful functions::
   MJD_to_UnixTime(MJD)
   
 """
-import calendar
 import datetime as DT
-from math import pi
-import numpy
-import re
+from functools import lru_cache
+from itertools import islice
+from math import modf, pi
+import numbers
+from os import environ
 from sys import argv
+from threading import Lock
 import time as T
 
-import logging
-logging.basicConfig()
-logger = logging.getLogger(__name__)
+class _Deferred(object):
+  """
+  Stands in for a module or other global until one of its attributes is used
+
+  Scripts which only need the string and scalar functions then do not pay
+  for importing NumPy or logging.  On first use the object is created by
+  calling 'load' and replaces this placeholder in the package namespace, so
+  later uses cost nothing extra.
+  """
+  def __init__(self, name, load):
+    self.__name = name
+    self.__load = load
+
+  def __getattr__(self, attr):
+    value = self.__load()
+    globals()[self.__name] = value
+    return getattr(value, attr)
+
+  def __repr__(self):
+    return "<deferred %s>" % self.__name
+
+def _module(name):
+  """
+  Placeholder for a module which is imported when it is first used
+  """
+  return _Deferred(name, lambda: __import__(name))
+
+calendar = _module("calendar")
+logging = _module("logging")
+numpy = _module("numpy")
+re = _module("re")
+
+logger = _Deferred("logger", lambda: logging.getLogger(__name__))
+
+# public names defined in submodules, which are imported on first use
+_submodule_names = {"TimeArray": "timearray",
+                    "extract_timestamps": "archive",
+                    "detect_format": "detect",
+                    "parse_column": "detect",
+                    "ParsedColumn": "detect",
+                    "Timestamps": "archive",
+                    "TimestampCache": "cache",
+                    "IAU_names": "iau",
+                    "IAUNameIndex": "iau",
+                    "instrument": "instrument",
+                    "as_time_array": "interop",
+                    "from_arrow": "interop",
+                    "from_pandas": "interop",
+                    "to_arrow": "interop",
+                    "to_pandas": "interop",
+                    "load_schedule": "schedule",
+                    "parse_schedule": "schedule",
+                    "ScheduleIndex": "schedule",
+                    "Tick": "ticks",
+                    "VSR_ticks": "ticks",
+                    "compile_format": "formatters",
+                    "format_times": "formatters",
+                    "TimeFormat": "formatters",
+                    "GPS_to_TAI": "leapseconds",
+                    "GPS_to_UTC": "leapseconds",
+                    "LeapSecondTable": "leapseconds",
+                    "load_leap_seconds": "leapseconds",
+                    "TAI_minus_UTC": "leapseconds",
+                    "TAI_to_GPS": "leapseconds",
+                    "TAI_to_UTC": "leapseconds",
+                    "UTC_to_GPS": "leapseconds",
+                    "UTC_to_TAI": "leapseconds"}
+
+def __getattr__(name):
+  """
+  Imports the submodule which provides 'name' when it is first used
+  """
+  if name in _submodule_names or name in _submodule_names.values():
+    from importlib import import_module
+    module = import_module("." + _submodule_names.get(name, name), __name__)
+    value = getattr(module, name, module)
+    globals()[name] = value
+    return value
+  raise AttributeError("module %r has no attribute %r" % (__name__, name))
+
+def __dir__():
+  return sorted(set(globals()) | set(_submodule_names))
 
 sec_per_day = 24.*60*60
 hr_to_rad = pi/12.
@@ -183,37 +373,157 @@ deg_to_rad = pi/180.
 
 # ------------------------ time zone classes -----------------------------
 
+_no_offset = DT.timedelta(0)
+
 class UTC(DT.tzinfo):
   """
   This subclass of tzinfo defines UTC
+
+  Use the shared instance 'utc' rather than making new ones.
   """
   def utcoffset(self,dt):
-    return DT.timedelta(hours=0,minutes=0)
+    return _no_offset
 
   def tzname(self,dt):
     return "UTC"
 
   def dst(self,dt):
-    return DT.timedelta(0)
+    return _no_offset
 
 class ST(DT.tzinfo):
   """
   This subclass of tzinfo defines standard time in the current timezone
+
+  The offset is that of the system's time zone without daylight saving
+  when the instance is made.
   """
+  def __init__(self):
+    self.offset = DT.timedelta(seconds=-T.timezone)
+
+  def utcoffset(self,dt):
+    return self.offset
+
   def tzname(self,dt):
     return "ST"
 
   def dst(self,dt):
-    return DT.timedelta(0)
+    return _no_offset
 
 utc = UTC()
 
+# shared fixed-offset zones, by name; the DSN complexes keep standard time
+timezones = {"UTC":       DT.timezone.utc,
+             "GDSCC":     DT.timezone(DT.timedelta(hours=-8), "PST"),
+             "CDSCC":     DT.timezone(DT.timedelta(hours=10), "AEST"),
+             "MDSCC":     DT.timezone(DT.timedelta(hours=1), "CET")}
+timezones["Goldstone"] = timezones["GDSCC"]
+timezones["Canberra"] = timezones["CDSCC"]
+timezones["Madrid"] = timezones["MDSCC"]
+
+# complex of each DSS antenna, by the tens digit of its number
+_complexes = {1: "GDSCC", 2: "GDSCC", 3: "CDSCC", 4: "CDSCC", 5: "MDSCC",
+              6: "MDSCC"}
+
+def get_timezone(zone):
+  """
+  A shared tzinfo for a name in 'timezones' or a fixed offset in hours
+
+  Zones made for offsets are added to 'timezones', so each is made once.
+
+  @param zone : name or hours east of UTC
+  @type  zone : str, float or tzinfo
+
+  @return: tzinfo
+  """
+  if isinstance(zone, DT.tzinfo):
+    return zone
+  if isinstance(zone, str):
+    return timezones[zone]
+  key = "%+g" % zone
+  try:
+    return timezones[key]
+  except KeyError:
+    return timezones.setdefault(key,
+                                DT.timezone(DT.timedelta(hours=zone)))
+
+def station_timezone(dss):
+  """
+  The zone of the complex of a DSS antenna
+
+  @param dss : antenna number, such as 43
+  @type  dss : int
+
+  @return: tzinfo
+  """
+  try:
+    return timezones[_complexes[dss//10]]
+  except KeyError:
+    raise ValueError("DSS-%d is not at a known complex" % dss)
+
+def register_timezone(name, hours):
+  """
+  Adds a fixed-offset zone to 'timezones'
+
+  @param hours : offset east of UTC
+  @type  hours : float
+  """
+  timezones[name] = DT.timezone(DT.timedelta(hours=hours), name)
+
+def _offset_seconds(zone):
+  """
+  Seconds east of UTC of a fixed-offset zone
+  """
+  return get_timezone(zone).utcoffset(None).total_seconds()
+
+def local_time_of_day(times, zone="UTC"):
+  """
+  Seconds since local midnight of UNIX times, in a fixed-offset zone
+
+  @param times : UNIX times
+  @type  times : float or array-like
+
+  @param zone : anything get_timezone() accepts
+  @type  zone : str, int, float or tzinfo
+
+  @return: float or float64 numpy.ndarray
+  """
+  offset = _offset_seconds(zone)
+  if _is_scalar(times):
+    return (times + offset) % 86400
+  return numpy.remainder(numpy.add(times, offset, dtype=float), 86400)
+
+def local_HHMM(times, zone="UTC"):
+  """
+  HHMM strings, as from timetuple_to_HHMM(), of UNIX times in a
+  fixed-offset zone
+
+  @return: str, or numpy.ndarray of 4-byte strings for array-likes
+  """
+  offset = _offset_seconds(zone)
+  if _is_scalar(times):
+    minutes = int((times + offset) % 86400)//60
+    return "%02d%02d" % divmod(minutes, 60)
+  from .formatters import format_times
+  return format_times(numpy.add(times, offset, dtype=float), "%H%M")
+
+def _is_scalar(*args):
+  """
+  True if every argument is a plain number rather than an array-like
+  """
+  for arg in args:
+    if not isinstance(arg, numbers.Number):
+      return False
+  return True
+
 # general conversions
 
 def calendar_date(year, doy):
   """
   Calendar date from day of year
 
+  Either argument may also be an array, in which case the result is a tuple
+  of arrays broadcast against each other.
+
   @param year : int
 
   @param doy : int
@@ -222,6 +532,11 @@ def calendar_date(year, doy):
   @return: tuple of ints
     (year, month, day)
   """
+  if not _is_scalar(year, doy):
+    return day_table._lookup_array(year, doy)[:3]
+  row = day_table.get(year, doy)
+  if row is not None:
+    return year, row[0], row[1]
   if doy < 32:
     month = 1
     day = doy
@@ -253,7 +568,11 @@ def day_of_week(doy, year):
   5 - thursday,
   6 - friday,
   7 - saturday,
+
+  Arrays are accepted for either argument.
   """
+  if not _is_scalar(doy, year):
+    return _day_of_week_array(doy, year)
   day = julian_date( year, (doy + 0.5) ) + 2
   return int((day - 7 * (int(day - 1) // 7)))
 
@@ -273,7 +592,11 @@ def julian_date (year, doy):
 
   @return: float
     Julian Day (J.D) = number of days since noon on Jan. 1, 4713 BC
+
+  Arrays are accepted for either argument.
   """
+  if not _is_scalar(year, doy):
+    return _julian_date_array(year, doy)
   prev_year = year - 1
   century = prev_year // 100
   num_leaps = int(prev_year // 4) - century + int(century // 4)
@@ -292,7 +615,14 @@ def day_of_year (year, month, day):
 
   @return: int
     the day of the year where Jan. 1 is DOY 1
+
+  Arrays are accepted for any argument.
   """
+  if not _is_scalar(year, month, day):
+    return _day_of_year_array(year, month, day)
+  doy = day_table.doy(year, month, day)
+  if doy is not None:
+    return doy
   day = day + (month -1) * 30. + (int)((month + 1) * 0.61) - 2
   if (month <= 2):
     day = day + month
@@ -309,7 +639,11 @@ def leap_year (year):
 
   @return: int
     1 if year is leap year, otherwise 0
+
+  An array of years gives an array of 1s and 0s.
   """
+  if not _is_scalar(year):
+    return _leap_year_array(year)
   if (year % 100 == 0 ): # Gregorian fix
     if (year % 400 == 0 ):
       return (1)
@@ -321,6 +655,305 @@ def leap_year (year):
     else:
       return (0)
 
+# ------------------------ vectorized calendar kernel -----------------------
+#
+# These do the same arithmetic as the scalar functions above on whole arrays.
+# Branches become masks so that every element is computed in a single pass;
+# int() truncation becomes astype(int).
+
+def _calendar_date_array(year, doy):
+  """
+  Calendar dates for arrays of years and days of year
+  """
+  year, doy = numpy.broadcast_arrays(numpy.asarray(year), numpy.asarray(doy))
+  leap = _leap_year_array(year)
+  # from March on, days are counted as if it were a leap year
+  late = doy + 1 - leap
+  month = ((late + 31.39)/30.61).astype(int)
+  day = late + 2 - (month-1)*30 - ((month+1)*0.61).astype(int)
+  february = doy < 60 + leap
+  month = numpy.where(february, 2, month)
+  day = numpy.where(february, doy - 31, day)
+  january = doy < 32
+  month = numpy.where(january, 1, month)
+  day = numpy.where(january, doy, day)
+  return numpy.array(year), month, day
+
+def _day_of_week_array(doy, year):
+  """
+  Numeric day of week (1 = Sunday) for arrays of days of year and years
+  """
+  day = _julian_date_array(year, numpy.add(doy, 0.5)) + 2
+  return (day - 7 * (numpy.trunc(day - 1) // 7)).astype(int)
+
+def _julian_date_array(year, doy):
+  """
+  Julian dates for arrays of years and days of year
+  """
+  prev_year = numpy.asarray(year) - 1
+  century = prev_year // 100
+  num_leaps = prev_year // 4 - century + century // 4
+  return 1721425. + 365. * prev_year + num_leaps - 0.5 + numpy.asarray(doy)
+
+def _day_of_year_array(year, month, day):
+  """
+  Days of year for arrays of years, months and days
+  """
+  month = numpy.asarray(month)
+  doy = day + (month - 1) * 30. + ((month + 1) * 0.61).astype(int) - 2
+  doy = numpy.where(month <= 2, doy + month, doy - 1 + _leap_year_array(year))
+  return doy.astype(int)
+
+def _leap_year_array(year):
+  """
+  1 where the year is a leap year, otherwise 0
+  """
+  year = numpy.asarray(year)
+  return (((year % 4 == 0) & (year % 100 != 0)) | (year % 400 == 0)).astype(int)
+
+def _unix_day_array(year, doy):
+  """
+  Days from 1970/01/01 to (year, doy), as int64
+  """
+  prev_year = numpy.asarray(year, dtype=numpy.int64) - 1
+  return (365*prev_year + prev_year//4 - prev_year//100 + prev_year//400
+          + doy - 719163)
+
+def _civil_from_days_array(days):
+  """
+  Year, month, day and day of year, as int32, from days since 1970/01/01
+
+  This is H. Hinnant's civil_from_days() on whole arrays; years are counted
+  from March so that leap days come at the end.
+  """
+  days = numpy.asarray(days, dtype=numpy.int64) + 719468
+  era = days//146097
+  day_of_era = (days - era*146097).astype(numpy.int32)
+  year_of_era = (day_of_era - day_of_era//1460 + day_of_era//36524
+                 - day_of_era//146096)//365
+  day_of_march_year = day_of_era - (365*year_of_era + year_of_era//4
+                                    - year_of_era//100)
+  march_month = (5*day_of_march_year + 2)//153
+  day = day_of_march_year - (153*march_month + 2)//5 + 1
+  month = march_month + 3
+  month -= 12*(march_month >= 10)
+  year = year_of_era + (era*400).astype(numpy.int32) + (month <= 2)
+  prev_year = year - 1
+  doy = (days - 719468 - (365*prev_year.astype(numpy.int64) + prev_year//4
+                          - prev_year//100 + prev_year//400 - 719163))
+  return year, month, day, doy.astype(numpy.int32)
+
+def _week_number_array(year, doy):
+  """
+  Week numbers for arrays of years and days of year
+  """
+  doy = numpy.asarray(doy)
+  weekday1 = _day_of_week_array(1, year)
+  first_doy_of_week_2 = 8 - (weekday1 - 1) % 7
+  return numpy.where(doy <= weekday1, 52, 1 + (doy - first_doy_of_week_2)/7)
+
+# ------------------------ precomputed day table ----------------------------
+
+class DayTable(object):
+  """
+  Calendar quantities for every day in a range of years
+
+  Given (year, doy) this gives the month, the day of the month, the
+  proleptic Gregorian ordinal (as from datetime.date.toordinal()), the MJD
+  and the UNIX time of midnight by indexing tables which are computed once,
+  when first needed.  Month and day depend only on whether the year is a
+  leap year, so they take two rows of 367 entries; the rest follows from
+  the ordinal of the start of each year.  Days outside the range of years
+  are computed arithmetically instead.
+  """
+  def __init__(self, first_year=1950, last_year=2100):
+    """
+    @param first_year : first year in the table
+    @type  first_year : int
+
+    @param last_year : last year in the table
+    @type  last_year : int
+    """
+    if not 1 <= first_year <= last_year <= 9999:
+      raise ValueError("years must satisfy 1 <= %s <= %s <= 9999"
+                       % (first_year, last_year))
+    self.first_year = first_year
+    self.last_year = last_year
+    self._year_start = None
+    self._arrays = None
+    self._by_day = None
+
+  def __repr__(self):
+    return "DayTable(%d, %d)" % (self.first_year, self.last_year)
+
+  def _build(self):
+    years = range(self.first_year, self.last_year + 1)
+    self._leap = [leap_year(year) for year in years]
+    # ordinal of day 0, the day before January 1
+    self._year_start = [DT.date(year, 1, 1).toordinal() - 1 for year in years]
+    self._month = ([0], [0])
+    self._day = ([0], [0])
+    self._days_before_month = ([], [])
+    for leap in (0, 1):
+      for month in range(1, 14):
+        self._days_before_month[leap].append(
+                            _days_before_month[month] + (month > 2)*leap)
+      for month in range(1, 13):
+        for day in range(1, self._days_before_month[leap][month]
+                             - self._days_before_month[leap][month-1] + 1):
+          self._month[leap].append(month)
+          self._day[leap].append(day)
+    # index 0 is unused so that doy can be used directly, and day 366 of a
+    # common year is padding
+    self._month[0].append(0)
+    self._day[0].append(0)
+    self._days_before_month[0].insert(0, 0)
+    self._days_before_month[1].insert(0, 0)
+
+  def get(self, year, doy):
+    """
+    Table entry for a valid integer (year, doy) in the range of the table
+
+    @return: (month, day, ordinal) or None
+    """
+    if self._year_start is None:
+      self._build()
+    index = year - self.first_year
+    if (index.__class__ is int and 0 <= index < len(self._leap)
+        and doy.__class__ is int):
+      leap = self._leap[index]
+      if 0 < doy <= 365 + leap:
+        return (self._month[leap][doy], self._day[leap][doy],
+                self._year_start[index] + doy)
+    return None
+
+  def doy(self, year, month, day):
+    """
+    Day of year for a valid integer date in the range of the table, or None
+    """
+    if self._year_start is None:
+      self._build()
+    index = year - self.first_year
+    if (index.__class__ is int and 0 <= index < len(self._leap)
+        and month.__class__ is int and day.__class__ is int
+        and 0 < month < 13):
+      days_before_month = self._days_before_month[self._leap[index]]
+      if 0 < day <= days_before_month[month+1] - days_before_month[month]:
+        return days_before_month[month] + day
+    return None
+
+  def lookup(self, year, doy):
+    """
+    Month, day, ordinal, MJD and UNIX time of midnight for (year, doy)
+
+    For arrays the table is indexed with the whole array at once; elements
+    which are not in the table are computed arithmetically.
+
+    @param year : int or array of int
+
+    @param doy : int or array of int
+
+    @return: tuple (month, day, ordinal, MJD, unix_midnight)
+    """
+    if not _is_scalar(year, doy):
+      year, month, day, ordinal = self._lookup_array(year, doy)
+    else:
+      row = self.get(year, doy)
+      if row is None:
+        year, month, day = calendar_date(year, doy)
+        prev_year = year - 1
+        ordinal = (365*prev_year + prev_year//4 - prev_year//100
+                   + prev_year//400 + doy)
+      else:
+        month, day, ordinal = row
+    return month, day, ordinal, ordinal - 678576, (ordinal - 719163)*86400
+
+  def _lookup_array(self, year, doy):
+    """
+    Year, month, day and ordinal arrays from the table or arithmetically
+    """
+    if self._arrays is None:
+      if self._year_start is None:
+        self._build()
+      self._arrays = (numpy.array(self._leap), numpy.array(self._year_start),
+                      numpy.array(self._month), numpy.array(self._day))
+    leaps, year_start, months, days = self._arrays
+    year, doy = numpy.broadcast_arrays(numpy.asarray(year), numpy.asarray(doy))
+    year = numpy.array(year)
+    if year.dtype.kind not in "iu":
+      year, month, day = _calendar_date_array(year, doy)
+      return year, month, day, _unix_day_array(year, doy) + 719163
+    index = year - self.first_year
+    covered = (index >= 0) & (index < len(leaps))
+    index = numpy.where(covered, index, 0)
+    leap = leaps[index]
+    covered &= (doy >= 1) & (doy <= 365 + leap) & (doy == doy.astype(int))
+    if covered.all():
+      doy = doy.astype(int)
+      return year, months[leap, doy], days[leap, doy], year_start[index] + doy
+    # arithmetic for everything, then the table where it applies
+    month, day = _calendar_date_array(year, doy)[1:]
+    ordinal = _unix_day_array(year, doy) + 719163
+    rows = numpy.flatnonzero(covered)
+    tabled_doy = doy[rows].astype(int)
+    month[rows] = months[leap[rows], tabled_doy]
+    day[rows] = days[leap[rows], tabled_doy]
+    ordinal[rows] = year_start[index[rows]] + tabled_doy
+    return year, month, day, ordinal
+
+  def civil_from_days(self, days):
+    """
+    Year, month, day and day of year arrays from days since 1970/01/01
+
+    Days in the range of the table are looked up, with the four int16 values
+    for a day packed into one int64 so that a single gather fetches them;
+    other days are computed arithmetically.
+
+    @param days : int array
+
+    @return: tuple of four arrays of the shape of 'days'
+    """
+    if self._by_day is None:
+      first = _unix_day_array(self.first_year, 1)
+      count = _unix_day_array(self.last_year + 1, 1) - first
+      civil = numpy.array(
+                 _civil_from_days_array(numpy.arange(first, first + count)),
+                 dtype=numpy.int16)
+      self._by_day = (first, numpy.ascontiguousarray(civil.T).view(numpy.int64))
+    first, by_day = self._by_day
+    days = numpy.asarray(days)
+    index = (days - first).ravel()
+    covered = (index >= 0) & (index < len(by_day))
+    if covered.all():
+      civil = by_day.take(index).view(numpy.int16).reshape(-1, 4).T
+    else:
+      civil = numpy.array(_civil_from_days_array(index + first))
+      rows = numpy.flatnonzero(covered)
+      tabled = by_day.take(index[rows]).view(numpy.int16)
+      civil[:, rows] = tabled.reshape(-1, 4).T
+    return tuple(column.reshape(days.shape) for column in civil)
+
+day_table = DayTable()
+
+def _civil_from_days(days):
+  """
+  Year, month, day and day of year arrays from days since 1970/01/01
+  """
+  return day_table.civil_from_days(days)
+
+def set_day_table_range(first_year, last_year):
+  """
+  Replaces the day table with one covering the given years
+
+  @param first_year : first year in the table
+  @type  first_year : int
+
+  @param last_year : last year in the table
+  @type  last_year : int
+  """
+  global day_table
+  day_table = DayTable(first_year, last_year)
+
 # --------------- conversion between Python representations -----------------------
 
 def ISOtime2datetime(ISOtime):
@@ -339,6 +972,104 @@ def ISOtime2datetime(ISOtime):
 
     @return: datetime object
     """
+    dt = _ISOtime_by_slicing(ISOtime)
+    if dt is None:
+      dt = _ISOtime_by_strptime(ISOtime)
+    return dt
+
+def _ISOtime_by_slicing(ISOtime):
+  """
+  Parses the fixed-width forms accepted by ISOtime2datetime()
+
+  The layout is picked from the length and the separator positions and the
+  fields are sliced out directly.  Anything else, including strings whose
+  fields are out of range, gives None so that _ISOtime_by_strptime() can
+  deal with it exactly as before.
+  """
+  length = len(ISOtime)
+  fraction = ""
+  if length == 19 or (length > 20 and ISOtime[19:20] == "."):
+    # YYYY-MM-DDTHH:MM:SS, YYYY-MM-DD HH:MM:SS(.ffffff)
+    if (ISOtime[4] != "-" or ISOtime[7] != "-" or ISOtime[13] != ":"
+        or ISOtime[16] != ":"):
+      return None
+    if length == 19:
+      if ISOtime[10] != "T" and ISOtime[10] != " ":
+        return None
+    elif ISOtime[10] == " " and length < 27:
+      fraction = ISOtime[20:]
+    else:
+      return None
+    date = (ISOtime[0:4], ISOtime[5:7], ISOtime[8:10])
+    clock = (ISOtime[11:13], ISOtime[14:16], ISOtime[17:19])
+  elif length == 16:
+    # YYYY-MM-DDTHH:MM or YYYYDDDTHHMMSS.f
+    if (ISOtime[10] == "T" and ISOtime[4] == "-" and ISOtime[7] == "-"
+        and ISOtime[13] == ":"):
+      date = (ISOtime[0:4], ISOtime[5:7], ISOtime[8:10])
+      clock = (ISOtime[11:13], ISOtime[14:16], "00")
+    elif ISOtime[7] == "T" and ISOtime[14] == ".":
+      date = (ISOtime[0:4], ISOtime[4:7])
+      clock = (ISOtime[8:10], ISOtime[10:12], ISOtime[12:14])
+      fraction = ISOtime[15:]
+    else:
+      return None
+  elif length == 17 and ISOtime[8] == "T":
+    # YYYY-DDDTHH:MM:SS
+    if ISOtime[4] != "-" or ISOtime[11] != ":" or ISOtime[14] != ":":
+      return None
+    date = (ISOtime[0:4], ISOtime[5:8])
+    clock = (ISOtime[9:11], ISOtime[12:14], ISOtime[15:17])
+  elif length == 14:
+    # YYYY-DDDTHH:MM or YYYYDDDTHHMMSS
+    if ISOtime[8] == "T" and ISOtime[4] == "-" and ISOtime[11] == ":":
+      date = (ISOtime[0:4], ISOtime[5:8])
+      clock = (ISOtime[9:11], ISOtime[12:14], "00")
+    elif ISOtime[7] == "T":
+      date = (ISOtime[0:4], ISOtime[4:7])
+      clock = (ISOtime[8:10], ISOtime[10:12], ISOtime[12:14])
+    else:
+      return None
+  elif length == 15 and ISOtime[8] == "T":
+    # YYYYMMDDTHHMMSS
+    date = (ISOtime[0:4], ISOtime[4:6], ISOtime[6:8])
+    clock = (ISOtime[9:11], ISOtime[11:13], ISOtime[13:15])
+  elif length == 12 and ISOtime[7] == "T":
+    # YYYYDDDTHHMM
+    date = (ISOtime[0:4], ISOtime[4:7])
+    clock = (ISOtime[8:10], ISOtime[10:12], "00")
+  elif 16 < length < 22 and ISOtime[7] == "T" and ISOtime[14] == ".":
+    # YYYYDDDTHHMMSS.ffffff
+    date = (ISOtime[0:4], ISOtime[4:7])
+    clock = (ISOtime[8:10], ISOtime[10:12], ISOtime[12:14])
+    fraction = ISOtime[15:]
+  else:
+    return None
+  if not ("".join(date) + "".join(clock) + fraction).isdigit():
+    return None
+  try:
+    if fraction:
+      microsecond = int(fraction + "00000"[len(fraction)-1:])
+    else:
+      microsecond = 0
+    if len(date) == 3:
+      return DT.datetime(int(date[0]), int(date[1]), int(date[2]),
+                         int(clock[0]), int(clock[1]), int(clock[2]),
+                         microsecond)
+    doy = int(date[1])
+    if doy < 1 or doy > 366:
+      return None
+    # like strptime, day 366 of a common year is January 1 of the next
+    return DT.datetime(int(date[0]), 1, 1, int(clock[0]), int(clock[1]),
+                       int(clock[2]), microsecond) + DT.timedelta(doy - 1)
+  except (ValueError, OverflowError):
+    return None
+
+def _ISOtime_by_strptime(ISOtime):
+    """
+    General parser behind ISOtime2datetime(), using regular expressions to
+    pick a format for strptime()
+    """
     if re.search("T",ISOtime):
       if re.search(":",ISOtime):
         if re.search("-",ISOtime):
@@ -371,13 +1102,230 @@ def ISOtime2datetime(ISOtime):
       else:
         return None
     else:
-      if re.search('\.',ISOtime):
+      if re.search(r'\.',ISOtime):
         # YYYY-MM-DD HH:MM:SS.sss
         return DT.datetime.strptime(ISOtime, "%Y-%m-%d %H:%M:%S.%f")
       else:
         # YYYY-MM-DD HH:MM:SS
         return DT.datetime.strptime(ISOtime, "%Y-%m-%d %H:%M:%S")
 
+# fixed-width ISO layouts for ISOtime_array(): the record lengths, the
+# separators and their positions, the (start, stop) columns of the fields,
+# and the column where a fraction of a second starts
+_ISO_LAYOUTS = (
+  ((19,), {4: "-", 7: "-", 10: "T", 13: ":", 16: ":"},
+   {"year": (0, 4), "month": (5, 7), "day": (8, 10),
+    "hour": (11, 13), "minute": (14, 16), "second": (17, 19)}, None),
+  ((19,), {4: "-", 7: "-", 10: " ", 13: ":", 16: ":"},
+   {"year": (0, 4), "month": (5, 7), "day": (8, 10),
+    "hour": (11, 13), "minute": (14, 16), "second": (17, 19)}, None),
+  (range(21, 27), {4: "-", 7: "-", 10: " ", 13: ":", 16: ":", 19: "."},
+   {"year": (0, 4), "month": (5, 7), "day": (8, 10),
+    "hour": (11, 13), "minute": (14, 16), "second": (17, 19)}, 20),
+  ((16,), {4: "-", 7: "-", 10: "T", 13: ":"},
+   {"year": (0, 4), "month": (5, 7), "day": (8, 10),
+    "hour": (11, 13), "minute": (14, 16)}, None),
+  ((17,), {4: "-", 8: "T", 11: ":", 14: ":"},
+   {"year": (0, 4), "doy": (5, 8),
+    "hour": (9, 11), "minute": (12, 14), "second": (15, 17)}, None),
+  ((14,), {4: "-", 8: "T", 11: ":"},
+   {"year": (0, 4), "doy": (5, 8), "hour": (9, 11), "minute": (12, 14)}, None),
+  ((15,), {8: "T"},
+   {"year": (0, 4), "month": (4, 6), "day": (6, 8),
+    "hour": (9, 11), "minute": (11, 13), "second": (13, 15)}, None),
+  ((14,), {7: "T"},
+   {"year": (0, 4), "doy": (4, 7),
+    "hour": (8, 10), "minute": (10, 12), "second": (12, 14)}, None),
+  ((12,), {7: "T"},
+   {"year": (0, 4), "doy": (4, 7), "hour": (8, 10), "minute": (10, 12)}, None),
+  (range(16, 22), {7: "T", 14: "."},
+   {"year": (0, 4), "doy": (4, 7),
+    "hour": (8, 10), "minute": (10, 12), "second": (12, 14)}, 15))
+
+def ISOtime_array(ISOtimes, dtype="datetime64[us]", record_length=None):
+  """
+  Converts a column of ISO time strings to an array of times
+
+  The strings may be given as a list, as an ndarray of str or bytes, or as a
+  buffer (bytes, bytearray, memoryview, mmap) holding fixed-width records.
+  Records in a buffer may end with a newline, which then sets the record
+  length if 'record_length' is not given.
+
+  All the forms accepted by ISOtime2datetime() are recognized.  The fixed
+  width forms are decoded directly from a uint8 view of the characters, with
+  no Python object per element; anything else is passed to ISOtime2datetime()
+  one string at a time.  Strings which cannot be parsed give NaT.
+
+  @param ISOtimes : time strings
+  @type  ISOtimes : list, numpy.ndarray or buffer
+
+  @param dtype : "datetime64[us]" or "int64" for microseconds since the epoch
+  @type  dtype : str
+
+  @param record_length : bytes per record in a buffer, including any newline
+  @type  record_length : int
+
+  @return: numpy.ndarray with the shape of the input
+  """
+  records, shape = _byte_records(ISOtimes, record_length)
+  microseconds = _ISO_records_to_us(records)
+  microseconds = microseconds.reshape(shape)
+  if dtype == "int64":
+    return microseconds
+  return microseconds.view("datetime64[us]")
+
+def _byte_records(values, record_length=None):
+  """
+  Fixed-width records of character codes from strings or a buffer
+
+  @return: (uint8 array of records, shape of the input)
+  """
+  if isinstance(values, (bytes, bytearray, memoryview)) or hasattr(values,
+                                                                   "madvise"):
+    buf = numpy.frombuffer(values, dtype=numpy.uint8)
+    if record_length is None:
+      newline = bytes(buf[:4096]).find(b"\n")
+      if newline < 0:
+        record_length = max(len(buf), 1)
+      else:
+        record_length = newline + 1
+    if len(buf) % record_length:
+      # the last record is missing its newline
+      buf = numpy.concatenate((buf, numpy.zeros(
+                        record_length - len(buf) % record_length, numpy.uint8)))
+    records = buf.reshape(-1, record_length)
+    return records, (len(records),)
+  values = numpy.asarray(values)
+  if values.dtype.kind == "O" or (values.size == 0
+                                  and values.dtype.kind not in "SU"):
+    # an empty list becomes float64; there is nothing to interpret
+    values = values.astype(str)
+  shape = values.shape
+  values = numpy.ascontiguousarray(values).reshape(-1)
+  if values.dtype.kind == "S":
+    records = values.view(numpy.uint8).reshape(len(values),
+                                               values.dtype.itemsize)
+  elif values.dtype.kind == "U":
+    codes = values.view(numpy.uint32).reshape(len(values),
+                                              values.dtype.itemsize//4)
+    # anything beyond ASCII cannot be part of a time; make it a control code
+    records = numpy.where(codes < 128, codes, 1).astype(numpy.uint8)
+  else:
+    raise TypeError("cannot interpret %s as time strings" % values.dtype)
+  return records, shape
+
+def _record_lengths(columns):
+  """
+  Number of characters before the first NUL, carriage return or newline
+
+  @param columns : character codes, one row per column of the records
+  @type  columns : uint8 numpy.ndarray
+  """
+  lengths = numpy.full(columns.shape[1], len(columns), dtype=numpy.int64)
+  for index in range(len(columns) - 1, -1, -1):
+    column = columns[index]
+    end = (column == 0) | (column == 10) | (column == 13)
+    lengths[end] = index
+  return lengths
+
+def _read_digits(digits, start, stop):
+  """
+  Integer value of the decimal digits in columns start to stop
+
+  @param digits : character codes less 48, one row per column of the records
+  @type  digits : uint8 numpy.ndarray
+
+  @return: (int64 values, True where every character is a digit)
+  """
+  value = digits[start].astype(numpy.int64)
+  valid = digits[start] <= 9
+  for column in digits[start+1:stop]:
+    value *= 10
+    value += column
+    valid &= column <= 9
+  return value, valid
+
+# the int64 value of NaT
+_NaT = -2**63
+_days_before_month = (0, 0, 31, 59, 90, 120, 151, 181, 212, 243, 273, 304, 334,
+                      365)
+
+def _ISO_records_to_us(records):
+  """
+  Microseconds since the Unix epoch for fixed-width ISO time records
+
+  The records are transposed so that each character position is contiguous
+  and the fields can be decoded a column at a time.  Records which do not
+  fit a layout in _ISO_LAYOUTS are parsed with ISOtime2datetime().
+  Unparseable records give the NaT value.
+  """
+  # room for the longest layout so that every column can be addressed
+  columns = numpy.zeros((max(records.shape[1], 26), len(records)),
+                        dtype=numpy.uint8)
+  columns[:records.shape[1]] = records.T
+  lengths = _record_lengths(columns)
+  # digits become 0-9; anything else wraps around to a larger value
+  digits = columns - numpy.uint8(48)
+  result = numpy.full(len(records), _NaT, dtype=numpy.int64)
+  days_before_month = numpy.array(_days_before_month)
+  pending = numpy.ones(len(records), dtype=bool)
+  for valid_lengths, separators, fields, fraction in _ISO_LAYOUTS:
+    rows = numpy.flatnonzero(pending & numpy.isin(lengths, valid_lengths))
+    if len(rows) == 0:
+      continue
+    elif len(rows) == len(records):
+      sub = digits
+    else:
+      sub = digits[:, rows]
+    match = numpy.ones(sub.shape[1], dtype=bool)
+    for column, separator in separators.items():
+      match &= sub[column] == (ord(separator) - 48) % 256
+    values = {}
+    for name, (start, stop) in fields.items():
+      values[name], valid = _read_digits(sub, start, stop)
+      match &= valid
+    if fraction is None:
+      microsecond = 0
+    else:
+      # the fraction runs to the end of the record, padded with zeros
+      microsecond = numpy.zeros(sub.shape[1], dtype=numpy.int64)
+      for column in range(fraction, fraction + 6):
+        present = column < lengths[rows]
+        match &= ~present | (sub[column] <= 9)
+        microsecond *= 10
+        microsecond += numpy.where(present, sub[column], 0)
+    pending[rows[match]] = False
+    year = values["year"]
+    leap = _leap_year_array(year)
+    if "doy" in values:
+      # like strptime, day 366 of a common year is January 1 of the next
+      doy = values["doy"]
+      ok = (doy >= 1) & (doy <= 366)
+    else:
+      month = numpy.clip(values["month"], 1, 12)
+      doy = (days_before_month[month] + (month > 2)*leap + values["day"])
+      ok = ((values["month"] >= 1) & (values["month"] <= 12)
+            & (values["day"] >= 1)
+            & (doy <= days_before_month[month+1] + (month > 1)*leap))
+    hour = values["hour"]
+    minute = values["minute"]
+    second = values.get("second", 0)
+    ok &= (year >= 1) & (hour < 24) & (minute < 60) & (second < 60)
+    # the last day which datetime can represent
+    ok &= (year < 9999) | (doy <= 365)
+    ok &= match
+    seconds = (_unix_day_array(year, doy)*86400
+               + (hour*60 + minute)*60 + second)
+    result[rows[ok]] = (seconds*1000000 + microsecond)[ok]
+  for row in numpy.flatnonzero(pending & (lengths > 0)):
+    try:
+      dt = ISOtime2datetime(records[row, :lengths[row]].tobytes().decode())
+    except ValueError:
+      continue
+    if dt is not None:
+      result[row] = (dt - DT.datetime(1970, 1, 1))//DT.timedelta(microseconds=1)
+  return result
+
 def timestamp_to_str_with_ms(TS):
   """Converts a UNIX time.time float to a date time string with
   milliseconds."""
@@ -389,7 +1337,7 @@ def timestamp_to_str_with_ms(TS):
 
 def UnixTime_to_datetime(UnixTimeStamp):
   """Converts a UNIX time stamp to a Python datetime object"""
-  return DT.datetime.fromtimestamp(UnixTimeStamp, tz=UTC())
+  return DT.datetime.fromtimestamp(UnixTimeStamp, tz=utc)
 
 def datetime_to_UnixTime(t):
   """
@@ -412,7 +1360,7 @@ def timetuple_to_datetime(timetuple):
   else:
     return DT.datetime(*timetuple[:6])
 
-def UnixTime_to_MPL(UnixTime):
+def UnixTime_to_MPL(UnixTime, out=None):
   """
   Converts a UNIX time stamp (seconds since the epoch) to matplotlib date/time.
   
@@ -425,17 +1373,26 @@ def UnixTime_to_MPL(UnixTime):
     -62135596800      1,1,1,0,0,0        1.0
     
   The slope of MPL date versus UNIX time is 1/(24*60*60)
+
+  Any array-like is converted to an ndarray of the same shape.  Given 'out',
+  a float array of that shape, the result is written there instead; 'out'
+  may be the input array itself.
+
+  @param UnixTime : seconds since 1970/01/01 00:00:00 UT
+  @type  UnixTime : float or array-like
+
+  @param out : optional buffer for the result
+  @type  out : numpy.ndarray
+
+  @return: float or numpy.ndarray
   """
-  if type(UnixTime) == list or type(UnixTime) == numpy.ndarray:
-    response = []
-    for item in UnixTime:
-      UNIXdelta = item + 62135596800.
-      MPLdelta = UNIXdelta/sec_per_day
-      response.append(MPLdelta + 1)
-  else:
+  if out is None and _is_scalar(UnixTime):
     UNIXdelta = UnixTime + 62135596800
     MPLdelta = UNIXdelta/sec_per_day
-    response = MPLdelta + 1
+    return MPLdelta + 1
+  response = numpy.add(UnixTime, 62135596800., out=out)
+  numpy.divide(response, sec_per_day, out=response)
+  numpy.add(response, 1., out=response)
   return response
 
 def num2date(MPLtime):
@@ -448,21 +1405,20 @@ def num2date(MPLtime):
   gmtimestruct = T.gmtime(UNIXtime)
   return DT.datetime(*gmtimestruct[:6])
   
-def MPLtime_to_UnixTime(MPLtime):
+def MPLtime_to_UnixTime(MPLtime, out=None):
   """
   Converts an MPL time to a UNIX time stamp
+
+  Array-likes and 'out' are handled as in UnixTime_to_MPL().
   """
   #logger.debug("MPLtime_to_UnixTime entered with %s", MPLtime)
-  if type(MPLtime) == list or type(MPLtime) == numpy.ndarray:
-    response = []
-    for item in MPLtime:
-      MPLdelta = item - 1.
-      UNIXdelta = MPLdelta*sec_per_day
-      response.append(UNIXdelta - 62135596800.)
-  else:
+  if out is None and _is_scalar(MPLtime):
     MPLdelta = MPLtime - 1.
     UNIXdelta = MPLdelta*sec_per_day
-    response = UNIXdelta - 62135596800.
+    return UNIXdelta - 62135596800.
+  response = numpy.subtract(MPLtime, 1., out=out)
+  numpy.multiply(response, sec_per_day, out=response)
+  numpy.subtract(response, 62135596800., out=response)
   return response
 
 # conversions to and from VSR representations
@@ -471,15 +1427,15 @@ def make_VSR_timestring():
   """
   Creates a time string for the current time in the format that
   the VSR uses: 'YYYY DDD SSSSS'.
+
+  The string is made once a second; see CoarseClock.
   """
-  T = DT.datetime.utcnow()
-  secs = T.hour*3600 + T.minute*60 + T.second - 1
-  return T.strftime("%Y %j ")+("%5d" % secs)
+  return clocks["make_VSR_timestring"]()
 
 def incr_VSR_timestring(timestr):
   """
   Increments a VSR timestamp.  It does not handle
-  the midnight transition.
+  the midnight transition; VSR_ticks() does.
   """
   year,day,sec = timestr.split()
   newsec = int(sec)+1
@@ -492,16 +1448,20 @@ def VSR_to_datetime(VSR_time_tuple):
   >>> datetimes.datetime(2010, 1, 15, 4, 30, 12)
   To create a VSR time tuple from a string use VSR_to_timetuple
   """
-  logger.debug("VSR_to_datetime: called for %s", VSR_time_tuple)
+  # checked once so that nothing is formatted when debugging is off
+  debug = logger.isEnabledFor(logging.DEBUG)
+  if debug:
+    logger.debug("VSR_to_datetime: called for %s", VSR_time_tuple)
   (year,doy,seconds) = VSR_time_tuple
   hrs = int(seconds)//3600
   mins = (int(seconds)- 3600*hrs)//60
   secs = int(seconds) - 3600*hrs - 60*mins
   microsec = int((seconds - 3600*hrs - 60*mins - secs)*1e6)
-  logger.debug("VSR_to_datetime: which is %d:%d:%d.%f",
-                                                      hrs, mins, secs, microsec)
   t = calendar_date(year,doy)+(hrs,)+(mins,)+(secs,)+(microsec,)
-  logger.debug("VSR_to_datetime: or %s", t)
+  if debug:
+    logger.debug("VSR_to_datetime: which is %d:%d:%d.%f",
+                                                      hrs, mins, secs, microsec)
+    logger.debug("VSR_to_datetime: or %s", t)
   return DT.datetime(*t).replace(tzinfo=DT.timezone.utc)
 
 def VSR_to_timetuple(VSR_tuple):
@@ -524,6 +1484,60 @@ def VSR_script_time(doy,h,m,s):
   Out[3]: '101/03:25:45'"""
   return ("%03d" % doy)+'/'+("%02d" % h)+':'+("%02d" % m)+':'+("%02d" % s)
 
+def _day_midnight(year, doy):
+  """
+  UNIX time of the midnight which starts a day of year, or None if invalid
+  """
+  row = day_table.get(year, doy)
+  if row is not None:
+    return (row[2] - 719163)*86400
+  try:
+    return (DT.date(*calendar_date(year, doy)).toordinal() - 719163)*86400
+  except (TypeError, ValueError, OverflowError):
+    return None
+
+_cached_day_midnight = lru_cache(maxsize=256, typed=True)(_day_midnight)
+
+def set_midnight_cache_size(maxsize):
+  """
+  Sets how many days the script time parsers remember the midnight of
+
+  A log file usually covers only a day or two, so after the first line of
+  each day a time stamp costs just the addition of the time of day.  The
+  cache is emptied.
+
+  @param maxsize : number of (year, doy) entries; None for no limit
+  @type  maxsize : int
+  """
+  global _cached_day_midnight
+  _cached_day_midnight = lru_cache(maxsize=maxsize, typed=True)(_day_midnight)
+
+def midnight_cache_info():
+  """
+  Statistics of the midnight cache
+
+  @return: namedtuple (hits, misses, maxsize, currsize)
+  """
+  return _cached_day_midnight.cache_info()
+
+def midnight_cache_clear():
+  """
+  Empties the midnight cache and resets its statistics
+  """
+  _cached_day_midnight.cache_clear()
+
+def _script_time_to_timestamp(year, doy, h, m, s):
+  """
+  UNIX time from year, day of year and the strings for hours, minutes, seconds
+  """
+  h, m, s = int(h), int(m), int(s)
+  midnight = _cached_day_midnight(year, doy)
+  if midnight is not None and 0 <= h < 24 and 0 <= m < 60 and 0 <= s < 60:
+    return midnight + (h*60 + m)*60 + s
+  y,mn,d = calendar_date(year,doy)
+  t = DT.datetime(y,mn,d,h,m,s)
+  return calendar.timegm(t.timetuple())
+
 def VSR_script_time_to_timestamp(year,string):
   """
   Converts a VSR time string like 123/12:34:45 to a UNIX time stamp.
@@ -532,9 +1546,7 @@ def VSR_script_time_to_timestamp(year,string):
   """
   doystr,timestr = string.split('/')
   h,m,s = timestr.split(':')
-  y,mn,d = calendar_date(year,int(doystr))
-  t = DT.datetime(y,mn,d,int(h),int(m),int(s))
-  return calendar.timegm(t.timetuple())
+  return _script_time_to_timestamp(year, int(doystr), h, m, s)
 
 def WVSR_script_time_to_timestamp(yrdoystr,timestr):
   """
@@ -546,9 +1558,7 @@ def WVSR_script_time_to_timestamp(yrdoystr,timestr):
   year = 2000 + int(yr)
   DOY = int(doy)
   h,m,s = timestr.split(':')
-  y,mn,d = calendar_date(year, DOY)
-  t = DT.datetime(y, mn, d, int(h), int(m), int(s))
-  return calendar.timegm(t.timetuple())
+  return _script_time_to_timestamp(year, DOY, h, m, s)
 
 def macro_log_time_to_UnixTime(year,timestr):
   """
@@ -560,10 +1570,14 @@ def macro_log_time_to_UnixTime(year,timestr):
 
 def VSR_tuple_to_MPL(year,doy,seconds):
   """Converts a VSR time tuple to a matplotlib date/time float."""
-  yr,mn,dy = calendar_date(year,doy)
-  # UT at midnight in matplotlib format
-  #UT0 = date2num(DT.datetime(yr,mn,dy))
-  UT0 = DT.datetime(yr,mn,dy).toordinal()
+  row = day_table.get(year, doy)
+  if row is not None:
+    UT0 = row[2]
+  else:
+    yr,mn,dy = calendar_date(year,doy)
+    # UT at midnight in matplotlib format
+    #UT0 = date2num(DT.datetime(yr,mn,dy))
+    UT0 = DT.datetime(yr,mn,dy).toordinal()
   time = UT0 + seconds/sec_per_day
   return time
 
@@ -584,6 +1598,56 @@ def VSR_tuple_to_timestamp(year,doy,start_sec):
   UT0 = T.mktime(DT0.timetuple())
   return UT0 + start_sec
 
+def VSR_array_to_timestamp(year, doy=None, seconds=None):
+  """
+  Converts arrays of VSR time specifications to UNIX time stamps
+
+  The times may be given as three parallel arrays or, with 'doy' and
+  'seconds' omitted, as one N x 3 array of (year, doy, seconds) rows.  The
+  result is int64 if the seconds are integers, otherwise float64.
+
+  Unlike VSR_tuple_to_timestamp(), which goes through mktime(), the times
+  are taken to be UT, as in VSR_to_datetime().
+
+  @return: numpy.ndarray
+  """
+  year, doy, seconds = _VSR_columns(year, doy, seconds)
+  return _unix_day_array(year, doy)*86400 + seconds
+
+def VSR_array_to_datetime64(year, doy=None, seconds=None):
+  """
+  Converts arrays of VSR time specifications to datetime64[us]
+
+  The arguments are as for VSR_array_to_timestamp().  Fractions of a second
+  are truncated to microseconds as in VSR_to_datetime().
+
+  @return: numpy.ndarray
+  """
+  year, doy, seconds = _VSR_columns(year, doy, seconds)
+  if seconds.dtype.kind in "iu":
+    microseconds = seconds*1000000
+  else:
+    whole = numpy.trunc(seconds)
+    microseconds = (whole.astype(numpy.int64)*1000000
+                    + ((seconds - whole)*1e6).astype(numpy.int64))
+  microseconds += _unix_day_array(year, doy)*86400000000
+  return microseconds.view("datetime64[us]")
+
+def _VSR_columns(year, doy, seconds):
+  """
+  Year, day of year and seconds arrays from parallel arrays or N x 3 rows
+  """
+  if doy is None and seconds is None:
+    tuples = numpy.asarray(year)
+    year, doy, seconds = tuples[..., 0], tuples[..., 1], tuples[..., 2]
+  year = numpy.asarray(year).astype(numpy.int64)
+  doy = numpy.asarray(doy).astype(numpy.int64)
+  seconds = numpy.asarray(seconds)
+  if seconds.dtype.kind in "iu":
+    # so that scaling to microseconds or nanoseconds cannot overflow
+    seconds = seconds.astype(numpy.int64)
+  return year, doy, seconds
+
 def VSR_timestamp():
   """
   Alias for make_VSR_timestring, for backwards compatibility
@@ -608,9 +1672,93 @@ def logtime_to_timetuple(time_string):
   t = T.strptime(time_string,"%H:%M:%S")
   return t.tm_hour, t.tm_min, t.tm_sec
 
+def iter_logtimes(logfile, year, doy, column=0):
+  """
+  Generates UNIX timestamps for the times in an EAC or RAC log
+
+  The log is read a line at a time so memory use does not grow with the
+  size of the file.  Each line is expected to have a time HH:MM:SS starting
+  at 'column'; lines without one are skipped.  The logs carry no date, so
+  the count starts on the given day and moves to the next day whenever the
+  time of day goes backwards.
+
+  @param logfile : name of the log, or an open text or binary file
+  @type  logfile : str or file
+
+  @param year : year of the first line
+  @type  year : int
+
+  @param doy : day of year of the first line
+  @type  doy : int
+
+  @param column : position of the time in each line
+  @type  column : int
+
+  @return: generator of int
+  """
+  if hasattr(logfile, "read"):
+    lines = logfile
+  else:
+    lines = open(logfile, errors="replace")
+  try:
+    midnight = (DT.date(year, 1, 1).toordinal() + doy - 719164)*86400
+    last = -1
+    colon = None
+    for line in lines:
+      if colon is None:
+        colon = b":" if isinstance(line, bytes) else ":"
+      field = line[column:column+8]
+      if field[2:3] != colon or field[5:6] != colon:
+        continue
+      try:
+        secs = (int(field[0:2])*60 + int(field[3:5]))*60 + int(field[6:8])
+      except ValueError:
+        continue
+      if secs < last:
+        # past midnight
+        midnight += 86400
+      last = secs
+      yield midnight + secs
+  finally:
+    if lines is not logfile:
+      lines.close()
+
+def logtime_chunks(logfile, year, doy, chunk_size=65536, column=0, out=None):
+  """
+  Generates arrays of UNIX timestamps for the times in an EAC or RAC log
+
+  This works like iter_logtimes() but fills an int64 array, 'out' if it is
+  given, and yields it each time it is full, and at the end a view of the
+  part holding the remaining times.  The same buffer is filled again for
+  each chunk, so copy any chunk which must be kept.
+
+  @param chunk_size : number of times per chunk if 'out' is not given
+  @type  chunk_size : int
+
+  @param out : buffer for the times
+  @type  out : numpy.ndarray
+
+  @return: generator of numpy.ndarray
+  """
+  if out is None:
+    out = numpy.empty(chunk_size, dtype=numpy.int64)
+  times = iter_logtimes(logfile, year, doy, column=column)
+  while True:
+    chunk = list(islice(times, len(out)))
+    out[:len(chunk)] = chunk
+    if len(chunk) == len(out):
+      yield out
+    else:
+      if chunk:
+        yield out[:len(chunk)]
+      return
+
 def timetuple_to_HHMM(time):
   """Converts a time in time() format, seconds since the epoch, to an
-  HHMM string."""
+  HHMM string.
+
+  This is in the computer's local time.  For a given zone, or for arrays,
+  see local_HHMM()."""
   h,m = T.localtime(time)[3:5]
   return "%02d%02d" % (h,m)
 
@@ -641,7 +1789,8 @@ def week_number(year,doy):
   """
   Computes the week number given the year and day of year.
 
-  This assumes the week begins on Sunday (weekday 1).
+  This assumes the week begins on Sunday (weekday 1).  Arrays are accepted
+  for either argument.
 
   @param year :
   @type  year : int
@@ -651,6 +1800,8 @@ def week_number(year,doy):
 
   @return: int
   """
+  if not _is_scalar(year, doy):
+    return _week_number_array(year, doy)
   # This is the week day on which the year starts.  This week belongs to the
   # previous year
   weekday1 = day_of_week(1,year)
@@ -698,20 +1849,42 @@ def get_date():
   return ses_date,year,month,day,DOY
 
 def HHMM_to_dec_deg(HHMM):
-  """Converts a string HHMM to decimal hours."""
-  return 15*(int(HHMM[0:2])+float(HHMM[2:4])/60.)
+  """Converts a string HHMM to decimal hours.
+
+  The string is read as by time_int_to_decimal(), with one pair of
+  sixtieths.  For an array of strings the result is a float64 array."""
+  if not _is_sexagesimal_string(HHMM):
+    return 15*_sexagesimal_array(HHMM, 1)
+  return 15*_sexagesimal(HHMM, 1)
 
 def DDDMM_to_dec_deg(DDDMM):
-  """Converts a strin DDDMM to decimal degrees."""
-  sign = int(self.DDDMM[0]+'1')
-  return sign * (int(self.DDDMM[1:3]) + float(self.DDDMM[3:5])/60.)
+  """Converts a strin DDDMM to decimal degrees.
+
+  The string is read as by time_int_to_decimal(), with one pair of
+  sixtieths.  For an array of strings the result is a float64 array."""
+  if not _is_sexagesimal_string(DDDMM):
+    return _sexagesimal_array(DDDMM, 1)
+  return _sexagesimal(DDDMM, 1)
+
+def _is_sexagesimal_string(value):
+  """
+  True for one string, or bytes which are not a buffer of records
+  """
+  return isinstance(value, str) or (isinstance(value, bytes)
+                                    and b"\n" not in value)
 
 def deg_to_IAU_str(position,format="h"):
   """The position is a longitude-like, latitude-like tuple.  The first
   coordinate and be in hours or degrees but it must be > 0.  The second
   coordinate can be negative.  The output will be of thhe form
   hhmm+ddmm if format= 'h' (default), dddmm+ddmm if format='d', or
-  ddd.d+dd.d if format='g'."""
+  ddd.d+dd.d if format='g'.
+
+  If the coordinates are arrays the result is an array of bytes names made
+  by IAU_names() in the iau submodule."""
+  if not _is_scalar(position[0], position[1]):
+    from .iau import IAU_names
+    return IAU_names(position[0], position[1], format)
   if format.lower() == "g":
     ra_str = "%05.1f" % position[0]
     dec_str = "%+05.1f" % position[1]
@@ -725,10 +1898,11 @@ def deg_to_IAU_str(position,format="h"):
       ra_str = "%03d%02d" % (ra_hh,ra_mm)
     else:
       ra_str = "%02d%02d" % (ra_hh,ra_mm)
-    sign = int(latitude/abs(latitude))
+    # the sign is kept for declinations between -1 and 0 degrees
+    sign = "-" if latitude < 0 else "+"
     dec_dd = int(abs(latitude))
     dec_mm = int(60*(abs(latitude)-dec_dd))
-    dec_str = "%+03d%02d" % (sign*dec_dd,dec_mm)
+    dec_str = "%s%02d%02d" % (sign,dec_dd,dec_mm)
   return ra_str+dec_str
 
 def HHMMSS_to_seconds(string):
@@ -739,40 +1913,173 @@ def HHMMSS_to_seconds(string):
 
 def time_int_to_decimal(time):
   """Takes a number of the form HHMMSS or +/-DDMMSS and converts it
-  to a decimal."""
-  if time[0] == "-":
-    sign = -1
-    timestr = time[1:]
-  elif time[0] == "+":
-    sign = 1
-    timestr = time[1:]
+  to a decimal.
+
+  The digits before the point are taken in pairs from the right: seconds,
+  minutes, and then the rest is the whole number; missing pairs are zero.
+  A string which is not of this form raises ValueError.
+
+  'time' may also be an array of strings, or of bytes, or a buffer of
+  newline terminated records, as for ISOtime_array(); bytes with no newline
+  are one string.  The digits are then read a column at a time with NumPy
+  and the result is a float64 array, NaN where a string is not a number of
+  this form.  The inverse is decimal_to_sexagesimal()."""
+  if not _is_sexagesimal_string(time):
+    return _sexagesimal_array(time, 2)
+  return _sexagesimal(time, 2)
+
+def _sexagesimal(string, places):
+  """
+  Decimal value of one [+-]DD..MM[SS][.ff] string, as _sexagesimal_array()
+  reads it
+  """
+  if isinstance(string, bytes):
+    string = string.decode("ascii")
+  for end in "\0\r\n":
+    string = string.split(end, 1)[0]
+  negative = string[:1] == "-"
+  if string[:1] in ("+", "-"):
+    integer, point, fraction = string[1:].partition(".")
   else:
-    sign = 1
-    timestr = time
-  index = timestr.find('.')
-  if index > -1:
-    seconds_fraction = timestr[index:]
-    timestr = timestr[:index]
+    integer, point, fraction = string.partition(".")
+  if (not integer or integer.strip("0123456789")
+      or fraction.strip("0123456789")):
+    raise ValueError("%r is not a sexagesimal number" % string)
+  pairs = integer.rjust(2*places, "0")
+  whole = int(pairs[:-2*places] or 0)
+  last = int(pairs[-2:])
+  if fraction:
+    last = last + int(fraction)/10**len(fraction)
+  if places == 1:
+    result = whole + last/60.
   else:
-    seconds_fraction = ".0"
-  # We expect six digits but it could be less so work from the back
-  hh = int(timestr[-6:-4])
-  mm = int(timestr[-4:-2])
-  ss = float(timestr[-2:]+seconds_fraction)
-  return sign*hh+mm/60.+ss/3600.
+    result = whole + int(pairs[-4:-2])/60. + last/3600.
+  return -result if negative else result
+
+def _sexagesimal_array(values, places):
+  """
+  Decimal values of [+-]DD..MM[SS][.ff] strings
+
+  The digits before the point are taken in pairs from the right; the last
+  'places' pairs are sixtieths and the rest is the whole number.
+
+  @param values : strings, bytes or a buffer of records
+  @type  values : array-like
+
+  @param places : number of sexagesimal pairs, 1 for DDMM and 2 for DDMMSS
+
+  @return: float64 numpy.ndarray with the shape of the input
+  """
+  records, shape = _byte_records(values)
+  columns = numpy.ascontiguousarray(records.T)
+  lengths = _record_lengths(columns)
+  count = len(lengths)
+  negative = columns[0] == ord("-")
+  first = (negative | (columns[0] == ord("+"))).astype(numpy.int64)
+  point = lengths.copy()
+  for index in range(len(columns) - 1, -1, -1):
+    point[(columns[index] == ord(".")) & (index < lengths)] = index
+  valid = point > first
+  whole = numpy.zeros(count, dtype=numpy.int64)
+  # pairs[0] is the first pair of sixtieths
+  pairs = numpy.zeros((places, count), dtype=numpy.int64)
+  fraction = numpy.zeros(count, dtype=numpy.int64)
+  scale = numpy.ones(count, dtype=numpy.int64)
+  # the masks are applied by multiplying, which is faster than indexing
+  for index, column in enumerate(columns - numpy.uint8(48)):
+    in_integer = (index >= first) & (index < point)
+    in_fraction = (index > point) & (index < lengths)
+    valid &= ~(in_integer | in_fraction) | (column <= 9)
+    digit = column*(in_integer | in_fraction)
+    # position counted from the right of the integer part
+    position = point - 1 - index
+    leading = in_integer & (position >= 2*places)
+    whole *= 1 + 9*leading
+    whole += digit*leading
+    for pair in range(places):
+      here = in_integer & (position//2 == places - 1 - pair)
+      pairs[pair] += digit*here*(1 + 9*(position & 1))
+    fraction *= 1 + 9*in_fraction
+    fraction += digit*in_fraction
+    scale *= 1 + 9*in_fraction
+  last = pairs[-1] + fraction/scale
+  if places == 1:
+    result = whole + last/60.
+  else:
+    result = whole + pairs[0]/60. + last/3600.
+  result[negative] *= -1
+  result[~valid] = numpy.nan
+  return result.reshape(shape)
+
+def decimal_to_sexagesimal(decimal, places=2, decimals=0, signed=False,
+                           lead=2):
+  """
+  Fixed-width bytes strings DD..MM[SS][.f] of decimal hours or degrees
+
+  With the defaults this gives HHMMSS; places=2, decimals=1 gives HHMMSS.s
+  and signed=True gives +DDMMSS, the forms read by time_int_to_decimal().
+  The values are rounded to the last place shown, carrying into the minutes
+  and so on, so 60 seconds never appears.
+
+  @param decimal : hours or degrees
+  @type  decimal : array-like of float
+
+  @param places : number of pairs of digits for sixtieths, 1 or 2
+
+  @param decimals : digits after the point
+
+  @param signed : True for a sign, + or -, in front
+
+  @param lead : digits of the whole hours or degrees, zero padded
+
+  @return: numpy.ndarray of bytes with the shape of the input
+  """
+  from .formatters import _write_digits
+  decimal = numpy.asarray(decimal, dtype=float)
+  if not numpy.isfinite(decimal).all():
+    raise ValueError("cannot format NaN or infinity")
+  shape = decimal.shape
+  decimal = decimal.ravel()
+  smallest = 60**places*10**decimals
+  units = numpy.rint(numpy.abs(decimal)*smallest).astype(numpy.int64)
+  whole, rest = numpy.divmod(units, smallest)
+  if (whole >= 10**lead).any():
+    raise ValueError("values too large for %d leading digits" % lead)
+  if (decimal < 0).any() and not signed:
+    raise ValueError("negative values need signed=True")
+  width = int(signed) + lead + 2*places + (decimals and decimals + 1)
+  text = numpy.empty((len(decimal), width), dtype=numpy.uint8)
+  column = 0
+  if signed:
+    text[:, 0] = numpy.where(decimal < 0, ord("-"), ord("+"))
+    column = 1
+  _write_digits(text, column, lead, whole)
+  column += lead
+  for place in range(places):
+    smallest //= 60
+    pair, rest = numpy.divmod(rest, smallest)
+    _write_digits(text, column, 2, pair)
+    column += 2
+  if decimals:
+    text[:, column] = ord(".")
+    _write_digits(text, column + 1, decimals, rest)
+  return text.view("S%d" % width).reshape(shape)
 
 def now_string():
   """
   Current minute formatted as YYYY/DDD-HHMM
+
+  The string is made once a minute; see CoarseClock.
   """
-  now = T.gmtime(T.time())
-  return "%40d/%03d-%02d%02d" % (now[0],now[7],now[3],now[4])
+  return clocks["now_string"]()
 
 def format_now():
   """
   Return the current time as a formatted string:
+
+  The string is made once a second; see CoarseClock.
   """
-  return T.ctime(T.time())
+  return clocks["format_now"]()
 
 def format_ISO_time(year,doy,timestr):
   """
@@ -805,30 +2112,48 @@ def mpldate2doy(mpldate):
 
   @return: int
   """
-  dt = num2date(mpldate, tz=UTC())
+  dt = num2date(mpldate, tz=utc)
   return day_of_year(dt.year, dt.month, dt.day)
 
-def MJD_to_UnixTime(MJD):
+def MJD_to_UnixTime(MJD, out=None):
   """
   Converts MJD time to UNIX time
 
+  Array-likes and 'out' are handled as in UnixTime_to_MPL().
+
   @param MJD : modified Julian date with fractional day
-  @type  MJD : float
+  @type  MJD : float or array-like
 
-  @return: float
+  @param out : optional buffer for the result
+  @type  out : numpy.ndarray
+
+  @return: float or numpy.ndarray
   """
-  return (MJD-40587)*sec_per_day
+  if out is None and _is_scalar(MJD):
+    return (MJD-40587)*sec_per_day
+  response = numpy.subtract(MJD, 40587, out=out, dtype=float)
+  numpy.multiply(response, sec_per_day, out=response)
+  return response
 
-def UnixTime_to_MJD(UnixTime):
+def UnixTime_to_MJD(UnixTime, out=None):
   """
   Convert UnixTime to fractional MJD
 
+  Array-likes and 'out' are handled as in UnixTime_to_MPL().
+
   @param UnixTime : seconds since 1970/01/01 00:00:00 UT
-  @type  UnixTime : float
+  @type  UnixTime : float or array-like
 
-  @return: float
+  @param out : optional buffer for the result
+  @type  out : numpy.ndarray
+
+  @return: float or numpy.ndarray
   """
-  return 40587+UnixTime/sec_per_day
+  if out is None and _is_scalar(UnixTime):
+    return 40587+UnixTime/sec_per_day
+  response = numpy.divide(UnixTime, sec_per_day, out=out)
+  numpy.add(response, 40587, out=response)
+  return response
 
 def MJD(*args):
   """
@@ -836,8 +2161,7 @@ def MJD(*args):
   """
   if len(args) == 1:
     # assume UNIX time stamp
-    unixtime = args[0]
-    return 40587 + unixtime/(24*60*60)
+    return UnixTime_to_MJD(args[0])
   elif len(args) == 2:
     # assume year and day-of-year
     year, doy = args
@@ -850,6 +2174,85 @@ def MJD(*args):
   else:
     raise RuntimeError("MJD requires 1, 2, or 3 arguments")
 
+# sidereal hours per day of UT, and GMST at MJD 0 reduced modulo 24 h
+_sidereal_rate = 24.06570982441908
+_GMST_at_MJD0 = (18.697374558 - _sidereal_rate*51544.5) % 24
+
+def GMST(time, mjd=False, radians=False, out=None):
+  """
+  Greenwich mean sidereal time
+
+  This is the expression from the Astronomical Almanac which approximates
+  the IAU 1982 model::
+
+    GMST = 18.697374558 + 24.06570982441908 D  hours
+
+  where D is the days of UT since 2000 January 1, 12h (MJD 51544.5).  It is
+  accurate to about 0.1 s over this century.  The constant is reduced modulo
+  24 h first, so that an array needs one multiply, one add and one modulo.
+
+  Array-likes and 'out' are handled as in UnixTime_to_MPL().
+
+  Example::
+
+    In [1]: GMST(946728000)
+    Out[1]: 18.697374558...
+
+  @param time : UNIX time, or MJD if 'mjd' is True
+  @type  time : float or array-like
+
+  @param mjd : 'time' is a modified Julian date
+  @type  mjd : bool
+
+  @param radians : return radians instead of hours
+  @type  radians : bool
+
+  @param out : optional float64 buffer for the result
+  @type  out : numpy.ndarray
+
+  @return: hours in [0, 24) or radians in [0, 2 pi)
+  """
+  if mjd:
+    slope, intercept = _sidereal_rate, _GMST_at_MJD0
+  else:
+    slope = _sidereal_rate/sec_per_day
+    intercept = (_GMST_at_MJD0 + 40587*_sidereal_rate) % 24
+  period = 24.
+  if radians:
+    slope, intercept, period = (slope*hr_to_rad, intercept*hr_to_rad,
+                                period*hr_to_rad)
+  if out is None and _is_scalar(time):
+    return (time*slope + intercept) % period
+  response = numpy.multiply(time, slope, out=out)
+  numpy.add(response, intercept, out=response)
+  numpy.remainder(response, period, out=response)
+  return response
+
+def LST(time, longitude, mjd=False, radians=False, out=None):
+  """
+  Local mean sidereal time
+
+  The arguments and result are as for GMST().
+
+  @param longitude : degrees east of Greenwich; may be an array broadcast
+                     against 'time'
+  @type  longitude : float or array-like
+
+  @return: hours in [0, 24) or radians in [0, 2 pi)
+  """
+  scale, period = (deg_to_rad, 2*pi) if radians else (1/15., 24.)
+  if out is None and _is_scalar(time, longitude):
+    return (GMST(time, mjd, radians) + longitude*scale) % period
+  response = GMST(time, mjd, radians, out=out)
+  offset = numpy.multiply(longitude, scale)
+  if out is None and offset.ndim:
+    # an array of longitudes may broadcast to a larger shape
+    response = numpy.add(response, offset)
+  else:
+    numpy.add(response, offset, out=response)
+  numpy.remainder(response, period, out=response)
+  return response
+
 def seconds(timedelta, unit="sec"):
   """
   Computes the length of a datetime interval to specified units
@@ -880,12 +2283,139 @@ def nowgmt():
 def logtime():
   """
   returns a formatted datetime object with the current UT
+
+  The string is made once a millisecond; see CoarseClock.
   """
-  return DT.datetime.utcnow().strftime("%H:%M:%S.%f")[:-3]
+  return clocks["logtime"]()
 
 def logtimestamp():
   """
   returns a formatted datetime object with the curren year, DOY, and UT
+
+  The string is made once a second; see CoarseClock.
   """
-  return DT.datetime.utcnow().strftime("%Y-%j-%H:%M:%S")
+  return clocks["logtimestamp"]()
+
+# ------------------------ cached clocks ------------------------------------
+
+class CoarseClock(object):
+  """
+  The current time as a string which is only made again when it can change
+
+  Calling the clock compares the monotonic clock with the time at which the
+  string was due to change and, before then, returns the string it already
+  has.  Otherwise 'render' makes a new string from the time.time() value and
+  the deadline is set at the next multiple of 'precision' seconds of the
+  wall clock, so the string changes on the same boundaries as an uncached
+  one would.  (If the system clock is stepped, the string may be stale for
+  up to one period.)
+
+  The deadline and string are kept together in one tuple, which is replaced
+  as a whole, so threads can read it without a lock; making a new string is
+  done under a lock so that it happens only once.
+
+  Public attributes::
+
+    precision  - seconds for which a string is reused; 0 makes a new
+                 string every call.  Setting it discards the string.
+    resolution - the smallest change in the string, in seconds
+  """
+  def __init__(self, render, resolution):
+    """
+    @param render : function making a string from a UNIX time
+    @type  render : function
+
+    @param resolution : seconds
+    @type  resolution : float
+    """
+    self.render = render
+    self.resolution = resolution
+    self._lock = Lock()
+    self.precision = resolution
+
+  def __call__(self):
+    deadline, string = self._current
+    if T.monotonic() < deadline:
+      return string
+    with self._lock:
+      deadline, string = self._current
+      if T.monotonic() < deadline:
+        return string
+      # read together, so that the time taken to render does not move the
+      # deadline past the boundary
+      monotonic = T.monotonic()
+      now = T.time()
+      string = self.render(now)
+      if self._precision:
+        boundary = (now//self._precision + 1)*self._precision
+        self._current = (monotonic + boundary - now, string)
+      return string
+
+  def __repr__(self):
+    return "CoarseClock(%s, %g)" % (self.render.__name__, self.precision)
+
+  @property
+  def precision(self):
+    return self._precision
+
+  @precision.setter
+  def precision(self, precision):
+    with self._lock:
+      self._precision = precision
+      self._current = (-1., None)
+
+def _render_now_string(now):
+  now = T.gmtime(now)
+  return "%40d/%03d-%02d%02d" % (now[0],now[7],now[3],now[4])
 
+def _render_VSR_timestring(now):
+  now = T.gmtime(now)
+  secs = now.tm_hour*3600 + now.tm_min*60 + now.tm_sec - 1
+  return "%04d %03d %5d" % (now.tm_year, now.tm_yday, secs)
+
+def _render_logtime(now):
+  # microseconds rounded half to even, as datetime.fromtimestamp() rounds
+  # them, then truncated to milliseconds as strftime("%f")[:-3] was
+  fraction, seconds = modf(now)
+  microseconds = round(fraction*1e6)
+  if microseconds < 0:
+    seconds -= 1
+    microseconds += 1000000
+  elif microseconds >= 1000000:
+    seconds += 1
+    microseconds -= 1000000
+  now = T.gmtime(seconds)
+  return "%02d:%02d:%02d.%03d" % (now.tm_hour, now.tm_min, now.tm_sec,
+                                  microseconds//1000)
+
+def _render_logtimestamp(now):
+  now = T.gmtime(now)
+  return "%04d-%03d-%02d:%02d:%02d" % (now.tm_year, now.tm_yday, now.tm_hour,
+                                       now.tm_min, now.tm_sec)
+
+clocks = {"format_now":          CoarseClock(T.ctime, 1),
+          "logtime":             CoarseClock(_render_logtime, 0.001),
+          "logtimestamp":        CoarseClock(_render_logtimestamp, 1),
+          "make_VSR_timestring": CoarseClock(_render_VSR_timestring, 1),
+          "now_string":          CoarseClock(_render_now_string, 60)}
+
+def set_clock_precision(precision=None, names=None):
+  """
+  Sets how long the clock functions reuse a formatted time
+
+  @param precision : seconds; None for the resolution of each string, which
+                     gives exactly the uncached strings, or 0 for no caching
+  @type  precision : float
+
+  @param names : functions to change, like "logtime"; all if not given
+  @type  names : list of str
+  """
+  for name in names or clocks:
+    clock = clocks[name]
+    clock.precision = clock.resolution if precision is None else precision
+
+# ---- instrumentation
+
+if environ.get("DATESTIMES_INSTRUMENT"):
+  from .instrument import enable_from_environment
+  enable_from_environment()
@@ -0,0 +1,301 @@
+# -*- coding: utf-8 -*-
+"""
+Extracting the times from large archives of log files on many cores
+
+Each file is memory mapped and cut into chunks at line boundaries.  The
+chunks are parsed in a pool of processes, each of which maps the file
+itself, so only the results cross between processes.  Within a chunk the
+times are decoded from the bytes with NumPy, a column at a time, as in
+ISOtime_array().  The results are merged into one array sorted by time::
+
+  In [1]: stamps = extract_timestamps(glob.glob("/data/logs/*.log"),
+                                      "logtime", year=2020, doy=171)
+  In [2]: stamps.times[:2], stamps.paths[stamps.source[0]], stamps.offset[0]
+
+Parsers
+=======
+These correspond to the functions for single lines::
+
+  logtime   HH:MM:SS at 'column', as logtime_to_timetuple() and
+            iter_logtimes(); the logs have no date, so the day is counted
+            from the given 'year' and 'doy' and advances whenever the time
+            goes backwards, across chunks and lines without times
+  macro     DDD_HH:MM:SS at 'column', as macro_log_time_to_UnixTime(); the
+            year advances when the day of year goes backwards
+  ISO       an ISO time at 'column' ending at white space or the end of the
+            line, in any form recognized by ISOtime_array(); a space may
+            separate the date and the time
+
+Lines without a time are skipped.  With a cache.TimestampCache the parsed
+times of each file are kept, so files which have not changed are not parsed
+again.
+"""
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+import mmap
+import os
+
+import numpy
+
+from . import _ISO_records_to_us, _NaT, _unix_day_array
+
+Timestamps = namedtuple("Timestamps", "times source offset paths")
+Timestamps.__doc__ = """
+Times extracted from log files, sorted by time
+
+  times  - UNIX times, float64
+  source - index in 'paths' of the file each time came from
+  offset - byte offset in that file of the line holding the time
+  paths  - the files, in the order given
+"""
+
+parsers = ("logtime", "macro", "ISO")
+
+# longest ISO time, as in ISOtime_array()
+_ISO_width = 26
+
+def extract_timestamps(paths, parser="logtime", year=None, doy=None,
+                       column=0, workers=None, chunk_size=8*2**20, cache=None):
+  """
+  Times from the lines of log files, parsed in parallel
+
+  @param paths : log files, or one log file
+  @type  paths : list of str or str
+
+  @param parser : "logtime", "macro" or "ISO"
+  @type  parser : str
+
+  @param year : year of the first line (logtime and macro); one for all the
+                files or one per file
+  @type  year : int or list of int
+
+  @param doy : day of year of the first line (logtime); one or one per file
+  @type  doy : int or list of int
+
+  @param column : position of the time in each line
+  @type  column : int
+
+  @param workers : number of processes; os.cpu_count() if None, and 1 to
+                   parse in this process
+  @type  workers : int
+
+  @param chunk_size : approximate number of bytes parsed by one task
+  @type  chunk_size : int
+
+  @param cache : keeps the times of each file for next time; True for the
+                 default cache.TimestampCache
+  @type  cache : cache.TimestampCache or bool
+
+  @return: Timestamps
+  """
+  if parser not in parsers:
+    raise ValueError("parser must be one of %s" % ", ".join(parsers))
+  if isinstance(paths, (str, bytes, os.PathLike)):
+    paths = [paths]
+  paths = [os.fspath(path) for path in paths]
+  years = _per_file(year, len(paths), "year", parser != "ISO")
+  doys = _per_file(doy, len(paths), "doy", parser == "logtime")
+  if cache is True:
+    from .cache import default_cache
+    cache = default_cache()
+  options = [dict(year=years[source], doy=doys[source], column=column)
+             for source in range(len(paths))]
+  # (times, line offsets) of each file, in the order of the lines
+  by_file = [None]*len(paths)
+  if cache:
+    for source, path in enumerate(paths):
+      arrays = cache.get(path, parser, **options[source])
+      if arrays is not None:
+        by_file[source] = (arrays["times"], arrays["offset"])
+  tasks = []
+  for source, path in enumerate(paths):
+    if by_file[source] is None:
+      for start, stop in split_lines(path, chunk_size):
+        tasks.append((source, path, start, stop, parser, column))
+  if workers is None:
+    workers = os.cpu_count() or 1
+  workers = min(workers, len(tasks))
+  if workers > 1:
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+      results = list(executor.map(_parse_chunk, tasks))
+  else:
+    results = [_parse_chunk(task) for task in tasks]
+  # results come back in task order, so each file's chunks are consecutive
+  chunks = dict((source, []) for source in range(len(paths))
+                if by_file[source] is None)
+  for task, result in zip(tasks, results):
+    chunks[task[0]].append(result)
+  for source, parsed in chunks.items():
+    values = numpy.concatenate([chunk[0] for chunk in parsed] or
+                               [numpy.empty(0, numpy.int64)])
+    offset = numpy.concatenate([chunk[1] for chunk in parsed] or
+                               [numpy.empty(0, numpy.int64)])
+    if parser == "logtime":
+      values = _logtimes(values, years[source], doys[source])
+    elif parser == "macro":
+      values = _macro_times(values, years[source])
+    by_file[source] = (values, offset)
+    if cache:
+      cache.put(paths[source], parser, {"times": values, "offset": offset},
+                **options[source])
+  times = numpy.concatenate([item[0] for item in by_file])
+  sources = numpy.concatenate([numpy.full(len(item[0]), source,
+                                          dtype=numpy.int32)
+                               for source, item in enumerate(by_file)])
+  offsets = numpy.concatenate([item[1] for item in by_file])
+  order = numpy.argsort(times, kind="stable")
+  return Timestamps(times[order], sources[order], offsets[order], paths)
+
+def _per_file(value, count, name, required):
+  """
+  A list of 'count' values from one value or a sequence of them
+  """
+  if value is None:
+    if required:
+      raise ValueError("'%s' is needed for this parser" % name)
+    return [None]*count
+  if numpy.ndim(value) == 0:
+    return [value]*count
+  if len(value) != count:
+    raise ValueError("need one %s per file" % name)
+  return list(value)
+
+def split_lines(path, chunk_size):
+  """
+  (start, stop) byte offsets of chunks of a file which end after a newline
+  """
+  size = os.path.getsize(path)
+  if size == 0:
+    return []
+  chunks = []
+  with open(path, "rb") as f, mmap.mmap(f.fileno(), 0,
+                                        access=mmap.ACCESS_READ) as buf:
+    start = 0
+    while start < size:
+      stop = buf.find(b"\n", min(start + chunk_size, size) - 1)
+      stop = size if stop < 0 else stop + 1
+      chunks.append((start, stop))
+      start = stop
+  return chunks
+
+def _parse_chunk(task):
+  """
+  Parses the lines from 'start' to 'stop' of a file
+
+  @return: (values, byte offsets of the lines)
+  """
+  source, path, start, stop, parser, column = task
+  with open(path, "rb") as f:
+    buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+  # the map cannot be closed while an array refers to it, so it is left to
+  # close when the last reference goes
+  chunk = numpy.frombuffer(buf, dtype=numpy.uint8, count=stop - start,
+                           offset=start)
+  values, lines = _chunk_parsers[parser](chunk, column)
+  return values, lines + start
+
+def _line_starts(chunk):
+  """
+  Offsets of the first character and of the newline, or end, of each line
+  """
+  ends = numpy.flatnonzero(chunk == 10)
+  if not len(chunk) or chunk[-1] != 10:
+    ends = numpy.append(ends, len(chunk))
+  starts = numpy.empty_like(ends)
+  starts[0:1] = 0
+  starts[1:] = ends[:-1] + 1
+  return starts, ends
+
+def _fields(chunk, column, width):
+  """
+  'width' characters from 'column' in each line, less 48 (so digits are 0-9)
+
+  @return: (one row per character, offsets of the lines, True where the line
+            is long enough)
+  """
+  starts, ends = _line_starts(chunk)
+  first = starts + column
+  long_enough = first + width <= ends
+  first = first[long_enough]
+  characters = numpy.empty((width, len(first)), dtype=numpy.uint8)
+  for index in range(width):
+    numpy.subtract(chunk.take(first + index), 48, out=characters[index])
+  return characters, starts[long_enough]
+
+def _seconds_of_day(characters, position):
+  """
+  Seconds from HH:MM:SS starting at 'position' and True where it is valid
+  """
+  colon = ord(":") - 48
+  valid = ((characters[position + 2] == colon)
+           & (characters[position + 5] == colon))
+  seconds = numpy.zeros(characters.shape[1], dtype=numpy.int64)
+  for place, scale in ((0, 36000), (1, 3600), (3, 600), (4, 60), (6, 10),
+                       (7, 1)):
+    digit = characters[position + place]
+    valid &= digit <= 9
+    seconds += digit.astype(numpy.int64)*scale
+  return seconds, valid
+
+def _parse_logtimes(chunk, column):
+  """
+  Seconds of the day from HH:MM:SS
+  """
+  characters, lines = _fields(chunk, column, 8)
+  seconds, valid = _seconds_of_day(characters, 0)
+  return seconds[valid], lines[valid]
+
+def _parse_macro(chunk, column):
+  """
+  Day of year times 86400 plus seconds of the day, from DDD_HH:MM:SS
+  """
+  characters, lines = _fields(chunk, column, 12)
+  seconds, valid = _seconds_of_day(characters, 4)
+  valid &= characters[3] == ord("_") - 48
+  doy = numpy.zeros(characters.shape[1], dtype=numpy.int64)
+  for place in range(3):
+    valid &= characters[place] <= 9
+    doy = doy*10 + characters[place]
+  return (doy*86400 + seconds)[valid], lines[valid]
+
+def _parse_ISO(chunk, column):
+  """
+  UNIX times from ISO times
+  """
+  starts, ends = _line_starts(chunk)
+  first = starts + column
+  records = numpy.zeros((len(starts), _ISO_width), dtype=numpy.uint8)
+  ended = first >= ends
+  for index in range(_ISO_width):
+    character = chunk.take(numpy.minimum(first + index, len(chunk) - 1))
+    ended |= (first + index >= ends) | (character == 9)
+    if index != 10:
+      # a space may only separate the date and the time
+      ended |= character == 32
+    records[:, index] = numpy.where(ended, 0, character)
+  microseconds = _ISO_records_to_us(records)
+  valid = microseconds != _NaT
+  return microseconds[valid]/1e6, starts[valid]
+
+_chunk_parsers = {"logtime": _parse_logtimes,
+                  "macro": _parse_macro,
+                  "ISO": _parse_ISO}
+
+def _logtimes(seconds, year, doy):
+  """
+  UNIX times from the seconds of the day of all the lines of one file
+  """
+  days = numpy.zeros(len(seconds), dtype=numpy.int64)
+  numpy.cumsum(seconds[1:] < seconds[:-1], out=days[1:])
+  days += _unix_day_array(year, doy)
+  return (days*86400 + seconds).astype(float)
+
+def _macro_times(values, year):
+  """
+  UNIX times from day of year and time of all the lines of one file
+  """
+  doy, seconds = numpy.divmod(values, 86400)
+  years = numpy.zeros(len(values), dtype=numpy.int64)
+  numpy.cumsum(doy[1:] < doy[:-1], out=years[1:])
+  years += year
+  return (_unix_day_array(years, doy)*86400 + seconds).astype(float)
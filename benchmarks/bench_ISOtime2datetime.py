@@ -0,0 +1,56 @@
+"""
+Throughput of ISOtime2datetime() compared with the strptime parser
+
+For each ISO layout this times the public function, which slices fixed-width
+strings, against _ISOtime_by_strptime(), the regular expression and strptime
+path that it falls back on.  The ISOtime2datetime class is part of the suite
+run by benchmarks/run.py; as a script, with the DatesTimes package
+importable, this prints a table of the gain::
+
+  python benchmarks/bench_ISOtime2datetime.py [number]
+"""
+import sys
+import timeit
+
+import DatesTimes
+
+samples = ["2020-06-19T12:34:56",
+           "2020-06-19T12:34",
+           "2020-171T12:34",
+           "2020-171T12:34:56",
+           "20200619T123456",
+           "2020171T1234",
+           "2020171T123456",
+           "2020171T123456.789",
+           "2020-06-19 12:34:56",
+           "2020-06-19 12:34:56.789012"]
+
+class ISOtime2datetime:
+  params = samples
+  param_names = ["ISOtime"]
+
+  def time_sliced(self, ISOtime):
+    DatesTimes.ISOtime2datetime(ISOtime)
+
+  def time_strptime(self, ISOtime):
+    DatesTimes._ISOtime_by_strptime(ISOtime)
+
+def throughput(function, string, number):
+  """
+  Best of five runs, in strings per second
+  """
+  best = min(timeit.repeat(lambda: function(string), number=number, repeat=5))
+  return number/best
+
+def main(number=20000):
+  print("%-28s %12s %12s %8s" % ("string", "strptime/s", "sliced/s", "gain"))
+  for string in samples:
+    old = throughput(DatesTimes._ISOtime_by_strptime, string, number)
+    new = throughput(DatesTimes.ISOtime2datetime, string, number)
+    print("%-28s %12.0f %12.0f %7.1fx" % (string, old, new, new/old))
+
+if __name__ == "__main__":
+  if len(sys.argv) > 1:
+    main(int(sys.argv[1]))
+  else:
+    main()
@@ -0,0 +1,43 @@
+"""
+Benchmarks for extracting times from log archives
+"""
+import os
+import tempfile
+
+import numpy
+
+import DatesTimes
+from bench_converters import N
+
+class Archive:
+  def setup(self):
+    self.directory = tempfile.TemporaryDirectory()
+    seconds = numpy.sort(numpy.random.randint(0, 86400, N))
+    lines = ["%02d:%02d:%02d antenna status nominal\n"
+             % (s//3600, s//60 % 60, s % 60) for s in seconds]
+    self.path = os.path.join(self.directory.name, "eac.log")
+    with open(self.path, "w") as f:
+      f.writelines(lines)
+
+  def time_extract_timestamps(self):
+    DatesTimes.extract_timestamps(self.path, year=2020, doy=171, workers=1)
+
+  def time_extract_timestamps_batch(self):
+    DatesTimes.extract_timestamps(self.path, year=2020, doy=171,
+                                  chunk_size=2**16)
+
+class CachedArchive(Archive):
+  # the second run over an unchanged file
+  def setup(self):
+    Archive.setup(self)
+    self.cache = DatesTimes.TimestampCache(os.path.join(self.directory.name,
+                                                        "cache"))
+    DatesTimes.extract_timestamps(self.path, year=2020, doy=171, workers=1,
+                                  cache=self.cache)
+
+  def time_extract_timestamps(self):
+    DatesTimes.extract_timestamps(self.path, year=2020, doy=171, workers=1,
+                                  cache=self.cache)
+
+  def time_cache_get(self):
+    self.cache.get(self.path, "logtime", year=2020, doy=171, column=0)
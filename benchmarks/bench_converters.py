@@ -0,0 +1,368 @@
+"""
+Benchmarks for the public DatesTimes converters
+
+These follow the asv conventions: each class has a setup() which builds the
+inputs and time_* methods which are timed.  A method named for a function,
+time_<function>, times one scalar call; time_<function>_batch times one call
+on (or a loop over) a column of DATESTIMES_BENCH_SIZE values, 10^6 unless
+set otherwise.  Run them with benchmarks/run.py.
+"""
+import datetime
+import io
+import os
+
+import numpy
+
+import DatesTimes
+
+N = int(os.environ.get("DATESTIMES_BENCH_SIZE", 10**6))
+
+def random_VSR_tuples(size, seed=1):
+  """
+  Columns of years, days of year and seconds of day
+  """
+  generator = numpy.random.default_rng(seed)
+  year = generator.integers(1970, 2100, size)
+  doy = generator.integers(1, 366, size)
+  seconds = generator.uniform(0, 86400, size)
+  return year, doy, seconds
+
+class Calendar:
+  def setup(self):
+    self.year, self.doy, self.seconds = random_VSR_tuples(N)
+    self.year_month_day = DatesTimes.calendar_date(self.year, self.doy)
+
+  def time_calendar_date(self):
+    DatesTimes.calendar_date(2020, 171)
+
+  def time_calendar_date_batch(self):
+    DatesTimes.calendar_date(self.year, self.doy)
+
+  def time_julian_date(self):
+    DatesTimes.julian_date(2020, 171)
+
+  def time_julian_date_batch(self):
+    DatesTimes.julian_date(self.year, self.doy)
+
+  def time_day_of_year(self):
+    DatesTimes.day_of_year(2020, 6, 19)
+
+  def time_day_of_year_batch(self):
+    DatesTimes.day_of_year(*self.year_month_day)
+
+  def time_leap_year(self):
+    DatesTimes.leap_year(2020)
+
+  def time_leap_year_batch(self):
+    DatesTimes.leap_year(self.year)
+
+  def time_day_of_week(self):
+    DatesTimes.day_of_week(171, 2020)
+
+  def time_day_of_week_batch(self):
+    DatesTimes.day_of_week(self.doy, self.year)
+
+  def time_week_number(self):
+    DatesTimes.week_number(2020, 171)
+
+  def time_week_number_batch(self):
+    DatesTimes.week_number(self.year, self.doy)
+
+  def time_set_day_table_range(self):
+    DatesTimes.set_day_table_range(1950, 2100)
+    DatesTimes.day_table.get(2020, 171)
+
+  def time_day_table_lookup(self):
+    DatesTimes.day_table.lookup(2020, 171)
+
+  def time_day_table_lookup_batch(self):
+    DatesTimes.day_table.lookup(self.year, self.doy)
+
+  def time_MJD(self):
+    DatesTimes.MJD(2020, 6, 19)
+
+  def time_MJD_batch(self):
+    DatesTimes.MJD(*self.year_month_day)
+
+class UnixTimes:
+  def setup(self):
+    year, doy, seconds = random_VSR_tuples(N)
+    self.unix = DatesTimes.VSR_array_to_timestamp(year, doy, seconds)
+    self.mpl = DatesTimes.UnixTime_to_MPL(self.unix)
+    self.mjd = DatesTimes.UnixTime_to_MJD(self.unix)
+    self.out = numpy.empty_like(self.unix)
+    self.dt = datetime.datetime(2020, 6, 19, 12, 34, 56)
+
+  def time_UnixTime_to_MPL(self):
+    DatesTimes.UnixTime_to_MPL(1592570096.)
+
+  def time_UnixTime_to_MPL_batch(self):
+    DatesTimes.UnixTime_to_MPL(self.unix, out=self.out)
+
+  def time_MPLtime_to_UnixTime(self):
+    DatesTimes.MPLtime_to_UnixTime(737595.5)
+
+  def time_MPLtime_to_UnixTime_batch(self):
+    DatesTimes.MPLtime_to_UnixTime(self.mpl, out=self.out)
+
+  def time_UnixTime_to_MJD(self):
+    DatesTimes.UnixTime_to_MJD(1592570096.)
+
+  def time_UnixTime_to_MJD_batch(self):
+    DatesTimes.UnixTime_to_MJD(self.unix, out=self.out)
+
+  def time_MJD_to_UnixTime(self):
+    DatesTimes.MJD_to_UnixTime(59019.5)
+
+  def time_MJD_to_UnixTime_batch(self):
+    DatesTimes.MJD_to_UnixTime(self.mjd, out=self.out)
+
+  def time_GMST(self):
+    DatesTimes.GMST(1592570096.)
+
+  def time_GMST_batch(self):
+    DatesTimes.GMST(self.unix, out=self.out)
+
+  def time_LST(self):
+    DatesTimes.LST(1592570096., -116.89)
+
+  def time_LST_batch(self):
+    DatesTimes.LST(self.unix, -116.89, out=self.out)
+
+  def time_num2date(self):
+    DatesTimes.num2date(737595.5)
+
+  def time_UnixTime_to_datetime(self):
+    DatesTimes.UnixTime_to_datetime(1592570096.)
+
+  def time_local_time_of_day(self):
+    DatesTimes.local_time_of_day(1592570096., "CDSCC")
+
+  def time_local_time_of_day_batch(self):
+    DatesTimes.local_time_of_day(self.unix, "CDSCC")
+
+  def time_local_HHMM(self):
+    DatesTimes.local_HHMM(1592570096., "GDSCC")
+
+  def time_local_HHMM_batch(self):
+    DatesTimes.local_HHMM(self.unix, "GDSCC")
+
+  def time_get_timezone(self):
+    DatesTimes.get_timezone(-3.5)
+
+  def time_station_timezone(self):
+    DatesTimes.station_timezone(63)
+
+  def time_register_timezone(self):
+    DatesTimes.register_timezone("DSS-13", -8)
+
+  def time_datetime_to_UnixTime(self):
+    DatesTimes.datetime_to_UnixTime(self.dt)
+
+  def time_timetuple_to_datetime(self):
+    DatesTimes.timetuple_to_datetime((2020, 6, 19, 12, 34, 56))
+
+  def time_timestamp_to_str_with_ms(self):
+    DatesTimes.timestamp_to_str_with_ms(1592570096.25)
+
+  def time_seconds(self):
+    DatesTimes.seconds(datetime.timedelta(days=1, seconds=5))
+
+class ISOTimes:
+  def setup(self):
+    year, doy, seconds = random_VSR_tuples(N)
+    times = DatesTimes.VSR_array_to_datetime64(year, doy, seconds)
+    self.iso = numpy.datetime_as_string(times, unit="s").astype("S19")
+    rows = zip(year.tolist(), doy.tolist(), seconds.astype(int).tolist())
+    self.iso_doy = numpy.array(["%04d%03dT%02d%02d%02d"
+                                % (y, d, s//3600, s//60 % 60, s % 60)
+                                for y, d, s in rows], dtype="S14")
+
+  def time_ISOtime2datetime(self):
+    DatesTimes.ISOtime2datetime("2020-06-19T12:34:56")
+
+  def time_ISOtime2datetime_batch(self):
+    parse = DatesTimes.ISOtime2datetime
+    for ISOtime in self.iso.astype(str).tolist():
+      parse(ISOtime)
+
+  def time_ISOtime_array(self):
+    DatesTimes.ISOtime_array(["2020-06-19T12:34:56"])
+
+  def time_ISOtime_array_batch(self):
+    DatesTimes.ISOtime_array(self.iso)
+
+  def time_ISOtime_array_doy_batch(self):
+    DatesTimes.ISOtime_array(self.iso_doy)
+
+  def time_format_ISO_time(self):
+    DatesTimes.format_ISO_time("2020", "171", "1234")
+
+class VSRTimes:
+  def setup(self):
+    self.year, self.doy, self.seconds = random_VSR_tuples(N)
+    self.tuples = numpy.stack((self.year, self.doy, self.seconds), axis=1)
+    # a macro log spanning midnight
+    seconds = (numpy.arange(N) % 172800).tolist()
+    self.macro_times = ["%03d_%02d:%02d:%02d" % (101 + s//86400, s//3600 % 24,
+                                                 s//60 % 60, s % 60)
+                        for s in seconds]
+
+  def time_VSR_to_datetime(self):
+    DatesTimes.VSR_to_datetime((2010, 15, 16212))
+
+  def time_VSR_array_to_datetime64_batch(self):
+    DatesTimes.VSR_array_to_datetime64(self.tuples)
+
+  def time_VSR_array_to_timestamp_batch(self):
+    DatesTimes.VSR_array_to_timestamp(self.year, self.doy, self.seconds)
+
+  def time_VSR_to_timetuple(self):
+    DatesTimes.VSR_to_timetuple((2010, 101, 12345))
+
+  def time_VSR_timestring_to_ISOtime(self):
+    DatesTimes.VSR_timestring_to_ISOtime((2010, 101, 12345))
+
+  def time_VSR_script_time(self):
+    DatesTimes.VSR_script_time(101, 3, 25, 45)
+
+  def time_VSR_script_time_to_timestamp(self):
+    DatesTimes.VSR_script_time_to_timestamp(2010, "101/03:25:45")
+
+  def time_WVSR_script_time_to_timestamp(self):
+    DatesTimes.WVSR_script_time_to_timestamp("16/237", "08:45:01")
+
+  def time_macro_log_time_to_UnixTime(self):
+    DatesTimes.macro_log_time_to_UnixTime(2010, "101_03:25:45")
+
+  def time_macro_log_time_to_UnixTime_batch(self):
+    convert = DatesTimes.macro_log_time_to_UnixTime
+    for timestr in self.macro_times:
+      convert(2010, timestr)
+
+  def time_midnight_cache_info(self):
+    DatesTimes.midnight_cache_info()
+
+  def time_midnight_cache_clear(self):
+    DatesTimes.midnight_cache_clear()
+
+  def time_set_midnight_cache_size(self):
+    DatesTimes.set_midnight_cache_size(256)
+
+  def time_VSR_tuple_to_MPL(self):
+    DatesTimes.VSR_tuple_to_MPL(2010, 101, 12345)
+
+  def time_VSR_tuple_to_datetime(self):
+    DatesTimes.VSR_tuple_to_datetime(2010, 101, 12345)
+
+  def time_VSR_tuple_to_timestamp(self):
+    DatesTimes.VSR_tuple_to_timestamp(2010, 101, 12345)
+
+  def time_make_VSR_timestring(self):
+    DatesTimes.make_VSR_timestring()
+
+  def time_VSR_timestamp(self):
+    DatesTimes.VSR_timestamp()
+
+  def time_incr_VSR_timestring(self):
+    DatesTimes.incr_VSR_timestring("2010 101 12345")
+
+  def time_incr_VSR_timestamp(self):
+    DatesTimes.incr_VSR_timestamp("2010 101 12345")
+
+class LogTimes:
+  def setup(self):
+    seconds = numpy.arange(N) % 86400
+    lines = ["%02d:%02d:%02d log entry\n" % (s//3600, s//60 % 60, s % 60)
+             for s in seconds.tolist()]
+    self.log = "".join(lines)
+
+  def time_logtime_to_timetuple(self):
+    DatesTimes.logtime_to_timetuple("12:34:56")
+
+  def time_HHMMSS_to_seconds(self):
+    DatesTimes.HHMMSS_to_seconds("12:34:56")
+
+  def time_iter_logtimes_batch(self):
+    for t in DatesTimes.iter_logtimes(io.StringIO(self.log), 2020, 1):
+      pass
+
+  def time_logtime_chunks_batch(self):
+    for chunk in DatesTimes.logtime_chunks(io.StringIO(self.log), 2020, 1):
+      pass
+
+class Strings:
+  def time_HHMM_to_timetuple(self):
+    DatesTimes.HHMM_to_timetuple("1234")
+
+  def time_HHMM_to_dec_deg(self):
+    DatesTimes.HHMM_to_dec_deg("1234")
+
+  def time_timetuple_to_HHMM(self):
+    DatesTimes.timetuple_to_HHMM(1592570096.)
+
+  def time_YYYYDDD_datecode(self):
+    DatesTimes.YYYYDDD_datecode(2020, "-", 171)
+
+  def time_make_date_string(self):
+    DatesTimes.make_date_string((2020, 6, 19))
+
+  def time_parse_date(self):
+    DatesTimes.parse_date("2020-06-19")
+
+  def time_deg_to_IAU_str(self):
+    DatesTimes.deg_to_IAU_str((12.5, -30.25))
+
+  def time_time_int_to_decimal(self):
+    DatesTimes.time_int_to_decimal("-123456.7")
+
+  def time_DDDMM_to_dec_deg(self):
+    DatesTimes.DDDMM_to_dec_deg("-3015")
+
+class Sexagesimal:
+  def setup(self):
+    random = numpy.random.RandomState(1)
+    self.degrees = random.uniform(-90, 90, N)
+    self.hours = random.uniform(0, 24, N)
+    self.DDMMSS = DatesTimes.decimal_to_sexagesimal(self.degrees, decimals=1,
+                                                    signed=True)
+    self.DDMM = DatesTimes.decimal_to_sexagesimal(self.degrees, 1,
+                                                  signed=True)
+    self.HHMM = DatesTimes.decimal_to_sexagesimal(self.hours, 1)
+
+  def time_time_int_to_decimal_batch(self):
+    DatesTimes.time_int_to_decimal(self.DDMMSS)
+
+  def time_DDDMM_to_dec_deg_batch(self):
+    DatesTimes.DDDMM_to_dec_deg(self.DDMM)
+
+  def time_HHMM_to_dec_deg_batch(self):
+    DatesTimes.HHMM_to_dec_deg(self.HHMM)
+
+  def time_decimal_to_sexagesimal(self):
+    DatesTimes.decimal_to_sexagesimal(12.5824)
+
+  def time_decimal_to_sexagesimal_batch(self):
+    DatesTimes.decimal_to_sexagesimal(self.degrees, decimals=1, signed=True)
+
+class Clock:
+  def time_set_clock_precision(self):
+    DatesTimes.set_clock_precision()
+
+  def time_now_string(self):
+    DatesTimes.now_string()
+
+  def time_format_now(self):
+    DatesTimes.format_now()
+
+  def time_get_current_week(self):
+    DatesTimes.get_current_week()
+
+  def time_nowgmt(self):
+    DatesTimes.nowgmt()
+
+  def time_logtime(self):
+    DatesTimes.logtime()
+
+  def time_logtimestamp(self):
+    DatesTimes.logtimestamp()
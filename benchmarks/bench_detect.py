@@ -0,0 +1,29 @@
+"""
+Benchmarks for format detection and parsing of time columns
+"""
+import numpy
+
+import DatesTimes
+from bench_converters import N, random_VSR_tuples
+
+class ParseColumn:
+  def setup(self):
+    year, doy, seconds = random_VSR_tuples(N)
+    seconds = seconds.astype(int)
+    self.VSR = numpy.array(["%04d %03d %5d" % row for row in
+                            zip(year.tolist(), doy.tolist(), seconds.tolist())],
+                           dtype="S")
+    self.script = numpy.array(["%03d/%02d:%02d:%02d" % (d, s//3600, s//60 % 60,
+                                                        s % 60)
+                               for d, s in zip(doy.tolist(), seconds.tolist())],
+                              dtype="S")
+    self.sample = self.VSR[:100]
+
+  def time_detect_format(self):
+    DatesTimes.detect_format(self.sample)
+
+  def time_parse_column_VSR_batch(self):
+    DatesTimes.parse_column(self.VSR)
+
+  def time_parse_column_script_batch(self):
+    DatesTimes.parse_column(self.script, year=2020)
@@ -0,0 +1,34 @@
+"""
+Benchmarks for formatting arrays of times, compared with a loop of scalars
+"""
+import time
+
+import DatesTimes
+from bench_converters import N, random_VSR_tuples
+
+class Formatters:
+  params = ["VSR_timestring", "VSR_script_time", "ISOtime", "with_ms"]
+  param_names = ["pattern"]
+
+  def setup(self, pattern):
+    year, doy, seconds = random_VSR_tuples(N)
+    self.unix = DatesTimes.VSR_array_to_timestamp(year, doy, seconds)
+    self.format = DatesTimes.compile_format(pattern)
+    self.format.format(self.unix[:1])
+
+  def time_format_times_batch(self, pattern):
+    self.format.format(self.unix)
+
+class ScalarLoop:
+  def setup(self):
+    year, doy, seconds = random_VSR_tuples(N)
+    self.unix = DatesTimes.VSR_array_to_timestamp(year, doy,
+                                                  seconds).astype(int).tolist()
+
+  def time_strftime_loop(self):
+    for UnixTime in self.unix:
+      time.strftime("%Y %j ", time.gmtime(UnixTime)) + "%5d" % (UnixTime % 86400)
+
+class Compile:
+  def time_compile_format(self):
+    DatesTimes.formatters.TimeFormat("%Y-%m-%dT%H:%M:%S.%3f")
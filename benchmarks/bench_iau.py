@@ -0,0 +1,32 @@
+"""
+Benchmarks for IAU names of whole catalogs
+"""
+import numpy
+
+import DatesTimes
+from bench_converters import N
+
+class IAUNames:
+  def setup(self):
+    random = numpy.random.RandomState(1)
+    self.hours = random.uniform(0, 24, N)
+    self.degrees = random.uniform(0, 360, N)
+    self.latitude = random.uniform(-90, 90, N)
+    self.names = DatesTimes.IAU_names(self.hours, self.latitude, prefix="J")
+    self.index = DatesTimes.IAUNameIndex(self.names)
+    self.queries = self.names[::10].copy()
+
+  def time_deg_to_IAU_str_batch(self):
+    DatesTimes.deg_to_IAU_str((self.hours, self.latitude))
+
+  def time_IAU_names_g_batch(self):
+    DatesTimes.IAU_names(self.degrees, self.latitude, "g")
+
+  def time_IAUNameIndex_batch(self):
+    DatesTimes.IAUNameIndex(self.names)
+
+  def time_IAUNameIndex_lookup_batch(self):
+    self.index.lookup(self.queries)
+
+  def time_IAUNameIndex_rows(self):
+    self.index.rows(b"J1230-3015")
@@ -0,0 +1,94 @@
+"""
+Import time of the DatesTimes package
+
+Each run starts a fresh interpreter with ``python -X importtime`` and takes
+the cumulative time reported for DatesTimes.  The median of the runs is
+printed along with the modules it pulled in.  The result can be saved and a
+later run compared with it, which fails if startup has slowed down::
+
+  python benchmarks/bench_import.py --save import.json
+  python benchmarks/bench_import.py --compare import.json
+
+The DatesTimes package must be importable, e.g. through PYTHONPATH.
+"""
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+# modules which DatesTimes must not load when it is imported
+deferred = ["numpy", "calendar"]
+
+def import_profile():
+  """
+  Cumulative import times, in microseconds, from one fresh run
+
+  Only DatesTimes and the modules imported on its behalf are included, not
+  those loaded when the interpreter started.
+  """
+  run = subprocess.run([sys.executable, "-X", "importtime", "-c",
+                        "import DatesTimes"], capture_output=True, text=True,
+                       check=True)
+  profile = {}
+  for line in run.stderr.splitlines():
+    if not line.startswith("import time:") or "|" not in line:
+      continue
+    fields = line[len("import time:"):].split("|")
+    try:
+      cumulative = int(fields[1])
+    except ValueError:
+      # the header line
+      continue
+    name = fields[2].strip()
+    profile[name] = cumulative
+    if len(fields[2]) - len(fields[2].lstrip()) == 1:
+      # a top level import, which is reported after its dependencies
+      if name == "DatesTimes":
+        break
+      profile = {}
+  return profile
+
+def measure(runs=11):
+  """
+  Median import time of DatesTimes and the modules imported with it
+  """
+  # the first run may have to compile the byte code
+  import_profile()
+  profiles = [import_profile() for run in range(runs)]
+  last = profiles[-1]
+  return {"import_us": statistics.median(p["DatesTimes"] for p in profiles),
+          "runs": runs,
+          "deferred_loaded": [name for name in deferred if name in last],
+          "slowest": sorted(last.items(), key=lambda item: -item[1])[:10]}
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+  parser.add_argument("--runs", type=int, default=11)
+  parser.add_argument("--save", help="write the result to this JSON file")
+  parser.add_argument("--compare", help="JSON file from an earlier --save")
+  parser.add_argument("--tolerance", type=float, default=0.25,
+                      help="allowed fractional slowdown (default 0.25)")
+  args = parser.parse_args()
+  result = measure(args.runs)
+  print("import DatesTimes: %.0f us (median of %d)"
+        % (result["import_us"], result["runs"]))
+  for name, microseconds in result["slowest"]:
+    print("  %8d us  %s" % (microseconds, name))
+  failed = False
+  if result["deferred_loaded"]:
+    print("imported at startup: %s" % ", ".join(result["deferred_loaded"]))
+    failed = True
+  if args.save:
+    with open(args.save, "w") as f:
+      json.dump(result, f, indent=1)
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+    ratio = result["import_us"]/baseline["import_us"]
+    print("%.2f times the baseline of %.0f us" % (ratio, baseline["import_us"]))
+    failed = failed or ratio > 1 + args.tolerance
+  return 1 if failed else 0
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,21 @@
+"""
+Benchmarks for the cost of instrumentation
+
+The wrapped function is kept here rather than put in the DatesTimes
+namespace, so that the other benchmarks are not affected.
+"""
+import DatesTimes
+from DatesTimes import instrument
+
+class Instrument:
+  def setup(self):
+    self.calendar_date = instrument._wrapper("bench", DatesTimes.calendar_date)
+
+  def time_calendar_date_instrumented(self):
+    self.calendar_date(2020, 171)
+
+  def time_calendar_date_plain(self):
+    DatesTimes.calendar_date(2020, 171)
+
+  def time_instrumentable(self):
+    instrument.instrumentable()
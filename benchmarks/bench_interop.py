@@ -0,0 +1,37 @@
+"""
+Benchmarks for sharing times with pandas and Arrow
+
+These are skipped where pandas or pyarrow is not installed.
+"""
+import importlib
+
+import DatesTimes
+from bench_converters import N, random_VSR_tuples
+
+class Interop:
+  def setup(self):
+    for name in ("pandas", "pyarrow"):
+      try:
+        importlib.import_module(name)
+      except ImportError:
+        raise NotImplementedError("%s is not installed" % name)
+    year, doy, seconds = random_VSR_tuples(N)
+    self.unix = DatesTimes.VSR_array_to_timestamp(year, doy, seconds)
+    self.times = DatesTimes.TimeArray.from_unix(self.unix)
+    self.index = DatesTimes.to_pandas(self.times)
+    self.arrow = DatesTimes.to_arrow(self.times)
+
+  def time_to_pandas_batch(self):
+    DatesTimes.to_pandas(self.times)
+
+  def time_to_pandas_unix_batch(self):
+    DatesTimes.to_pandas(self.unix, "unix")
+
+  def time_from_pandas_batch(self):
+    DatesTimes.from_pandas(self.index)
+
+  def time_to_arrow_batch(self):
+    DatesTimes.to_arrow(self.times)
+
+  def time_from_arrow_batch(self):
+    DatesTimes.from_arrow(self.arrow)
@@ -0,0 +1,29 @@
+"""
+Benchmarks for the leap second conversions
+"""
+import DatesTimes
+from bench_converters import N, random_VSR_tuples
+
+class LeapSeconds:
+  def setup(self):
+    year, doy, seconds = random_VSR_tuples(N)
+    self.unix = DatesTimes.VSR_array_to_timestamp(year, doy, seconds)
+    self.gps = DatesTimes.UTC_to_GPS(self.unix)
+
+  def time_TAI_minus_UTC(self):
+    DatesTimes.TAI_minus_UTC(1592570096.)
+
+  def time_TAI_minus_UTC_batch(self):
+    DatesTimes.TAI_minus_UTC(self.unix)
+
+  def time_UTC_to_GPS(self):
+    DatesTimes.UTC_to_GPS(1592570096.)
+
+  def time_UTC_to_GPS_batch(self):
+    DatesTimes.UTC_to_GPS(self.unix)
+
+  def time_GPS_to_UTC(self):
+    DatesTimes.GPS_to_UTC(1276605314.)
+
+  def time_GPS_to_UTC_batch(self):
+    DatesTimes.GPS_to_UTC(self.gps)
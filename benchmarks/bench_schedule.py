@@ -0,0 +1,36 @@
+"""
+Benchmarks for the DSN schedule index
+"""
+import numpy
+
+import DatesTimes
+from bench_converters import N
+
+class Schedule:
+  def setup(self):
+    # a year of passes of a few hours on three antennas
+    random = numpy.random.RandomState(1)
+    days = numpy.repeat(numpy.arange(1, 366), 9)
+    starts = random.randint(0, 1440, len(days))
+    ends = (starts + random.randint(60, 600, len(days))) % 1440
+    self.lines = ["2020-%03d %02d%02d %02d%02d DSS-%d" % (day, b//60, b % 60,
+                                                         e//60, e % 60, dss)
+                  for day, b, e, dss in zip(days, starts, ends,
+                                            random.choice([14, 43, 63],
+                                                          len(days)))]
+    self.index = DatesTimes.parse_schedule(self.lines)
+    first = DatesTimes.VSR_array_to_timestamp(2020, 1, 0)
+    self.times = first + random.uniform(0, 365*86400, N)
+    self.time = self.times[0]
+
+  def time_parse_schedule(self):
+    DatesTimes.parse_schedule(self.lines[:9])
+
+  def time_parse_schedule_batch(self):
+    DatesTimes.parse_schedule(self.lines)
+
+  def time_ScheduleIndex_at(self):
+    self.index.at(self.time)
+
+  def time_ScheduleIndex_active_batch(self):
+    self.index.active(self.times)
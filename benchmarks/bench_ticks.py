@@ -0,0 +1,30 @@
+"""
+Benchmarks for the stream of VSR ticks, on a clock which does not wait
+"""
+import asyncio
+
+import DatesTimes
+
+class Ticks:
+  def setup(self):
+    self.now = 1592570096.5
+
+  def clock(self):
+    return self.now
+
+  async def sleep(self, seconds):
+    self.now += seconds
+
+  def ticks(self, count):
+    async def drain():
+      async for tick in DatesTimes.VSR_ticks(count, 1, self.clock,
+                                             self.sleep):
+        pass
+    asyncio.run(drain())
+
+  def time_VSR_ticks(self):
+    self.ticks(1)
+
+  def time_VSR_ticks_batch(self):
+    # a day of ticks, through midnight
+    self.ticks(86400)
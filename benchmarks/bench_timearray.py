@@ -0,0 +1,40 @@
+"""
+Benchmarks for TimeArray construction and its derived views
+
+Each view is timed on a fresh TimeArray, so the first, computing, access is
+measured rather than the cached one.
+"""
+
+import DatesTimes
+from bench_converters import N, random_VSR_tuples
+
+class TimeArrays:
+  def setup(self):
+    self.year, self.doy, self.seconds = random_VSR_tuples(N)
+    self.ns = DatesTimes.TimeArray.from_vsr(self.year, self.doy,
+                                            self.seconds).ns
+    self.unix = self.ns/1e9
+
+  def time_from_vsr_batch(self):
+    DatesTimes.TimeArray.from_vsr(self.year, self.doy, self.seconds)
+
+  def time_from_unix_batch(self):
+    DatesTimes.TimeArray.from_unix(self.unix)
+
+  def time_unix_batch(self):
+    DatesTimes.TimeArray(self.ns).unix
+
+  def time_mjd_batch(self):
+    DatesTimes.TimeArray(self.ns).mjd
+
+  def time_mpl_batch(self):
+    DatesTimes.TimeArray(self.ns).mpl
+
+  def time_vsr_batch(self):
+    DatesTimes.TimeArray(self.ns).vsr
+
+  def time_iso_batch(self):
+    DatesTimes.TimeArray(self.ns).iso
+
+  def time_slice(self):
+    DatesTimes.TimeArray(self.ns)[10:-10]
@@ -0,0 +1,195 @@
+"""
+Runs the DatesTimes benchmark suite and compares results across commits
+
+The suite is every bench_*.py module in this directory.  Benchmarks are
+written as for asv: classes with an optional setup() and time_* methods,
+optionally parametrized by a 'params' list; a setup() which raises
+NotImplementedError skips the class, for optional dependencies.  Each one
+is timed with timeit and the per-call times are written as JSON together
+with the commit, Python and NumPy versions::
+
+  python benchmarks/run.py -o before.json
+  ... change things ...
+  python benchmarks/run.py -o after.json
+  python benchmarks/run.py --compare before.json after.json
+
+'--size' sets the length of the batch inputs (10^6 by default) and '-b'
+selects benchmarks by regular expression.  The run ends with a list of the
+public DatesTimes functions which have no benchmark, so the suite can be
+kept complete.  The DatesTimes package must be importable.
+"""
+import argparse
+import datetime
+import glob
+import importlib.util
+import inspect
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import timeit
+
+here = os.path.dirname(os.path.abspath(__file__))
+
+# public functions which cannot be timed usefully
+untimed = {"get_date": "asks for input",
+           "mpldate2doy": "calls num2date() with an unsupported tz argument"}
+
+def load_modules():
+  """
+  The bench_*.py modules in this directory
+  """
+  modules = []
+  for path in sorted(glob.glob(os.path.join(here, "bench_*.py"))):
+    name = os.path.splitext(os.path.basename(path))[0]
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    modules.append(module)
+  return modules
+
+def benchmarks(modules):
+  """
+  Generates (name, class, method name, parameter) for every benchmark
+  """
+  for module in modules:
+    for class_name, cls in inspect.getmembers(module, inspect.isclass):
+      if cls.__module__ != module.__name__:
+        continue
+      methods = [name for name in sorted(vars(cls)) if name.startswith("time_")]
+      for method in methods:
+        name = "%s.%s.%s" % (module.__name__, class_name, method)
+        for param in getattr(cls, "params", [None]):
+          if param is None:
+            yield name, cls, method, None
+          else:
+            yield "%s(%r)" % (name, param), cls, method, param
+
+def time_one(cls, method, param, repeat):
+  """
+  Per-call times, in seconds, from 'repeat' timeit runs
+  """
+  instance = cls()
+  args = () if param is None else (param,)
+  if hasattr(instance, "setup"):
+    instance.setup(*args)
+  function = getattr(instance, method)
+  timer = timeit.Timer(lambda: function(*args))
+  number, elapsed = timer.autorange()
+  times = timer.repeat(repeat=repeat, number=number)
+  return [t/number for t in times], number
+
+def metadata():
+  """
+  What the results were measured with
+  """
+  try:
+    commit = subprocess.run(["git", "rev-parse", "HEAD"], cwd=here,
+                            capture_output=True, text=True).stdout.strip()
+  except OSError:
+    commit = ""
+  import numpy
+  return {"commit": commit,
+          "date": datetime.datetime.now(datetime.timezone.utc).isoformat(
+                                                           timespec="seconds"),
+          "python": platform.python_version(),
+          "numpy": numpy.__version__,
+          "machine": platform.machine(),
+          "size": int(os.environ["DATESTIMES_BENCH_SIZE"])}
+
+def uncovered(results):
+  """
+  Public DatesTimes functions with no time_<function>(_batch) benchmark
+  """
+  import DatesTimes
+  timed = set()
+  for name in results:
+    function = name.split("(")[0].rsplit(".", 1)[1][len("time_"):]
+    if function.endswith("_batch"):
+      function = function[:-len("_batch")]
+    timed.add(function)
+  functions = [name for name, value in vars(DatesTimes).items()
+               if inspect.isfunction(value) and not name.startswith("_")
+               and value.__module__ == DatesTimes.__name__]
+  return sorted(set(functions) - timed - set(untimed))
+
+def run(pattern, repeat):
+  """
+  Times the benchmarks whose names match the pattern
+  """
+  results = {}
+  for name, cls, method, param in benchmarks(load_modules()):
+    if pattern and not re.search(pattern, name):
+      continue
+    try:
+      times, number = time_one(cls, method, param, repeat)
+    except NotImplementedError:
+      # as in asv, setup() raises this when the benchmark cannot run here
+      print("%-70s %12s" % (name, "skipped"), flush=True)
+      continue
+    times.sort()
+    results[name] = {"min": times[0], "median": times[len(times)//2],
+                     "number": number, "repeat": repeat}
+    print("%-70s %12s" % (name, format_time(times[0])), flush=True)
+  return results
+
+def format_time(seconds):
+  for unit, scale in (("s", 1), ("ms", 1e-3), ("us", 1e-6)):
+    if seconds >= scale:
+      return "%.3g %s" % (seconds/scale, unit)
+  return "%.3g ns" % (seconds*1e9)
+
+def compare(before_file, after_file, threshold):
+  """
+  Prints the ratio of the minimum times; returns the number of slowdowns
+  """
+  with open(before_file) as f:
+    before = json.load(f)
+  with open(after_file) as f:
+    after = json.load(f)
+  print("%s -> %s" % (before["meta"]["commit"][:10],
+                      after["meta"]["commit"][:10]))
+  slower = 0
+  for name in sorted(set(before["results"]) & set(after["results"])):
+    ratio = after["results"][name]["min"]/before["results"][name]["min"]
+    if ratio > 1 + threshold:
+      flag = "slower"
+      slower += 1
+    elif ratio < 1/(1 + threshold):
+      flag = "faster"
+    else:
+      flag = ""
+    print("%-70s %12s %12s %6.2f %s" % (name,
+                      format_time(before["results"][name]["min"]),
+                      format_time(after["results"][name]["min"]), ratio, flag))
+  return slower
+
+def main():
+  parser = argparse.ArgumentParser(description=__doc__.split("\n")[1])
+  parser.add_argument("-b", "--bench", help="regular expression for names")
+  parser.add_argument("-o", "--output", help="JSON file for the results")
+  parser.add_argument("--size", type=int, default=10**6,
+                      help="length of batch inputs")
+  parser.add_argument("--repeat", type=int, default=5)
+  parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"),
+                      help="compare two result files instead of running")
+  parser.add_argument("--threshold", type=float, default=0.1,
+                      help="fractional change reported (default 0.1)")
+  args = parser.parse_args()
+  if args.compare:
+    return 1 if compare(args.compare[0], args.compare[1], args.threshold) else 0
+  os.environ["DATESTIMES_BENCH_SIZE"] = str(args.size)
+  results = run(args.bench, args.repeat)
+  if args.output:
+    with open(args.output, "w") as f:
+      json.dump({"meta": metadata(), "results": results}, f, indent=1)
+  if not args.bench:
+    missing = uncovered(results)
+    if missing:
+      print("no benchmark for: %s" % ", ".join(missing))
+  return 0
+
+if __name__ == "__main__":
+  sys.exit(main())
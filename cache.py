@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+"""
+Keeping the times parsed from files on disk, to be memory mapped next time
+
+Parsing the time column of a large log takes far longer than reading back
+the parsed values.  A TimestampCache stores the arrays parsed from a file as
+.npy files in a directory of their own, named from the path, size and
+modification time of the source and the parser and its options.  A file
+which has changed therefore gets a new entry, and an entry is opened with
+numpy.load(mmap_mode="r"), so only the pages which are used are read::
+
+  In [1]: cache = TimestampCache()
+  In [2]: arrays = cache.load("eac.log", "logtime", parse, year=2020, doy=171)
+
+where parse(path) returns a dict of arrays.  extract_timestamps() uses the
+cache with its 'cache' argument.  The other batch parsers take strings in
+memory rather than files, so they are cached through load() with a parse
+function which reads the file::
+
+  In [3]: def parse(path, **options):
+     ...:   with open(path, "rb") as f:
+     ...:     column = parse_column(f.read(), **options)
+     ...:   return {"times": column.times, "unmatched": column.unmatched}
+  In [4]: cache.load("times.txt", "parse_column", parse, year=2020)
+
+The options are part of the key as plain Python values, so numpy.int64(3)
+and 3 find the same entry.
+
+The cache is in $DATESTIMES_CACHE, or datestimes in $XDG_CACHE_HOME or
+~/.cache.  When it grows past its size limit the entries used least recently
+are removed.  Entries are written to a temporary directory and renamed, so a
+reader never sees a partly written entry.
+"""
+import hashlib
+import numbers
+import os
+import shutil
+import tempfile
+
+import numpy
+
+def cache_directory():
+  """
+  Default directory for cached times
+  """
+  try:
+    return os.environ["DATESTIMES_CACHE"]
+  except KeyError:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+                                             os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "datestimes")
+
+def _plain(value):
+  """
+  The value as built-in Python types, so that equal values have one repr
+  """
+  if isinstance(value, (bool, numpy.bool_)):
+    return bool(value)
+  if isinstance(value, numbers.Integral):
+    return int(value)
+  if isinstance(value, numbers.Real):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+  if isinstance(value, bytes):
+    return value.decode()
+  if isinstance(value, numpy.ndarray):
+    value = value.tolist()
+  if isinstance(value, (list, tuple)):
+    return tuple(_plain(item) for item in value)
+  if isinstance(value, numpy.str_):
+    return str(value)
+  return value
+
+class TimestampCache(object):
+  """
+  Arrays parsed from files, stored as .npy files
+
+  Public attributes::
+
+    directory - where the entries are
+    max_bytes - size above which the least recently used entries are removed
+  """
+  def __init__(self, directory=None, max_bytes=2**30):
+    """
+    @param directory : cache directory; cache_directory() if None
+    @type  directory : str
+
+    @param max_bytes : size limit for all the entries
+    @type  max_bytes : int
+    """
+    self.directory = directory or cache_directory()
+    self.max_bytes = max_bytes
+
+  def __repr__(self):
+    return "TimestampCache(%r, max_bytes=%d)" % (self.directory,
+                                                 self.max_bytes)
+
+  def key(self, path, parser, **options):
+    """
+    Name of the entry for a file parsed by 'parser' with 'options'
+    """
+    path = os.path.realpath(path)
+    status = os.stat(path)
+    identity = repr((path, status.st_size, status.st_mtime_ns, parser,
+                     sorted((name, _plain(value))
+                            for name, value in options.items())))
+    return hashlib.sha1(identity.encode()).hexdigest()
+
+  def get(self, path, parser, **options):
+    """
+    The cached arrays for a file, memory mapped, or None
+
+    @return: dict of numpy.memmap
+    """
+    entry = os.path.join(self.directory, self.key(path, parser, **options))
+    try:
+      names = os.listdir(entry)
+    except FileNotFoundError:
+      return None
+    arrays = {}
+    for name in names:
+      if name.endswith(".npy"):
+        arrays[name[:-4]] = numpy.load(os.path.join(entry, name),
+                                       mmap_mode="r")
+    # the modification time of an entry is the time it was last used
+    os.utime(entry)
+    return arrays
+
+  def put(self, path, parser, arrays, **options):
+    """
+    Stores the arrays parsed from a file
+
+    @param arrays : named arrays
+    @type  arrays : dict of numpy.ndarray
+    """
+    key = self.key(path, parser, **options)
+    os.makedirs(self.directory, exist_ok=True)
+    temporary = tempfile.mkdtemp(prefix=".%s." % key, dir=self.directory)
+    try:
+      for name, array in arrays.items():
+        numpy.save(os.path.join(temporary, name + ".npy"), array)
+      os.rename(temporary, os.path.join(self.directory, key))
+    except OSError:
+      # another process stored the same entry first
+      shutil.rmtree(temporary, ignore_errors=True)
+      if not os.path.isdir(os.path.join(self.directory, key)):
+        raise
+    self.evict(keep=key)
+
+  def load(self, path, parser, parse, **options):
+    """
+    The cached arrays for a file, parsed and stored first if need be
+
+    @param path : the source file
+
+    @param parser : name of the parser, part of the key
+
+    @param parse : called as parse(path, **options) to get a dict of arrays
+
+    @param options : anything else which changes the result, part of the key
+    """
+    arrays = self.get(path, parser, **options)
+    if arrays is None:
+      self.put(path, parser, parse(path, **options), **options)
+      arrays = self.get(path, parser, **options)
+    return arrays
+
+  def entries(self):
+    """
+    (last used, bytes, name) of each entry, least recently used first
+    """
+    entries = []
+    try:
+      names = os.listdir(self.directory)
+    except FileNotFoundError:
+      return entries
+    for name in names:
+      if name.startswith("."):
+        continue
+      entry = os.path.join(self.directory, name)
+      try:
+        size = sum(os.path.getsize(os.path.join(entry, item))
+                   for item in os.listdir(entry))
+        entries.append((os.path.getmtime(entry), size, name))
+      except OSError:
+        # removed by another process
+        continue
+    return sorted(entries)
+
+  def size(self):
+    """
+    Bytes used by all the entries
+    """
+    return sum(entry[1] for entry in self.entries())
+
+  def evict(self, keep=None):
+    """
+    Removes the least recently used entries until the cache fits max_bytes
+
+    @param keep : an entry not to remove
+    """
+    entries = self.entries()
+    total = sum(entry[1] for entry in entries)
+    for used, size, name in entries:
+      if total <= self.max_bytes:
+        break
+      if name == keep:
+        continue
+      shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+      total -= size
+
+  def clear(self):
+    """
+    Removes all the entries
+    """
+    for used, size, name in self.entries():
+      shutil.rmtree(os.path.join(self.directory, name), ignore_errors=True)
+
+_default = None
+
+def default_cache():
+  """
+  TimestampCache in cache_directory(), created on first use
+  """
+  global _default
+  if _default is None:
+    _default = TimestampCache()
+  return _default
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+"""
+Recognizing the format of a column of time strings and parsing all of it
+
+detect_format() looks at a few strings and says which of the formats of the
+package they are in.  parse_column() does that with the first rows of a
+column and then decodes every row with the parser for that format, a column
+of characters at a time, so there is no test of the format for each row::
+
+  In [1]: column = parse_column(["16/237 08:45:01", "16/237 08:45:02", "?"])
+  In [2]: column.format
+  Out[2]: 'WVSR'
+  In [3]: column.times
+  Out[3]: array([1.4720283e+09, 1.4720283e+09,           nan])
+  In [4]: column.unmatched
+  Out[4]: array([False, False,  True])
+
+The formats are::
+
+  ISO      - any form accepted by ISOtime_array()
+  VSR      - YYYY DDD sssss, seconds of the day padded with blanks
+  script   - DDD/HH:MM:SS, as VSR_script_time_to_timestamp()
+  WVSR     - YY/DDD HH:MM:SS, as WVSR_script_time_to_timestamp()
+  macro    - DDD_HH:MM:SS, as macro_log_time_to_UnixTime()
+  logtime  - HH:MM:SS, as iter_logtimes()
+
+Rows which are not in the format of the column, or are not a valid time,
+are marked in the 'unmatched' mask instead of raising an exception.
+"""
+from collections import namedtuple
+
+import numpy
+
+from . import _ISO_records_to_us, _NaT, _byte_records, _leap_year_array, \
+              _read_digits, _record_lengths, _unix_day_array
+
+# the fixed-width formats: a template, in which '9' is a digit and '#' a
+# digit or a leading blank, and the columns of the fields
+_LAYOUTS = {
+  "VSR":     ("9999 999 ####9",
+              {"year": (0, 4), "doy": (5, 8), "seconds": (9, 14)}),
+  "script":  ("999/99:99:99",
+              {"doy": (0, 3), "hour": (4, 6), "minute": (7, 9),
+               "second": (10, 12)}),
+  "WVSR":    ("99/999 99:99:99",
+              {"year": (0, 2), "doy": (3, 6), "hour": (7, 9),
+               "minute": (10, 12), "second": (13, 15)}),
+  "macro":   ("999_99:99:99",
+              {"doy": (0, 3), "hour": (4, 6), "minute": (7, 9),
+               "second": (10, 12)}),
+  "logtime": ("99:99:99",
+              {"hour": (0, 2), "minute": (3, 5), "second": (6, 8)})}
+
+# in the order in which ties are settled
+formats = ("ISO", "VSR", "WVSR", "script", "macro", "logtime")
+
+ParsedColumn = namedtuple("ParsedColumn", "times unmatched format")
+ParsedColumn.__doc__ = """
+A column of time strings, parsed
+
+  times     - UNIX times, float, NaN where a row is unmatched
+  unmatched - True where a row could not be parsed
+  format    - the name of the format, or None if none was recognized
+"""
+
+def _columns(records, width):
+  """
+  Character codes less 48, one row per column, and the length of each record
+
+  There are at least 'width' columns so that every column of a layout can be
+  addressed.
+  """
+  columns = numpy.zeros((max(records.shape[1], width), len(records)),
+                        dtype=numpy.uint8)
+  columns[:records.shape[1]] = records.T
+  lengths = _record_lengths(columns)
+  return columns - numpy.uint8(48), lengths
+
+def _match_template(digits, lengths, template):
+  """
+  True where a record has the length and characters of the template
+  """
+  blank = numpy.uint8((ord(" ") - 48) % 256)
+  match = lengths == len(template)
+  for column, character in enumerate(template):
+    if character == "9":
+      match &= digits[column] <= 9
+    elif character == "#":
+      match &= (digits[column] <= 9) | (digits[column] == blank)
+    else:
+      match &= digits[column] == numpy.uint8((ord(character) - 48) % 256)
+  return match
+
+def _read_padded(digits, start, stop):
+  """
+  Integer value of digits which may have leading blanks
+
+  @return: (int64 values, True where no blank follows a digit)
+  """
+  blank = numpy.uint8((ord(" ") - 48) % 256)
+  value = numpy.zeros(digits.shape[1], dtype=numpy.int64)
+  started = numpy.zeros(digits.shape[1], dtype=bool)
+  valid = numpy.ones(digits.shape[1], dtype=bool)
+  for column in digits[start:stop]:
+    is_blank = column == blank
+    valid &= ~(started & is_blank)
+    started |= ~is_blank
+    value *= 10
+    value += numpy.where(is_blank, 0, column)
+  return value, valid
+
+def _matches(records):
+  """
+  For each format, True where a record is in it
+  """
+  width = max(len(template) for template, fields in _LAYOUTS.values())
+  digits, lengths = _columns(records, width)
+  found = {"ISO": _ISO_records_to_us(records) != _NaT}
+  for name, (template, fields) in _LAYOUTS.items():
+    found[name] = _match_template(digits, lengths, template)
+  return found
+
+def detect_format(sample):
+  """
+  The format most of the strings in a sample are in
+
+  @param sample : a few time strings
+  @type  sample : list, numpy.ndarray or buffer, as for ISOtime_array()
+
+  @return: a name in 'formats', or None if no string is in any of them
+  """
+  if not len(sample):
+    return None
+  records, shape = _byte_records(sample)
+  return _detect(records)
+
+def _detect(records):
+  """
+  detect_format() for uint8 records
+  """
+  if not records.size:
+    return None
+  found = _matches(records)
+  counts = [int(found[name].sum()) for name in formats]
+  best = max(counts)
+  if not best:
+    return None
+  return formats[counts.index(best)]
+
+def _layout_times(records, layout, year, doy):
+  """
+  UNIX seconds from fixed-width records, and True where they are valid
+  """
+  template, fields = _LAYOUTS[layout]
+  digits, lengths = _columns(records, len(template))
+  valid = _match_template(digits, lengths, template)
+  values = {}
+  for name, (start, stop) in fields.items():
+    if name == "seconds":
+      values[name], ok = _read_padded(digits, start, stop)
+    else:
+      values[name], ok = _read_digits(digits, start, stop)
+    valid &= ok
+  if "year" in values:
+    year = values["year"]
+    if fields["year"] == (0, 2):
+      year += 2000
+  if "doy" in values:
+    doy = values["doy"]
+  else:
+    doy = numpy.full(len(records), doy, dtype=numpy.int64)
+  year = numpy.broadcast_to(year, doy.shape)
+  valid &= (year >= 1) & (doy >= 1) & (doy <= 365 + _leap_year_array(year))
+  if "seconds" in values:
+    seconds = values["seconds"]
+    valid &= seconds < 86400
+  else:
+    valid &= ((values["hour"] < 24) & (values["minute"] < 60)
+              & (values["second"] < 60))
+    seconds = (values["hour"]*60 + values["minute"])*60 + values["second"]
+  if layout == "logtime":
+    # the logs carry no date; a day passes whenever the time goes back
+    matched = numpy.flatnonzero(valid)
+    days = numpy.zeros(len(matched), dtype=numpy.int64)
+    numpy.cumsum(seconds[matched[1:]] < seconds[matched[:-1]], out=days[1:])
+    doy = doy.copy()
+    doy[matched] += days
+  return _unix_day_array(year, doy)*86400 + seconds, valid
+
+def parse_column(values, format=None, year=None, doy=None, sample_size=100):
+  """
+  UNIX times from a column of time strings in one format
+
+  The format is found by detect_format() from the first 'sample_size' rows
+  if it is not given.  Formats without a year (script, macro, logtime) need
+  'year', and logtime also needs 'doy', the day of the first row; as in
+  iter_logtimes() the day advances whenever the time of day goes back.
+
+  @param values : time strings
+  @type  values : list, numpy.ndarray or buffer, as for ISOtime_array()
+
+  @param format : a name in 'formats'
+  @type  format : str
+
+  @param year : year of the times, if the strings do not have it
+  @type  year : int
+
+  @param doy : day of year of the first time, for logtime
+  @type  doy : int
+
+  @param sample_size : number of rows looked at to find the format
+  @type  sample_size : int
+
+  @return: ParsedColumn, with arrays the shape of the input
+  """
+  records, shape = _byte_records(values)
+  if format is None:
+    format = _detect(records[:sample_size])
+  elif format not in formats:
+    raise ValueError("format must be one of %s" % ", ".join(formats))
+  if format is None:
+    return ParsedColumn(numpy.full(shape, numpy.nan),
+                        numpy.ones(shape, dtype=bool), None)
+  if format == "ISO":
+    microseconds = _ISO_records_to_us(records)
+    valid = microseconds != _NaT
+    times = microseconds/1e6
+  else:
+    if format in ("script", "macro", "logtime") and year is None:
+      raise ValueError("%s times need the year" % format)
+    if format == "logtime" and doy is None:
+      raise ValueError("logtime times need the day of year")
+    times, valid = _layout_times(records, format, year, doy)
+    times = times.astype(float)
+  times[~valid] = numpy.nan
+  return ParsedColumn(times.reshape(shape), ~valid.reshape(shape), format)
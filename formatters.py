@@ -0,0 +1,351 @@
+# -*- coding: utf-8 -*-
+"""
+Formatting arrays of times as fixed-width strings
+
+A pattern is compiled once into a TimeFormat, which then writes the digits
+for a whole array of times at a time with integer arithmetic on NumPy
+columns; there is no Python object or string per time::
+
+  In [1]: VSR = compile_format("%Y %j %5S")
+  In [2]: VSR.format(numpy.array([1270956345, 1592570096]))
+  Out[2]: array([b'2010 101 12345', b'2020 171 45296'], dtype='|S14')
+
+The result is an array of bytes strings of the pattern's width, so a pattern
+ending in a newline gives records which can be written to a file with
+.tofile() or .tobytes().
+
+Directives::
+
+  %Y    year, four digits
+  %m    month, two digits
+  %d    day of month, two digits
+  %j    day of year, three digits
+  %H    hour, two digits
+  %M    minute, two digits
+  %S    second of the minute, two digits
+  %nS   second of the day, 'n' wide, padded with spaces (%0nS with zeros)
+  %nf   first 'n' digits of the fraction of a second (%f is %6f)
+  %%    a per cent sign
+
+Some patterns of the scalar functions are available by name::
+
+  VSR_timestring     %Y %j %5S            as in VSR file names
+  VSR_script_time    %j/%H:%M:%S          VSR_script_time()
+  date_string        %Y-%m-%d             make_date_string()
+  datecode           %Y-%j                YYYYDDD_datecode(year, "-", doy)
+  ISO_doy            %Y-%jT%H:%M          format_ISO_time()
+  ISOtime            %Y%m%dT%H%M%S        VSR_timestring_to_ISOtime()
+  with_ms            %Y-%m-%d %H:%M:%S.%3f
+
+All of these are in UT.  Years must be from 1 to 9999.  Times given as
+floats are rounded to the microsecond, as datetime.fromtimestamp() rounds
+them.  Missing times, NaN or NaT, are written as 'NaT' padded with spaces,
+or as spaces if the pattern is too narrow; a newline ending the pattern is
+kept.
+"""
+from functools import lru_cache
+import re
+
+import numpy
+
+from . import _NaT, _civil_from_days
+
+named_formats = {"VSR_timestring":  "%Y %j %5S",
+                 "VSR_script_time": "%j/%H:%M:%S",
+                 "date_string":     "%Y-%m-%d",
+                 "datecode":        "%Y-%j",
+                 "ISO_doy":         "%Y-%jT%H:%M",
+                 "ISOtime":         "%Y%m%dT%H%M%S",
+                 "with_ms":         "%Y-%m-%d %H:%M:%S.%3f"}
+
+# most digits each quantity can have
+_digits = {"year": 4, "month": 2, "day": 2, "doy": 3, "hour": 2, "minute": 2,
+           "second": 2, "seconds": 5, "fraction": 9}
+
+# width of each directive and the quantity it shows
+_directives = {"Y": (4, "year"),
+               "m": (2, "month"),
+               "d": (2, "day"),
+               "j": (3, "doy"),
+               "H": (2, "hour"),
+               "M": (2, "minute"),
+               "S": (2, "second")}
+
+_directive = re.compile(r"%(0?)(\d*)(.)")
+
+# factors to nanoseconds for epochs in these units
+_units = {"s": 1000000000, "ms": 1000000, "us": 1000, "ns": 1}
+
+class TimeFormat(object):
+  """
+  A compiled time format
+
+  Public attributes::
+
+    pattern - the pattern which was compiled
+    width   - number of bytes in each formatted time
+  """
+  def __init__(self, pattern):
+    """
+    @param pattern : directives and literal text, or a name in named_formats
+    @type  pattern : str
+    """
+    self.pattern = named_formats.get(pattern, pattern)
+    # (column, width, quantity, space padded) for each directive
+    self._fields = []
+    # (column, byte) for each literal character
+    self._literals = []
+    column = 0
+    position = 0
+    for match in _directive.finditer(self.pattern):
+      for byte in self.pattern[position:match.start()].encode():
+        self._literals.append((column, byte))
+        column += 1
+      position = match.end()
+      zero, width, code = match.groups()
+      if code == "%" and not (zero or width):
+        self._literals.append((column, ord("%")))
+        column += 1
+        continue
+      if code == "S" and width:
+        width, quantity, spaces = int(width), "seconds", not zero
+      elif code == "f":
+        width, quantity, spaces = int(width or 6), "fraction", False
+      elif code in _directives and not (zero or width):
+        width, quantity = _directives[code]
+        spaces = False
+      else:
+        raise ValueError("unsupported directive %r in %r"
+                         % (match.group(), self.pattern))
+      if quantity == "fraction" and not 0 < width <= 9:
+        raise ValueError("%r: fractions have 1 to 9 digits" % match.group())
+      self._fields.append((column, width, quantity, spaces))
+      column += width
+    for byte in self.pattern[position:].encode():
+      self._literals.append((column, byte))
+      column += 1
+    self.width = column
+    # the record for a missing time
+    fill = (b"NaT" if self.width >= 3 else b"").ljust(self.width)
+    if self.pattern.endswith("\n") and self.width > 3:
+      fill = fill[:-1] + b"\n"
+    self._missing = numpy.frombuffer(fill, dtype=numpy.uint8)
+    self._quantities = set(field[2] for field in self._fields)
+    # runs of literal characters as integers of 1, 2 or 4 bytes, so that a
+    # run is stored in all the records at once
+    self._constants = []
+    literals = dict(self._literals)
+    column = 0
+    while column < self.width:
+      size = 4
+      while size and not all(c in literals
+                             for c in range(column, column + size)):
+        size //= 2
+      if size:
+        characters = bytes(literals[c] for c in range(column, column + size))
+        self._constants.append((column,
+                     numpy.frombuffer(characters, dtype="u%d" % size)[0]))
+        column += size
+      else:
+        column += 1
+
+  def __repr__(self):
+    return "TimeFormat(%r)" % self.pattern
+
+  def format(self, times, unit="s"):
+    """
+    Formats an array of times
+
+    @param times : times since 1970-01-01 00:00:00 UT; a datetime64 array,
+                   a TimeArray or numbers in 'unit'
+    @type  times : array-like
+
+    @param unit : "s", "ms", "us" or "ns" for numbers
+    @type  unit : str
+
+    @return: numpy.ndarray of bytes, dtype "S<width>", the shape of 'times'
+    """
+    seconds, nanoseconds, missing = _split_epochs(times, unit)
+    shape = seconds.shape
+    seconds = seconds.ravel()
+    nanoseconds = nanoseconds.ravel()
+    if missing is not None:
+      missing = missing.ravel()
+      # any value will do; the records are overwritten
+      seconds = numpy.where(missing, 0, seconds)
+      nanoseconds = numpy.where(missing, 0, nanoseconds)
+    values = self._values(seconds, nanoseconds)
+    text = numpy.empty((len(seconds), self.width), dtype=numpy.uint8)
+    for column, constant in self._constants:
+      _column(text, column, constant.dtype)[...] = constant
+    for column, width, quantity, spaces in self._fields:
+      value = values[quantity]
+      if quantity == "fraction":
+        value = value//10**(9 - width)
+        cut = False
+      else:
+        cut = width < _digits[quantity]
+      _write_digits(text, column, width, value, spaces, cut)
+    if missing is not None:
+      text[missing] = self._missing
+    return text.view("S%d" % self.width).reshape(shape)
+
+  def _values(self, seconds, nanoseconds):
+    """
+    Quantities needed by the fields, as int32 or int64 arrays
+    """
+    values = {}
+    quantities = self._quantities
+    days = seconds//86400
+    of_day = (seconds - days*86400).astype(numpy.int32)
+    if quantities & {"year", "month", "day", "doy"}:
+      (values["year"], values["month"], values["day"],
+       values["doy"]) = _civil_from_days(days)
+    if quantities & {"hour", "minute", "second"}:
+      minutes = of_day//60
+      values["hour"] = minutes//60
+      values["minute"] = minutes - values["hour"]*60
+      values["second"] = of_day - minutes*60
+    values["seconds"] = of_day
+    if "fraction" in quantities:
+      values["fraction"] = nanoseconds.astype(numpy.int32)
+    return values
+
+# digits of all the numbers of 1, 2 or 4 digits, each packed in an integer
+_digit_tables = {}
+
+def _digit_table(width):
+  """
+  Digits of 0 to 10**width - 1 as integers of 'width' bytes
+
+  The table is three times 10**width long: zero padded, then padded with
+  spaces, then padded with spaces and blank for zero.
+  """
+  try:
+    return _digit_tables[width]
+  except KeyError:
+    strings = (["%0*d" % (width, number) for number in range(10**width)]
+               + ["%*d" % (width, number) for number in range(10**width)]
+               + [" "*width] + ["%*d" % (width, number)
+                                for number in range(1, 10**width)])
+    table = numpy.array(strings, dtype="S%d" % width).view("u%d" % width)
+    _digit_tables[width] = table
+    return table
+
+def _column(text, column, dtype):
+  """
+  View of the bytes from 'column' on in each record as one integer each
+  """
+  return numpy.ndarray((len(text),), dtype=dtype, buffer=text, offset=column,
+                       strides=(text.shape[1],))
+
+def _write_digits(text, column, width, value, spaces=False, cut=True):
+  """
+  Writes the decimal digits of 'value' into columns of the records 'text'
+
+  The digits are taken in groups of up to four, from the right.  Each group
+  is looked up in a table of digit strings packed into integers and stored
+  in all the records with a single strided write.  Digits beyond 'width' are
+  cut off, unless 'cut' is False to say that there are none; leading zeros
+  are replaced by spaces if 'spaces' is True.
+
+  @param text : records, one per row
+  @type  text : C contiguous uint8 numpy.ndarray
+
+  @param column : first column to write
+
+  @param width : number of digits
+
+  @param value : non-negative integers, one per record
+  @type  value : numpy.ndarray
+  """
+  stop = column + width
+  while stop > column:
+    size = min(4, stop - column)
+    if size == 3:
+      size = 2
+    power = 10**size
+    if stop - size == column and not (cut or spaces):
+      group = higher = value
+    else:
+      higher = value//power
+      group = value - higher*power
+    if spaces:
+      # space padding where nothing is left to the left of the group
+      padding = power if stop == column + width else 2*power
+      group = group + (higher == 0)*padding
+    _column(text, stop - size, "u%d" % size)[...] = _digit_table(size).take(
+                                                                        group)
+    value = higher
+    stop -= size
+
+def _split_epochs(times, unit):
+  """
+  Whole seconds and nanoseconds from times in any of the accepted forms
+
+  @return: (int64 seconds, int64 nanoseconds, True where a time is NaN or
+            NaT, or None if none is)
+  """
+  missing = None
+  if hasattr(times, "ns") and hasattr(times, "datetime64"):
+    # a TimeArray
+    times, unit = times.ns, "ns"
+    missing = times == _NaT
+  times = numpy.asarray(times)
+  if times.dtype.kind == "M":
+    missing = numpy.isnat(times)
+    unit = numpy.datetime_data(times.dtype)[0]
+    if unit not in _units:
+      times = times.astype("datetime64[s]")
+      unit = "s"
+    times = times.view(numpy.int64)
+  try:
+    per_second = 1000000000//_units[unit]
+  except KeyError:
+    raise ValueError("unit must be one of %s" % ", ".join(_units))
+  if times.dtype.kind == "f":
+    missing = ~numpy.isfinite(times)
+    if missing.any():
+      times = numpy.where(missing, 0., times)
+    seconds = numpy.floor(times/per_second)
+    # the fraction rounded to microseconds, half to even as datetime does
+    microseconds = numpy.rint((times - seconds*per_second)
+                              *(1e6/per_second)).astype(numpy.int64)
+    # rounding may give a whole second
+    carry = microseconds >= 1000000
+    seconds = seconds.astype(numpy.int64) + carry
+    microseconds -= carry*1000000
+    return seconds, microseconds*1000, _any(missing)
+  times = times.astype(numpy.int64, copy=False)
+  if per_second == 1:
+    return times, numpy.zeros_like(times), _any(missing)
+  seconds, remainder = numpy.divmod(times, per_second)
+  return seconds, remainder*_units[unit], _any(missing)
+
+def _any(missing):
+  """
+  The mask of missing times, or None if there are none
+  """
+  if missing is None or not missing.any():
+    return None
+  return missing
+
+@lru_cache(maxsize=64)
+def compile_format(pattern):
+  """
+  TimeFormat for a pattern, compiled on first use and then reused
+
+  @param pattern : directives and literal text, or a name in named_formats
+  @type  pattern : str
+
+  @return: TimeFormat
+  """
+  return TimeFormat(pattern)
+
+def format_times(times, pattern, unit="s"):
+  """
+  Formats an array of times with a pattern
+
+  This is compile_format(pattern).format(times, unit).
+  """
+  return compile_format(pattern).format(times, unit)
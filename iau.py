@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+IAU position based names for whole catalogs, and finding rows by name
+
+IAU_names() makes the names that deg_to_IAU_str() makes, for arrays of
+positions, as a fixed-width bytes array written a column of digits at a time
+as in the formatters submodule::
+
+  In [1]: IAU_names([12.5, 0.75], [-30.25, -0.5], prefix="J")
+  Out[1]: array([b'J1230-3015', b'J0045-0030'], dtype='|S10')
+
+IAUNameIndex maps the names back to catalog rows with a dict, so a list of
+names from another catalog is matched in time proportional to its length.
+Truncated names are not unique; the index keeps all the rows of a name.
+"""
+import numpy
+
+from .formatters import _write_digits
+
+# widths of the longitude and latitude parts of each format
+_widths = {"h": (4, 5), "d": (5, 5), "g": (5, 5)}
+
+def _truncated(angle):
+  """
+  Whole units and whole sixtieths, truncated as in deg_to_IAU_str()
+  """
+  whole = numpy.trunc(angle)
+  return whole.astype(numpy.int64), numpy.trunc(60*(angle - whole)).astype(
+                                                                   numpy.int64)
+
+def _tenths(value):
+  """
+  abs(value) in tenths, rounded as "%.1f" % value rounds
+
+  The product with 10 is rounded by NumPy; where it is too close to a half
+  for that to be certain the string formatting is used.
+  """
+  magnitude = numpy.abs(value)
+  scaled = magnitude*10
+  tenths = numpy.rint(scaled).astype(numpy.int64)
+  near = numpy.flatnonzero(numpy.abs(scaled - numpy.floor(scaled) - 0.5)
+                           < 1e-6)
+  for row in near:
+    tenths[row] = int(("%.1f" % magnitude[row]).replace(".", ""))
+  return tenths
+
+def IAU_names(longitude, latitude, format="h", prefix=""):
+  """
+  IAU names for arrays of positions
+
+  The names are those deg_to_IAU_str() gives for each position: hhmm+ddmm
+  for format 'h', dddmm+ddmm for 'd' or ddd.d+dd.d for 'g', after 'prefix',
+  such as "J" or "G".
+
+  @param longitude : right ascensions in hours or longitudes in degrees
+  @type  longitude : array-like of float, non-negative
+
+  @param latitude : declinations or latitudes in degrees
+  @type  latitude : array-like of float
+
+  @param format : 'h', 'd' or 'g'
+  @type  format : str
+
+  @param prefix : characters put in front of each name
+  @type  prefix : str
+
+  @return: numpy.ndarray of bytes, the shape of the positions
+  """
+  format = format.lower()
+  if format not in ("d", "g"):
+    format = "h"
+  longitude, latitude = numpy.broadcast_arrays(
+                                   numpy.asarray(longitude, dtype=float),
+                                   numpy.asarray(latitude, dtype=float))
+  shape = longitude.shape
+  longitude = longitude.ravel()
+  latitude = latitude.ravel()
+  prefix = prefix.encode()
+  first = len(prefix)
+  long_width, lat_width = _widths[format]
+  width = first + long_width + lat_width
+  text = numpy.empty((len(longitude), width), dtype=numpy.uint8)
+  text[:, :first] = numpy.frombuffer(prefix, dtype=numpy.uint8)
+  if (longitude < 0).any():
+    raise ValueError("longitudes must not be negative")
+  if format == "g":
+    negative = numpy.signbit(latitude)
+    longitude = _tenths(longitude)
+    latitude = _tenths(latitude)
+    if (longitude >= 10000).any() or (latitude >= 1000).any():
+      raise ValueError("positions out of range for format 'g'")
+    _write_digits(text, first, 3, longitude//10)
+    text[:, first + 3] = ord(".")
+    _write_digits(text, first + 4, 1, longitude % 10)
+    column = first + long_width
+    text[:, column] = numpy.where(negative, ord("-"), ord("+"))
+    _write_digits(text, column + 1, 2, latitude//10)
+    text[:, column + 3] = ord(".")
+    _write_digits(text, column + 4, 1, latitude % 10)
+  else:
+    negative = latitude < 0
+    hours, minutes = _truncated(longitude)
+    degrees, arcminutes = _truncated(numpy.abs(latitude))
+    if (hours >= 10**(long_width - 2)).any() or (degrees >= 100).any():
+      raise ValueError("positions out of range for format %r" % format)
+    _write_digits(text, first, long_width - 2, hours)
+    _write_digits(text, first + long_width - 2, 2, minutes)
+    column = first + long_width
+    text[:, column] = numpy.where(negative, ord("-"), ord("+"))
+    _write_digits(text, column + 1, 2, degrees)
+    _write_digits(text, column + 3, 2, arcminutes)
+  return text.view("S%d" % width).reshape(shape)
+
+class IAUNameIndex(object):
+  """
+  Catalog rows by IAU name
+
+  Public attributes::
+
+    names - the names, as bytes, in catalog order
+  """
+  def __init__(self, names):
+    """
+    @param names : a name for each row, such as IAU_names() returns
+    @type  names : array-like of bytes or str
+    """
+    names = numpy.asarray(names)
+    if names.dtype.kind == "U":
+      names = numpy.char.encode(names, "ascii")
+    self.names = names.ravel()
+    keys = self.names.tolist()
+    # the first row of each name; assigning in reverse leaves the first
+    self._first = dict(zip(reversed(keys), range(len(keys) - 1, -1, -1)))
+    # all the rows of names which are not unique
+    self._shared = {}
+    if len(self._first) < len(keys):
+      first = numpy.fromiter(map(self._first.__getitem__, keys),
+                             dtype=numpy.int64, count=len(keys))
+      for row in numpy.flatnonzero(first != numpy.arange(len(keys))).tolist():
+        self._shared.setdefault(keys[row], [self._first[keys[row]]]).append(row)
+
+  @classmethod
+  def from_positions(cls, longitude, latitude, format="h", prefix=""):
+    """
+    Index of the names IAU_names() gives for a catalog's positions
+    """
+    return cls(IAU_names(longitude, latitude, format, prefix))
+
+  def __len__(self):
+    return len(self.names)
+
+  def __repr__(self):
+    return "IAUNameIndex(%d rows, %d names)" % (len(self), len(self._first))
+
+  def __contains__(self, name):
+    return _key(name) in self._first
+
+  def __getitem__(self, name):
+    """
+    The first row with the name; KeyError if there is none
+    """
+    return self._first[_key(name)]
+
+  def rows(self, name):
+    """
+    All the rows with the name, in catalog order
+
+    @return: list of int, empty if there are none
+    """
+    key = _key(name)
+    try:
+      return list(self._shared[key])
+    except KeyError:
+      row = self._first.get(key)
+      return [] if row is None else [row]
+
+  def lookup(self, names):
+    """
+    The first row with each name
+
+    @param names : names to find
+    @type  names : array-like of bytes or str
+
+    @return: int64 numpy.ndarray, -1 where a name is not in the catalog
+    """
+    names = numpy.asarray(names)
+    if names.dtype.kind == "U":
+      names = numpy.char.encode(names, "ascii")
+    get = self._first.get
+    return numpy.fromiter((get(name, -1) for name in names.ravel().tolist()),
+                          dtype=numpy.int64,
+                          count=names.size).reshape(names.shape)
+
+def _key(name):
+  """
+  The name as bytes
+  """
+  if isinstance(name, str):
+    return name.encode("ascii")
+  return bytes(name)
@@ -0,0 +1,172 @@
+# -*- coding: utf-8 -*-
+"""
+Counting the calls to DatesTimes functions and timing them
+
+Instrumentation replaces functions in the DatesTimes namespace with
+wrappers which count the calls and add the time each takes to a total and
+to a histogram of powers of two of nanoseconds.  The functions in the
+package call one another through that namespace, so calls through aliases
+such as VSR_timestamp() and calls from other functions of the package are
+counted too.  disable() puts the original functions back, so when
+instrumentation is off nothing is added to any call::
+
+  In [1]: from DatesTimes import instrument
+  In [2]: instrument.enable(["VSR_to_datetime", "calendar_date"])
+  In [3]: ... run the reduction ...
+  In [4]: instrument.dump("stats.json")
+  In [5]: instrument.disable()
+
+Setting DATESTIMES_INSTRUMENT before DatesTimes is imported enables it for
+the whole run: '1' or 'all' for every public function, or a comma separated
+list of names.  If DATESTIMES_INSTRUMENT_FILE names a file the statistics
+are written to it at exit.
+
+Names imported with 'from DatesTimes import ...' before enable() keep the
+uninstrumented functions.  The counters are updated without a lock, so
+counts from several threads may be a little low.
+"""
+import atexit
+import inspect
+import json
+import os
+import sys
+import time as T
+from functools import wraps
+
+# bins of the histograms: bin n holds times from 2**(n-1) to 2**n - 1 ns
+bins = 64
+
+# name: [calls, total nanoseconds, histogram]
+statistics = {}
+
+# name: the function which was replaced
+_originals = {}
+
+def _package():
+  return sys.modules[__name__.rsplit(".", 1)[0]]
+
+def instrumentable():
+  """
+  Names of the public functions of DatesTimes which can be instrumented
+  """
+  package = _package()
+  return sorted(name for name, value in vars(package).items()
+                if inspect.isfunction(value) and not name.startswith("_")
+                and value.__module__ == package.__name__)
+
+def _wrapper(name, function):
+  """
+  The function wrapped to record its calls in statistics[name]
+  """
+  record = statistics.setdefault(name, [0, 0, [0]*bins])
+  histogram = record[2]
+  clock = T.perf_counter_ns
+
+  @wraps(function)
+  def instrumented(*args, **kwargs):
+    start = clock()
+    try:
+      return function(*args, **kwargs)
+    finally:
+      elapsed = clock() - start
+      record[0] += 1
+      record[1] += elapsed
+      histogram[min(elapsed.bit_length(), bins - 1)] += 1
+  return instrumented
+
+def enable(names=None):
+  """
+  Instruments functions of DatesTimes
+
+  @param names : the functions; all in instrumentable() if None
+  @type  names : list of str
+  """
+  package = _package()
+  if names is None:
+    names = instrumentable()
+  for name in names:
+    if name in _originals:
+      continue
+    function = getattr(package, name)
+    if not callable(function):
+      raise ValueError("%s is not a function" % name)
+    _originals[name] = function
+    setattr(package, name, _wrapper(name, function))
+
+def disable(names=None):
+  """
+  Restores the original functions; the statistics are kept
+
+  @param names : the functions; all which are instrumented if None
+  @type  names : list of str
+  """
+  package = _package()
+  for name in list(_originals if names is None else names):
+    function = _originals.pop(name, None)
+    if function is not None:
+      setattr(package, name, function)
+
+def enabled():
+  """
+  Names of the functions which are instrumented
+  """
+  return sorted(_originals)
+
+def reset():
+  """
+  Sets all the counts to zero
+  """
+  for record in statistics.values():
+    record[0] = record[1] = 0
+    record[2][:] = [0]*bins
+
+def report():
+  """
+  The statistics of each function which has been called
+
+  @return: dict of name: dict with 'calls', 'total_s', 'mean_s' and
+           'histogram', which maps the upper bound of each non-empty bin,
+           in ns, to a count
+  """
+  result = {}
+  for name, (calls, total, histogram) in sorted(statistics.items()):
+    if not calls:
+      continue
+    result[name] = {"calls": calls,
+                    "total_s": total/1e9,
+                    "mean_s": total/calls/1e9,
+                    "histogram": dict((str(2**n - 1), count)
+                                      for n, count in enumerate(histogram)
+                                      if count)}
+  return result
+
+def dump(destination=None):
+  """
+  Writes report() as JSON
+
+  @param destination : a file name, an open text file or, if None,
+                       standard output
+  """
+  if destination is None:
+    destination = sys.stdout
+  if hasattr(destination, "write"):
+    json.dump(report(), destination, indent=1)
+    destination.write("\n")
+  else:
+    with open(destination, "w") as f:
+      dump(f)
+
+def enable_from_environment():
+  """
+  Enables instrumentation as DATESTIMES_INSTRUMENT says
+  """
+  setting = os.environ.get("DATESTIMES_INSTRUMENT", "").strip()
+  if not setting or setting == "0":
+    return
+  if setting.lower() in ("1", "all"):
+    enable()
+  else:
+    enable([name.strip() for name in setting.split(",") if name.strip()])
+  output = os.environ.get("DATESTIMES_INSTRUMENT_FILE")
+  if output:
+    atexit.register(dump, output)
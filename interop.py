@@ -0,0 +1,169 @@
+# -*- coding: utf-8 -*-
+"""
+Passing times to and from pandas and Apache Arrow without copying
+
+A TimeArray holds int64 nanoseconds since the UNIX epoch, which is what a
+pandas DatetimeIndex and an Arrow timestamp("ns") array hold too, so the
+same buffer can be shared::
+
+  In [1]: t = TimeArray.from_vsr(year, doy, seconds)
+  In [2]: index = to_pandas(t)        # shares t.ns
+  In [3]: array = to_arrow(t)         # shares t.ns
+  In [4]: t2 = from_arrow(array)      # t2.ns is a view of the Arrow buffer
+
+Times in the other forms the package knows (UNIX seconds, MJD, matplotlib
+dates or VSR tuples) are converted to nanoseconds once, with 'kind', and the
+result is shared from then on.  NaT becomes null in Arrow and null becomes
+NaT coming back; these need a validity bitmap or a copy respectively.
+Times in other units than ns are converted, which copies them.
+
+pandas and pyarrow are optional.  Each is imported when a function which
+needs it is first called.
+"""
+from importlib import import_module
+
+import numpy
+
+from . import _NaT
+from .timearray import TimeArray
+
+# how the forms of times accepted by 'kind' are made into TimeArrays
+_constructors = {"unix":       TimeArray.from_unix,
+                 "mjd":        TimeArray.from_mjd,
+                 "mpl":        TimeArray.from_mpl,
+                 "datetime64": TimeArray.from_datetime64,
+                 "ns":         TimeArray}
+
+# nanoseconds in each unit of Arrow and pandas times
+_ns_per_unit = {"s": 1000000000, "ms": 1000000, "us": 1000, "ns": 1}
+
+def _optional(name):
+  """
+  An optional module, imported on first use
+  """
+  try:
+    return import_module(name)
+  except ImportError:
+    raise ImportError("%s is needed for this; it is not installed" % name)
+
+def as_time_array(times, kind="unix"):
+  """
+  A TimeArray from times in any form the package knows
+
+  @param times : a TimeArray, or times of the given kind; VSR times are a
+                 (year, doy, seconds) tuple of arrays or an N x 3 array
+  @type  times : TimeArray or array-like
+
+  @param kind : "unix", "mjd", "mpl", "vsr", "datetime64" or "ns"
+  @type  kind : str
+
+  @return: TimeArray
+  """
+  if isinstance(times, TimeArray):
+    return times
+  if kind == "vsr":
+    if isinstance(times, tuple):
+      return TimeArray.from_vsr(*times)
+    return TimeArray.from_vsr(times)
+  try:
+    constructor = _constructors[kind]
+  except KeyError:
+    raise ValueError("kind must be one of %s"
+                     % ", ".join(sorted(_constructors) + ["vsr"]))
+  times = numpy.asarray(times)
+  if times.dtype.kind == "M":
+    return TimeArray.from_datetime64(times)
+  return constructor(times)
+
+def _from_int64(values, unit):
+  """
+  TimeArray from int64 times in a unit; shared if the unit is ns
+  """
+  if unit == "ns":
+    return TimeArray(values)
+  nat = values == _NaT
+  ns = values*_ns_per_unit[unit]
+  ns[nat] = _NaT
+  return TimeArray(ns)
+
+def to_pandas(times, kind="unix", tz=None):
+  """
+  pandas.DatetimeIndex sharing the nanoseconds of the times
+
+  @param times : as for as_time_array()
+  @param kind : as for as_time_array()
+
+  @param tz : time zone of the index, such as "UTC"; naive if None
+  @type  tz : str or tzinfo
+
+  @return: pandas.DatetimeIndex
+  """
+  pandas = _optional("pandas")
+  times = as_time_array(times, kind)
+  index = pandas.DatetimeIndex(times.datetime64.ravel(), copy=False)
+  if tz is not None:
+    index = index.tz_localize("UTC").tz_convert(tz)
+  return index
+
+def from_pandas(index):
+  """
+  TimeArray from a pandas DatetimeIndex, Series or DatetimeArray
+
+  The nanoseconds are shared with pandas if the unit is ns.  Times with a
+  zone are taken as UTC.
+  """
+  pandas = _optional("pandas")
+  if isinstance(index, pandas.Series):
+    index = pandas.DatetimeIndex(index.array, copy=False)
+  values = index.asi8
+  unit = getattr(index, "unit", "ns")
+  return _from_int64(values, unit)
+
+def to_arrow(times, kind="unix", tz=None):
+  """
+  pyarrow TimestampArray sharing the nanoseconds of the times
+
+  NaT becomes null, for which a validity bitmap is made.  The array keeps a
+  reference to the nanoseconds, which must not be changed while it is used.
+
+  @param times : as for as_time_array()
+  @param kind : as for as_time_array()
+
+  @param tz : time zone of the array, such as "UTC"
+  @type  tz : str
+
+  @return: pyarrow.TimestampArray
+  """
+  pyarrow = _optional("pyarrow")
+  ns = as_time_array(times, kind).ns.ravel()
+  ns = numpy.ascontiguousarray(ns)
+  nat = ns == _NaT
+  if nat.any():
+    validity = pyarrow.py_buffer(numpy.packbits(~nat, bitorder="little"))
+    null_count = int(nat.sum())
+  else:
+    validity = None
+    null_count = 0
+  return pyarrow.Array.from_buffers(pyarrow.timestamp("ns", tz=tz), len(ns),
+                                    [validity, pyarrow.py_buffer(ns)],
+                                    null_count=null_count)
+
+def from_arrow(array):
+  """
+  TimeArray from a pyarrow timestamp Array or ChunkedArray
+
+  The values are shared with Arrow if the unit is ns and there are no
+  nulls; nulls become NaT.  Chunked arrays are combined first, which copies
+  them if there is more than one chunk.
+  """
+  pyarrow = _optional("pyarrow")
+  if isinstance(array, pyarrow.ChunkedArray):
+    array = array.combine_chunks()
+  if not pyarrow.types.is_timestamp(array.type):
+    raise TypeError("%s is not a timestamp type" % array.type)
+  values = numpy.frombuffer(array.buffers()[1], dtype=numpy.int64,
+                            count=len(array), offset=array.offset*8)
+  if array.null_count:
+    values = values.copy()
+    values[array.is_null().to_numpy(zero_copy_only=False)] = _NaT
+  return _from_int64(values, array.type.unit)
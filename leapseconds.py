@@ -0,0 +1,232 @@
+# -*- coding: utf-8 -*-
+"""
+Leap seconds and conversion between UTC, TAI and GPS time
+
+UNIX times and MJDs count every day as 86400 s, so they are UTC based.  The
+difference TAI - UTC is a whole number of seconds which changes when a leap
+second is inserted.  It is found from a table of the UNIX times at which
+each value starts, with numpy.searchsorted() for arrays and bisect for
+scalars on the same table::
+
+  In [1]: TAI_minus_UTC(1483228800)
+  Out[1]: 37
+  In [2]: UTC_to_GPS(numpy.array([315964800., 1483228800.]))
+  Out[2]: array([0.00000000e+00, 1.16726402e+09])
+
+A table is bundled, covering 1972 to the leap second of 2017-01-01, so no
+network access or file is needed.  When a new leap second is announced the
+table can be replaced from a copy of the IERS file Leap_Second.dat or the
+NIST/IETF file leap-seconds.list::
+
+  load_leap_seconds("/usr/share/zoneinfo/leap-seconds.list")
+
+Before 1972 UTC did not differ from TAI by whole seconds; the first offset,
+10 s, is used for those times.  A UNIX time cannot represent a leap second
+itself, so TAI_to_UTC() gives the following second for it.
+"""
+import bisect
+import datetime as DT
+
+import numpy
+
+# GPS time is TAI - 19 s, counted from 1980-01-06 00:00:00 UTC
+GPS_epoch = 315964800
+TAI_minus_GPS = 19
+
+# TAI - UTC from each date on; no leap second was inserted after 2017-01-01
+bundled = ((1972, 1, 1, 10), (1972, 7, 1, 11), (1973, 1, 1, 12),
+           (1974, 1, 1, 13), (1975, 1, 1, 14), (1976, 1, 1, 15),
+           (1977, 1, 1, 16), (1978, 1, 1, 17), (1979, 1, 1, 18),
+           (1980, 1, 1, 19), (1981, 7, 1, 20), (1982, 7, 1, 21),
+           (1983, 7, 1, 22), (1985, 7, 1, 23), (1988, 1, 1, 24),
+           (1990, 1, 1, 25), (1991, 1, 1, 26), (1992, 7, 1, 27),
+           (1993, 7, 1, 28), (1994, 7, 1, 29), (1996, 1, 1, 30),
+           (1997, 7, 1, 31), (1999, 1, 1, 32), (2006, 1, 1, 33),
+           (2009, 1, 1, 34), (2012, 7, 1, 35), (2015, 7, 1, 36),
+           (2017, 1, 1, 37))
+
+# seconds from 1900-01-01, the NTP epoch of leap-seconds.list, to 1970-01-01
+NTP_epoch_offset = 2208988800
+
+class LeapSecondTable(object):
+  """
+  UNIX times at which each value of TAI - UTC starts
+
+  Public attributes::
+
+    expires - UNIX time after which the table may be out of date, or None
+    offsets - TAI - UTC in seconds from each start
+    starts  - UNIX times (UTC) at which the offsets apply
+  """
+  def __init__(self, starts, offsets, expires=None):
+    """
+    @param starts : increasing UNIX times of the changes
+    @type  starts : list of int
+
+    @param offsets : TAI - UTC from each start
+    @type  offsets : list of int
+
+    @param expires : when the source of the table expires
+    @type  expires : int
+    """
+    if len(starts) != len(offsets) or not starts:
+      raise ValueError("need equal, non-zero numbers of starts and offsets")
+    if any(later <= earlier for earlier, later in zip(starts, starts[1:])):
+      raise ValueError("leap second dates are not increasing")
+    self.starts = list(starts)
+    self.offsets = list(offsets)
+    self.expires = expires
+    # the same times on the TAI scale, for converting back
+    self._TAI_starts = [start + offset
+                        for start, offset in zip(self.starts, self.offsets)]
+    self._arrays = None
+
+  def __repr__(self):
+    return "LeapSecondTable(%d entries, TAI - UTC = %d s from %s)" % (
+             len(self.starts), self.offsets[-1],
+             DT.date.fromordinal(self.starts[-1]//86400 + 719163))
+
+  def _index(self, times, TAI=False):
+    """
+    Index of the entry in effect at each time; the first entry before it
+    """
+    starts = self._TAI_starts if TAI else self.starts
+    if numpy.isscalar(times):
+      return max(bisect.bisect_right(starts, times) - 1, 0)
+    if self._arrays is None:
+      self._arrays = (numpy.array(self.starts), numpy.array(self._TAI_starts),
+                      numpy.array(self.offsets))
+    index = numpy.searchsorted(self._arrays[1 if TAI else 0], times,
+                               side="right") - 1
+    return numpy.maximum(index, 0)
+
+  def offset(self, UnixTime):
+    """
+    TAI - UTC in seconds at UNIX (UTC) times
+    """
+    index = self._index(UnixTime)
+    if numpy.isscalar(index):
+      return self.offsets[index]
+    return self._arrays[2][index]
+
+  def TAI_offset(self, TAI):
+    """
+    TAI - UTC in seconds at TAI times counted from the UNIX epoch
+    """
+    index = self._index(TAI, TAI=True)
+    if numpy.isscalar(index):
+      return self.offsets[index]
+    return self._arrays[2][index]
+
+def from_dates(dates, expires=None):
+  """
+  Table from (year, month, day, TAI - UTC) tuples
+  """
+  starts = [(DT.date(year, month, day).toordinal() - 719163)*86400
+            for year, month, day, offset in dates]
+  return LeapSecondTable(starts, [offset for year, month, day, offset in dates],
+                         expires)
+
+table = from_dates(bundled)
+
+def load_leap_seconds(path):
+  """
+  Replaces the leap second table from a local file
+
+  Two formats are recognized.  The IERS file Leap_Second.dat has lines of
+  MJD, day, month, year and TAI - UTC; the NIST/IETF file leap-seconds.list
+  has lines of NTP seconds (since 1900) and TAI - UTC, and an expiry time on
+  a line starting with '#@'.  Other comment lines start with '#'.
+
+  @param path : name of the file
+
+  @return: the new LeapSecondTable
+  """
+  global table
+  starts = []
+  offsets = []
+  expires = None
+  with open(path) as f:
+    for line in f:
+      if line.startswith("#@"):
+        expires = int(line[2:].split()[0]) - NTP_epoch_offset
+        continue
+      if "File expires on" in line:
+        date = DT.datetime.strptime(line.split(" on ", 1)[1].strip(),
+                                    "%d %B %Y")
+        expires = (date.toordinal() - 719163)*86400
+        continue
+      fields = line.split("#")[0].split()
+      if not fields:
+        continue
+      if len(fields) >= 5 and "." in fields[0]:
+        # IERS: MJD day month year offset
+        starts.append(int(round((float(fields[0]) - 40587)*86400)))
+        offsets.append(int(fields[4]))
+      elif len(fields) >= 2:
+        # NIST: NTP seconds offset
+        starts.append(int(fields[0]) - NTP_epoch_offset)
+        offsets.append(int(fields[1]))
+      else:
+        raise ValueError("%s: cannot parse %r" % (path, line))
+  table = LeapSecondTable(starts, offsets, expires)
+  return table
+
+def _times(times):
+  """
+  Scalars as they are, anything else as an ndarray
+  """
+  if numpy.isscalar(times):
+    return times
+  return numpy.asarray(times)
+
+def TAI_minus_UTC(UnixTime):
+  """
+  TAI - UTC in seconds
+
+  @param UnixTime : UNIX time(s)
+  @type  UnixTime : float or array
+
+  @return: int or int array
+  """
+  return table.offset(_times(UnixTime))
+
+def UTC_to_TAI(UnixTime):
+  """
+  TAI, as seconds on the UNIX time scale, from UNIX time
+
+  This is the UNIX time plus TAI - UTC.
+  """
+  UnixTime = _times(UnixTime)
+  return UnixTime + table.offset(UnixTime)
+
+def TAI_to_UTC(TAI):
+  """
+  UNIX time from TAI as given by UTC_to_TAI()
+  """
+  TAI = _times(TAI)
+  return TAI - table.TAI_offset(TAI)
+
+def TAI_to_GPS(TAI):
+  """
+  GPS seconds since 1980-01-06 00:00:00 UTC from TAI as given by UTC_to_TAI()
+  """
+  return _times(TAI) - (GPS_epoch + TAI_minus_GPS)
+
+def GPS_to_TAI(GPS):
+  """
+  TAI as given by UTC_to_TAI() from GPS seconds
+  """
+  return _times(GPS) + (GPS_epoch + TAI_minus_GPS)
+
+def UTC_to_GPS(UnixTime):
+  """
+  GPS seconds since 1980-01-06 00:00:00 UTC from UNIX time
+  """
+  return TAI_to_GPS(UTC_to_TAI(UnixTime))
+
+def GPS_to_UTC(GPS):
+  """
+  UNIX time from GPS seconds
+  """
+  return TAI_to_UTC(GPS_to_TAI(GPS))
@@ -0,0 +1,239 @@
+# -*- coding: utf-8 -*-
+"""
+Finding the passes of a DSN schedule which are active at given times
+
+A schedule is a list of passes, each with a date YYYY-DDD and start and end
+times HHMM in UT.  A pass whose end is earlier than its start runs past
+midnight into the next day.  ScheduleIndex keeps the start and end UNIX
+times sorted by start, with the running maximum of the ends, in NumPy
+arrays.  The passes which start before a time are found by bisection on the
+starts, and the first which may still be active by bisection on the running
+maximum.  A query looks at the passes between the two: those which overlap
+it and any which started after the first overlapping pass but have already
+ended.  For a schedule of passes of similar length these are few, but one
+pass much longer than the rest keeps the running maximum high, and every
+pass which starts during it is looked at until it ends::
+
+  In [1]: index = load_schedule("DSS43_2020_25.txt")
+  In [2]: index.at(DatesTimes.VSR_array_to_timestamp(2020, 171, 45296))
+  Out[2]: [['2020-171', '1130', '1515', 'DSS-43', 'VGR2']]
+  In [3]: index.active(times)
+  Out[3]: array([ 3,  3, -1, ...])
+
+New passes, such as next week's schedule, can be added with
+load_schedule(path, index=index) or ScheduleIndex.append(); if they start
+after the passes already there the arrays are extended without sorting.
+"""
+import re
+
+import numpy
+
+from . import _unix_day_array
+
+_date = re.compile(r"^(\d{4})[-/](\d{3})$")
+
+def _HHMM_seconds(time_string, end=False):
+  """
+  Seconds of the day from HHMM, as in HHMM_to_timetuple(); 2400 is allowed
+  for an end
+  """
+  if len(time_string) != 4 or not time_string.isdigit():
+    raise ValueError("%r is not HHMM" % time_string)
+  hour, minute = int(time_string[:2]), int(time_string[2:])
+  if minute > 59 or hour > 23 and not (end and hour == 24 and minute == 0):
+    raise ValueError("%r is not HHMM" % time_string)
+  return (hour*60 + minute)*60
+
+class ScheduleIndex(object):
+  """
+  Passes, as start and end UNIX times, indexed for overlap queries
+
+  A pass is active from its start up to, but not including, its end.
+
+  Public attributes::
+
+    passes - the passes in the order they were added; the row numbers
+             returned by active() are indices into this list
+  """
+  def __init__(self, starts=(), ends=(), passes=None):
+    """
+    @param starts : UNIX times at which the passes start
+    @type  starts : array-like of float
+
+    @param ends : UNIX times at which the passes end
+    @type  ends : array-like of float
+
+    @param passes : anything describing each pass; the row numbers if None
+    @type  passes : list
+    """
+    self.passes = []
+    self._starts = numpy.empty(0)
+    self._ends = numpy.empty(0)
+    # running maximum of the ends, which never decreases
+    self._max_ends = numpy.empty(0)
+    # row of each pass in start order
+    self._rows = numpy.empty(0, dtype=numpy.int64)
+    self.append(starts, ends, passes)
+
+  def __len__(self):
+    return len(self.passes)
+
+  def __repr__(self):
+    return "ScheduleIndex(%d passes)" % len(self)
+
+  def append(self, starts, ends, passes=None):
+    """
+    Adds passes
+
+    @param starts : UNIX times at which the passes start
+    @param ends : UNIX times at which the passes end
+    @param passes : anything describing each pass; the row numbers if None
+    """
+    starts = numpy.asarray(starts, dtype=float).ravel()
+    ends = numpy.asarray(ends, dtype=float).ravel()
+    if len(starts) != len(ends):
+      raise ValueError("need the same number of starts and ends")
+    if (ends < starts).any():
+      raise ValueError("a pass ends before it starts")
+    first = len(self.passes)
+    rows = numpy.arange(first, first + len(starts))
+    if passes is None:
+      passes = rows.tolist()
+    elif len(passes) != len(starts):
+      raise ValueError("need one description per pass")
+    self.passes.extend(passes)
+    order = numpy.argsort(starts, kind="stable")
+    starts, ends, rows = starts[order], ends[order], rows[order]
+    if len(self._starts) and len(starts) and starts[0] < self._starts[-1]:
+      # out of order: sort everything again
+      starts = numpy.concatenate((self._starts, starts))
+      ends = numpy.concatenate((self._ends, ends))
+      rows = numpy.concatenate((self._rows, rows))
+      order = numpy.argsort(starts, kind="stable")
+      self._starts, self._ends, self._rows = (starts[order], ends[order],
+                                              rows[order])
+      self._max_ends = numpy.maximum.accumulate(self._ends)
+    else:
+      max_ends = numpy.maximum.accumulate(ends)
+      if len(self._max_ends):
+        numpy.maximum(max_ends, self._max_ends[-1], out=max_ends)
+      self._starts = numpy.concatenate((self._starts, starts))
+      self._ends = numpy.concatenate((self._ends, ends))
+      self._rows = numpy.concatenate((self._rows, rows))
+      self._max_ends = numpy.concatenate((self._max_ends, max_ends))
+
+  def _candidates(self, begin, end, side):
+    """
+    Range of positions in start order of the passes which may overlap
+    """
+    first = numpy.searchsorted(self._max_ends, begin, side="right")
+    stop = numpy.searchsorted(self._starts, end, side=side)
+    return first, stop
+
+  def at(self, time):
+    """
+    The passes active at a time, in order of their starts
+
+    @param time : UNIX time
+    @type  time : float
+
+    @return: list
+    """
+    first, stop = self._candidates(time, time, "right")
+    positions = first + numpy.flatnonzero(self._ends[first:stop] > time)
+    return [self.passes[row] for row in self._rows[positions]]
+
+  def overlapping(self, begin, end):
+    """
+    The passes active at any time from 'begin' up to 'end', in order of
+    their starts
+
+    @return: list
+    """
+    first, stop = self._candidates(begin, end, "left")
+    positions = first + numpy.flatnonzero(self._ends[first:stop] > begin)
+    return [self.passes[row] for row in self._rows[positions]]
+
+  def active(self, times):
+    """
+    For each time, the row of the latest starting pass which is active
+
+    @param times : UNIX times
+    @type  times : array-like of float
+
+    @return: int64 numpy.ndarray, -1 where no pass is active
+    """
+    times = numpy.asarray(times, dtype=float)
+    shape = times.shape
+    times = times.ravel()
+    first, position = self._candidates(times, times, "right")
+    position -= 1
+    found = numpy.full(len(times), -1, dtype=numpy.int64)
+    # step back through the passes which started before each time until
+    # one is still active; this takes one step more than the number of
+    # passes which started since the latest active one and have ended
+    pending = numpy.flatnonzero(position >= first)
+    while len(pending):
+      here = position[pending]
+      active = self._ends[here] > times[pending]
+      found[pending[active]] = self._rows[here[active]]
+      pending = pending[~active]
+      position[pending] -= 1
+      pending = pending[position[pending] >= first[pending]]
+    return found.reshape(shape)
+
+def parse_schedule(lines, date=0, start=1, end=2, index=None):
+  """
+  ScheduleIndex from the lines of a schedule
+
+  Each line is split at white space.  Lines whose 'date' field is not
+  YYYY-DDD (or YYYY/DDD) are skipped, so headers and comments may be left
+  in.  The passes are the lists of fields.
+
+  @param lines : lines of the schedule
+  @type  lines : iterable of str
+
+  @param date : number of the field with the date
+  @param start : number of the field with the start time HHMM
+  @param end : number of the field with the end time HHMM
+
+  @param index : an index to add the passes to, instead of a new one
+  @type  index : ScheduleIndex
+
+  @return: ScheduleIndex
+  """
+  passes = []
+  years = []
+  doys = []
+  starts = []
+  ends = []
+  for line in lines:
+    fields = line.split()
+    try:
+      match = _date.match(fields[date])
+    except IndexError:
+      continue
+    if not match:
+      continue
+    years.append(int(match.group(1)))
+    doys.append(int(match.group(2)))
+    starts.append(_HHMM_seconds(fields[start]))
+    ends.append(_HHMM_seconds(fields[end], end=True))
+    passes.append(fields)
+  midnights = _unix_day_array(numpy.array(years, dtype=numpy.int64),
+                              numpy.array(doys, dtype=numpy.int64))*86400
+  starts = numpy.array(starts, dtype=numpy.int64)
+  ends = numpy.array(ends, dtype=numpy.int64)
+  # an end before the start is on the next day
+  ends += (ends < starts)*86400
+  if index is None:
+    return ScheduleIndex(midnights + starts, midnights + ends, passes)
+  index.append(midnights + starts, midnights + ends, passes)
+  return index
+
+def load_schedule(path, date=0, start=1, end=2, index=None):
+  """
+  ScheduleIndex from a schedule file; see parse_schedule()
+  """
+  with open(path) as f:
+    return parse_schedule(f, date, start, end, index)
@@ -3,6 +3,12 @@ unittest for DatesTimes
 """
 import unittest
 import datetime
+import io
+import os
+import subprocess
+import sys
+import time
+import numpy
 import DatesTimes
 
 class testDatesTimes(unittest.TestCase):
@@ -34,6 +40,310 @@ class testDatesTimes(unittest.TestCase):
   
   def test_MJD(self):
     self.assertEqual(DatesTimes.MJD(1858,11,17), 0)
-    
+
+  def test_ISOtime2datetime(self):
+    expected = datetime.datetime(2020, 6, 19, 12, 34, 56)
+    for ISOtime in ["2020-06-19T12:34:56", "2020-171T12:34:56",
+                    "20200619T123456", "2020171T123456",
+                    "2020-06-19 12:34:56"]:
+      self.assertEqual(DatesTimes.ISOtime2datetime(ISOtime), expected)
+    self.assertEqual(DatesTimes.ISOtime2datetime("2020171T1234"),
+                     expected.replace(second=0))
+    self.assertEqual(DatesTimes.ISOtime2datetime("2020-06-19 12:34:56.5"),
+                     expected.replace(microsecond=500000))
+    # day 366 of a common year rolls over, as strptime does
+    self.assertEqual(DatesTimes.ISOtime2datetime("2019-366T00:00"),
+                     datetime.datetime(2020, 1, 1))
+    self.assertRaises(ValueError, DatesTimes.ISOtime2datetime,
+                      "2020-02-30T00:00:00")
+
+  def test_ISOtime_array(self):
+    ISOtimes = ["2020-06-19T12:34:56", "2020-171T12:34:56", "20200619T123456",
+                "2020171T123456", "2020-06-19 12:34:56.5", "2020-02-30T00:00",
+                "not a time"]
+    expected = [numpy.datetime64(DatesTimes.ISOtime2datetime(ISOtime), "us")
+                for ISOtime in ISOtimes[:5]] + [numpy.datetime64("NaT")]*2
+    for column in [ISOtimes, numpy.array(ISOtimes),
+                   numpy.array(ISOtimes).astype(bytes)]:
+      numpy.testing.assert_array_equal(DatesTimes.ISOtime_array(column),
+                                       expected)
+    records = b"2020-06-19T12:34:56\n2020-06-19T12:34:57\n"
+    self.assertEqual(list(DatesTimes.ISOtime_array(records, dtype="int64")),
+                     [1592570096000000, 1592570097000000])
+    for empty in ([], numpy.empty(0), numpy.empty((0, 3)), b""):
+      times = DatesTimes.ISOtime_array(empty)
+      self.assertEqual(times.dtype, numpy.dtype("datetime64[us]"))
+      self.assertEqual(times.size, 0)
+
+  def test_iter_logtimes(self):
+    log = io.StringIO("23:59:58 first\n"
+                      "no time here\n"
+                      "23:59:59 second\n"
+                      "00:00:01 after midnight\n"
+                      "00:00:02 later\n")
+    midnight = DatesTimes.VSR_script_time_to_timestamp(2021, "001/00:00:00")
+    self.assertEqual(list(DatesTimes.iter_logtimes(log, 2020, 366)),
+                     [midnight - 2, midnight - 1, midnight + 1, midnight + 2])
+    log.seek(0)
+    chunks = [chunk.copy() for chunk in
+              DatesTimes.logtime_chunks(log, 2020, 366, chunk_size=3)]
+    self.assertEqual([len(chunk) for chunk in chunks], [3, 1])
+    self.assertEqual(chunks[1][0], midnight + 2)
+
+  def test_VSR_arrays(self):
+    tuples = [(2010, 15, 16212), (2010, 101, 12345.25), (2020, 366, 86399)]
+    expected = [DatesTimes.VSR_to_datetime(t).replace(tzinfo=None)
+                for t in tuples]
+    numpy.testing.assert_array_equal(
+      DatesTimes.VSR_array_to_datetime64(numpy.array(tuples)),
+      numpy.array(expected, dtype="datetime64[us]"))
+    timestamps = DatesTimes.VSR_array_to_timestamp([2010, 2020], [15, 366],
+                                                   [16212, 86399])
+    self.assertEqual(timestamps.dtype, numpy.int64)
+    self.assertEqual(list(timestamps), [1263529812, 1609459199])
+    # small integer types are widened before scaling to microseconds
+    for dtype in (numpy.int32, numpy.uint16):
+      rows = numpy.array([[2010, 15, 16212], [2010, 16, 16212]], dtype=dtype)
+      self.assertEqual(DatesTimes.VSR_array_to_datetime64(rows).tolist(),
+                       [datetime.datetime(2010, 1, 15, 4, 30, 12),
+                        datetime.datetime(2010, 1, 16, 4, 30, 12)])
+
+  def test_import_is_light(self):
+    # a fresh interpreter, since this one has already loaded NumPy
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+    loaded = subprocess.run([sys.executable, "-c",
+      "import logging, sys; import DatesTimes; DatesTimes.now_string();"
+      "print(sorted(set(['numpy', 'calendar']) & set(sys.modules)),"
+      "      logging.getLogger().handlers)"],
+      env=env, capture_output=True, text=True, check=True).stdout
+    self.assertEqual(loaded.strip(), "[] []")
+
+  def test_calendar_arrays(self):
+    years = numpy.repeat(numpy.arange(1896, 2105), 366)
+    doys = numpy.tile(numpy.arange(1, 367), 2105-1896)
+    y, m, d = DatesTimes.calendar_date(years, doys)
+    jd = DatesTimes.julian_date(years, doys)
+    dow = DatesTimes.day_of_week(doys, years)
+    week = DatesTimes.week_number(years, doys)
+    for i in range(0, len(years), 37):
+      year, doy = int(years[i]), int(doys[i])
+      self.assertEqual((y[i], m[i], d[i]), DatesTimes.calendar_date(year, doy))
+      self.assertEqual(jd[i], DatesTimes.julian_date(year, doy))
+      self.assertEqual(dow[i], DatesTimes.day_of_week(doy, year))
+      self.assertEqual(week[i], DatesTimes.week_number(year, doy))
+    self.assertEqual(list(DatesTimes.leap_year([1900, 2000, 2019, 2020])),
+                     [0, 1, 0, 1])
+    self.assertEqual(list(DatesTimes.day_of_year(2020, [1, 6, 12], 19)),
+                     [19, 171, 354])
+
+  def test_day_table(self):
+    table = DatesTimes.DayTable(1999, 2001)
+    for year in (1900, 1999, 2000, 2100):
+      for doy in (1, 59, 60, 61, 365):
+        month, day, ordinal, mjd, midnight = table.lookup(year, doy)
+        date = datetime.date(year, month, day)
+        self.assertEqual(DatesTimes.day_of_year(year, month, day), doy)
+        self.assertEqual(date.toordinal(), ordinal)
+        self.assertEqual(mjd, DatesTimes.MJD(year, month, day))
+        self.assertEqual(datetime.datetime.fromtimestamp(
+                           midnight, datetime.timezone.utc).date(),
+                         date)
+    self.assertIsNone(table.get(2001, 366))
+    self.assertIsNone(table.get(2002, 1))
+    self.assertEqual(table.get(2000, 366), (12, 31, 730485))
+    years = numpy.array([1998, 1999, 2000, 2001, 2002])
+    month, day, ordinal = table.lookup(years, 60)[:3]
+    self.assertEqual(list(month), [3, 3, 2, 3, 3])
+    self.assertEqual(list(day), [1, 1, 29, 1, 1])
+    self.assertEqual(list(ordinal),
+                     [datetime.date(y, 1, 1).toordinal() + 59 for y in years])
+    self.assertRaises(ValueError, DatesTimes.DayTable, 2001, 1999)
+    default = DatesTimes.day_table
+    try:
+      DatesTimes.set_day_table_range(2020, 2020)
+      self.assertEqual(DatesTimes.VSR_tuple_to_MPL(2020, 171, 43200),
+                       datetime.date(2020, 6, 19).toordinal() + 0.5)
+      self.assertEqual(DatesTimes.calendar_date(2021, 171), (2021, 6, 20))
+    finally:
+      DatesTimes.day_table = default
+    self.assertEqual(DatesTimes.VSR_script_time_to_timestamp(2010,
+                                                             "101/03:25:45"),
+                     1270956345)
+
+  def test_midnight_cache(self):
+    DatesTimes.set_midnight_cache_size(2)
+    try:
+      for day in (101, 101, 102, 101, 103):
+        self.assertEqual(
+          DatesTimes.macro_log_time_to_UnixTime(2010, "%d_03:25:45" % day),
+          1270956345 + (day - 101)*86400)
+      info = DatesTimes.midnight_cache_info()
+      self.assertEqual((info.hits, info.misses, info.currsize), (2, 3, 2))
+      self.assertEqual(DatesTimes.WVSR_script_time_to_timestamp("16/237",
+                                                                "08:45:01"),
+                       1472028301)
+      self.assertRaises(ValueError, DatesTimes.VSR_script_time_to_timestamp,
+                        2010, "101/24:00:00")
+      self.assertRaises(ValueError, DatesTimes.VSR_script_time_to_timestamp,
+                        2010, "366/00:00:00")
+      DatesTimes.midnight_cache_clear()
+      self.assertEqual(DatesTimes.midnight_cache_info().currsize, 0)
+    finally:
+      DatesTimes.set_midnight_cache_size(256)
+
+  def test_sidereal_time(self):
+    # Meeus, Astronomical Algorithms, example 12.a: 1987 April 10, 0h UT
+    UnixTime = 545011200
+    self.assertAlmostEqual(DatesTimes.GMST(UnixTime),
+                           13 + 10/60. + 46.3668/3600, places=5)
+    self.assertAlmostEqual(DatesTimes.GMST(946728000), 18.697374558)
+    self.assertAlmostEqual(DatesTimes.GMST(46895., mjd=True),
+                           DatesTimes.GMST(UnixTime))
+    times = numpy.array([0., UnixTime, 1.5e9])
+    out = numpy.empty(3)
+    self.assertIs(DatesTimes.GMST(times, out=out), out)
+    self.assertEqual(list(out), [DatesTimes.GMST(t) for t in times])
+    numpy.testing.assert_allclose(DatesTimes.GMST(times, radians=True),
+                                  out*DatesTimes.hr_to_rad)
+    self.assertAlmostEqual(DatesTimes.LST(UnixTime, -116.89),
+                           (DatesTimes.GMST(UnixTime) - 116.89/15) % 24)
+    lst = DatesTimes.LST(times[:, None], [[0, 90, 180]])
+    self.assertEqual(lst.shape, (3, 3))
+    numpy.testing.assert_allclose(lst[:, 1], (out + 6) % 24)
+
+  def test_clocks(self):
+    now = 1592570096.789
+    utc = datetime.datetime.fromtimestamp(now, datetime.timezone.utc)
+    render = dict((name, clock.render(now))
+                  for name, clock in DatesTimes.clocks.items())
+    self.assertEqual(render["logtime"], "12:34:56.789")
+    # rounded as the uncached datetime strings were, near the boundaries
+    for whole in (now - 0.789, -3600.):
+      for millisecond in (0, 1, 999):
+        for offset in (-6e-7, -4e-7, -1e-7, 0, 1e-7, 4e-7, 6e-7):
+          time_ = whole + millisecond/1000. + offset
+          self.assertEqual(DatesTimes.clocks["logtime"].render(time_),
+                           datetime.datetime.fromtimestamp(
+                             time_, datetime.timezone.utc).strftime(
+                                                       "%H:%M:%S.%f")[:-3])
+    self.assertEqual(render["logtimestamp"], utc.strftime("%Y-%j-%H:%M:%S"))
+    self.assertEqual(render["make_VSR_timestring"], "2020 171 45295")
+    self.assertEqual(render["now_string"].strip(), "2020/171-1234")
+    calls = []
+    def count(now):
+      calls.append(now)
+      return str(len(calls))
+    clock = DatesTimes.CoarseClock(count, 60)
+    self.assertEqual([clock(), clock()], ["1", "1"])
+    clock.precision = 0
+    self.assertEqual([clock(), clock()], ["2", "3"])
+    DatesTimes.set_clock_precision(0, ["logtimestamp"])
+    try:
+      self.assertEqual(DatesTimes.clocks["logtimestamp"].precision, 0)
+      self.assertEqual(DatesTimes.clocks["logtime"].precision, 0.001)
+    finally:
+      DatesTimes.set_clock_precision()
+    self.assertEqual(DatesTimes.clocks["logtimestamp"].precision, 1)
+
+  def test_UnixTime_converter_arrays(self):
+    unix = numpy.array([[0., 1.5e9], [-62135596800., 1e9]])
+    mpl = DatesTimes.UnixTime_to_MPL(unix)
+    self.assertEqual(mpl.shape, (2, 2))
+    self.assertEqual(mpl[0, 0], DatesTimes.UnixTime_to_MPL(0))
+    self.assertEqual(mpl[1, 0], 1.)
+    numpy.testing.assert_allclose(DatesTimes.MPLtime_to_UnixTime(mpl), unix)
+    buf = unix.copy()
+    self.assertIs(DatesTimes.UnixTime_to_MJD(buf, out=buf), buf)
+    self.assertEqual(buf[0, 0], 40587)
+    self.assertIs(DatesTimes.MJD_to_UnixTime(buf, out=buf), buf)
+    numpy.testing.assert_allclose(buf, unix)
+    self.assertEqual(list(DatesTimes.MJD_to_UnixTime([40587, 40588])),
+                     [0., 86400.])
+
+  def test_sexagesimal(self):
+    self.assertAlmostEqual(DatesTimes.time_int_to_decimal("-123456.7"),
+                           -(12 + 34/60. + 56.7/3600))
+    self.assertAlmostEqual(DatesTimes.time_int_to_decimal("3000"), 0.5)
+    self.assertEqual(DatesTimes.DDDMM_to_dec_deg("-3015"), -30.25)
+    # the same with or without a sign, as one string or in an array
+    for DDDMM, degrees in (("3015", 30.25), ("+3015", 30.25),
+                           ("-12345", -123.75)):
+      self.assertEqual(DatesTimes.DDDMM_to_dec_deg(DDDMM), degrees)
+      self.assertEqual(list(DatesTimes.DDDMM_to_dec_deg([DDDMM])), [degrees])
+    # one grammar for one string and for arrays: pairs from the right
+    cases = [(DatesTimes.HHMM_to_dec_deg, "123456", 18524.),
+             (DatesTimes.HHMM_to_dec_deg, "1230.5", 187.625),
+             (DatesTimes.HHMM_to_dec_deg, "+1230", 187.5),
+             (DatesTimes.HHMM_to_dec_deg, "-1230", -187.5),
+             (DatesTimes.time_int_to_decimal, "1234567",
+              123 + 45/60. + 67/3600.),
+             (DatesTimes.time_int_to_decimal, "-12", -12/3600.),
+             (DatesTimes.DDDMM_to_dec_deg, "-3015.5", -(30 + 15.5/60)),
+             (DatesTimes.DDDMM_to_dec_deg, "30", 0.5)]
+    for function, string, value in cases:
+      self.assertAlmostEqual(function(string), value)
+      self.assertEqual(list(function([string])), [function(string)])
+    for function in (DatesTimes.HHMM_to_dec_deg, DatesTimes.DDDMM_to_dec_deg,
+                     DatesTimes.time_int_to_decimal):
+      for string in ("12a456", "", "-.5", "1.2.3"):
+        self.assertRaises(ValueError, function, string)
+        self.assertTrue(numpy.isnan(function([string])[0]))
+    # bytes are one string for all three
+    self.assertEqual(DatesTimes.DDDMM_to_dec_deg(b"-3015"), -30.25)
+    self.assertEqual(DatesTimes.HHMM_to_dec_deg(b"1230"), 187.5)
+    self.assertEqual(DatesTimes.time_int_to_decimal(b"3000"), 0.5)
+    strings = ["-123456.7", "+001030", "235959.99", "3000", "12a456", "",
+               "-.5"]
+    numpy.testing.assert_allclose(
+      DatesTimes.time_int_to_decimal(numpy.array(strings)),
+      [DatesTimes.time_int_to_decimal(s) for s in strings[:4]]
+      + [numpy.nan]*3)
+    self.assertEqual(list(DatesTimes.DDDMM_to_dec_deg([b"-3015", b"+0030"])),
+                     [-30.25, 0.5])
+    self.assertEqual(list(DatesTimes.HHMM_to_dec_deg(["1230", "0015"])),
+                     [187.5, 3.75])
+    # records in a buffer
+    numpy.testing.assert_allclose(
+      DatesTimes.time_int_to_decimal(b"123456\n-00030\n"),
+      [12 + 34/60. + 56/3600., -0.5/60])
+    random = numpy.random.RandomState(4)
+    hours = random.uniform(0, 24, 1000)
+    text = DatesTimes.decimal_to_sexagesimal(hours, decimals=1)
+    self.assertEqual(text.dtype, numpy.dtype("S8"))
+    numpy.testing.assert_allclose(DatesTimes.time_int_to_decimal(text), hours,
+                                  atol=0.05/3600)
+    degrees = random.uniform(-90, 90, 1000)
+    text = DatesTimes.decimal_to_sexagesimal(degrees, signed=True)
+    numpy.testing.assert_allclose(DatesTimes.time_int_to_decimal(text),
+                                  degrees, atol=0.5/3600)
+    self.assertEqual(DatesTimes.decimal_to_sexagesimal(
+                       [12.99999999, -0.5], signed=True).tolist(),
+                     [b"+130000", b"-003000"])
+    self.assertEqual(DatesTimes.decimal_to_sexagesimal([187.5], 1, lead=3),
+                     [b"18730"])
+    self.assertRaises(ValueError, DatesTimes.decimal_to_sexagesimal, [-1.])
+
+  def test_timezones(self):
+    self.assertIs(DatesTimes.UnixTime_to_datetime(0).tzinfo, DatesTimes.utc)
+    self.assertIs(DatesTimes.station_timezone(43),
+                  DatesTimes.get_timezone("Canberra"))
+    self.assertIs(DatesTimes.get_timezone(5.5), DatesTimes.get_timezone(5.5))
+    self.assertRaises(ValueError, DatesTimes.station_timezone, 99)
+    st = DatesTimes.ST()
+    self.assertEqual(datetime.datetime(2020, 6, 19, tzinfo=st).utcoffset(),
+                     datetime.timedelta(seconds=-time.timezone))
+    noon = 1592568000.
+    self.assertEqual(DatesTimes.local_time_of_day(noon, "GDSCC"), 4*3600)
+    self.assertEqual(DatesTimes.local_HHMM(noon + 90, "MDSCC"), "1301")
+    times = noon + numpy.arange(0, 86400, 997.)
+    for zone in ("UTC", "CDSCC", -3.5):
+      tz = DatesTimes.get_timezone(zone)
+      expected = [datetime.datetime.fromtimestamp(t, tz) for t in times]
+      self.assertEqual(
+        list(DatesTimes.local_time_of_day(times, zone)),
+        [(d.hour*60 + d.minute)*60 + d.second for d in expected])
+      self.assertEqual(DatesTimes.local_HHMM(times, zone).tolist(),
+                       [d.strftime("%H%M").encode() for d in expected])
+
 if __name__ == "__main__":
   unittest.main()
@@ -0,0 +1,72 @@
+"""
+unittest for extracting times from log archives
+"""
+import unittest
+import os
+import tempfile
+import DatesTimes
+
+LOGTIMES = """23:59:58 start of the track
+23:59:59 antenna on point
+no time on this line
+00:00:01 recording
+00:00:02 recording
+12:00:00 end
+"""
+
+class testArchive(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def write(self, name, text):
+    path = os.path.join(self.directory.name, name)
+    with open(path, "w") as f:
+      f.write(text)
+    return path
+
+  def test_logtime_matches_iter_logtimes(self):
+    path = self.write("eac.log", LOGTIMES)
+    expected = list(DatesTimes.iter_logtimes(path, 2020, 366))
+    # chunks of a few bytes put the midnight between chunks
+    for chunk_size in (1, 7, 30, 1000):
+      stamps = DatesTimes.extract_timestamps(path, year=2020, doy=366,
+                                             workers=1, chunk_size=chunk_size)
+      self.assertEqual(list(stamps.times), expected)
+    offsets = [LOGTIMES.index(line) for line in LOGTIMES.splitlines()
+               if line[2:3] == ":"]
+    self.assertEqual(list(stamps.offset), offsets)
+
+  def test_macro_and_ISO(self):
+    path = self.write("macro.log", "365_23:59:59 a\nbad line\n001_00:00:01\n")
+    stamps = DatesTimes.extract_timestamps(path, "macro", year=2019,
+                                           workers=1)
+    self.assertEqual(list(stamps.times),
+                     [DatesTimes.macro_log_time_to_UnixTime(2019,
+                                                            "365_23:59:59"),
+                      DatesTimes.macro_log_time_to_UnixTime(2020,
+                                                            "001_00:00:01")])
+    path = self.write("iso.log", "x 2020-06-19T12:34:56 ok\n"
+                                 "x 2020-06-19 12:00:00.25\nx\n")
+    stamps = DatesTimes.extract_timestamps(path, "ISO", column=2, workers=1)
+    self.assertEqual(list(stamps.times), [1592568000.25, 1592570096.0])
+    self.assertEqual(list(stamps.offset), [25, 0])
+
+  def test_merge_of_files_in_processes(self):
+    first = self.write("a.log", "00:00:03\n00:00:01\n")
+    second = self.write("b.log", "00:00:02\n")
+    stamps = DatesTimes.extract_timestamps([first, second], year=2020,
+                                           doy=[1, 2], workers=2,
+                                           chunk_size=1)
+    midnight = int(DatesTimes.VSR_array_to_timestamp(2020, 1, 0))
+    self.assertEqual(list(stamps.times - midnight),
+                     [3, 86401, 86402])
+    self.assertEqual(list(stamps.source), [0, 0, 1])
+    self.assertEqual(stamps.paths, [first, second])
+    self.assertRaises(ValueError, DatesTimes.extract_timestamps, first)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,89 @@
+"""
+unittest for the on-disk cache of parsed times
+"""
+import unittest
+import os
+import tempfile
+import numpy
+import DatesTimes
+from DatesTimes.cache import TimestampCache
+
+class testTimestampCache(unittest.TestCase):
+
+  def setUp(self):
+    self.directory = tempfile.TemporaryDirectory()
+    self.log = os.path.join(self.directory.name, "eac.log")
+    with open(self.log, "w") as f:
+      f.write("12:00:00 a\n11:00:00 b\n")
+    self.cache = TimestampCache(os.path.join(self.directory.name, "cache"))
+    self.calls = 0
+
+  def tearDown(self):
+    self.directory.cleanup()
+
+  def parse(self, path, scale=1):
+    self.calls += 1
+    return {"times": numpy.arange(3.)*scale}
+
+  def test_load_parses_once(self):
+    first = self.cache.load(self.log, "test", self.parse, scale=2)
+    second = self.cache.load(self.log, "test", self.parse, scale=2)
+    self.assertEqual(self.calls, 1)
+    self.assertIsInstance(second["times"], numpy.memmap)
+    self.assertEqual(list(second["times"]), [0, 2, 4])
+    # other options and a changed file are different entries
+    self.cache.load(self.log, "test", self.parse, scale=3)
+    self.assertEqual(self.calls, 2)
+    os.utime(self.log, ns=(0, 0))
+    self.cache.load(self.log, "test", self.parse, scale=2)
+    self.assertEqual(self.calls, 3)
+
+  def test_equal_options_share_an_entry(self):
+    self.assertEqual(self.cache.key(self.log, "test", year=2020, doy=[1, 2]),
+                     self.cache.key(self.log, "test", year=numpy.int64(2020),
+                                    doy=numpy.array([1, 2], numpy.int32)))
+    self.assertEqual(self.cache.key(self.log, "test", scale=3),
+                     self.cache.key(self.log, "test", scale=3.0))
+    self.assertNotEqual(self.cache.key(self.log, "test", scale=3),
+                        self.cache.key(self.log, "test", scale=3.5))
+
+  def test_other_parsers(self):
+    def parse(path, **options):
+      self.calls += 1
+      with open(path, "rb") as f:
+        column = DatesTimes.parse_column(f.read(), **options)
+      return {"times": column.times, "unmatched": column.unmatched}
+    with open(self.log, "w") as f:
+      f.write("12:00:00\n11:00:00\n")
+    first = self.cache.load(self.log, "parse_column", parse, year=2020, doy=1)
+    again = self.cache.load(self.log, "parse_column", parse,
+                            year=numpy.int64(2020), doy=numpy.int16(1))
+    self.assertEqual(self.calls, 1)
+    self.assertEqual(list(again["times"]), list(first["times"]))
+
+  def test_eviction(self):
+    other = self.log + ".1"
+    with open(other, "w") as f:
+      f.write("\n")
+    self.cache.put(self.log, "test", {"times": numpy.zeros(1000)})
+    os.utime(os.path.join(self.cache.directory,
+                          self.cache.key(self.log, "test")), (1, 1))
+    self.cache.max_bytes = 10000
+    self.cache.put(other, "test", {"times": numpy.zeros(1000)})
+    self.assertIsNone(self.cache.get(self.log, "test"))
+    self.assertIsNotNone(self.cache.get(other, "test"))
+    self.assertEqual(len(self.cache.entries()), 1)
+    self.cache.clear()
+    self.assertEqual(self.cache.size(), 0)
+
+  def test_extract_timestamps(self):
+    stamps = DatesTimes.extract_timestamps(self.log, year=2020, doy=1,
+                                           workers=1, cache=self.cache)
+    again = DatesTimes.extract_timestamps(self.log, year=2020, doy=1,
+                                          workers=1, cache=self.cache)
+    self.assertEqual(len(self.cache.entries()), 1)
+    self.assertEqual(list(again.times), list(stamps.times))
+    self.assertEqual(list(again.offset), [0, 11])
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,111 @@
+"""
+unittest for format detection and parsing of time columns
+"""
+import io
+import unittest
+import numpy
+import DatesTimes
+
+class testDetect(unittest.TestCase):
+
+  def setUp(self):
+    random = numpy.random.RandomState(5)
+    self.year = random.randint(2000, 2100, 500)
+    self.doy = random.randint(1, 366, 500)
+    self.seconds = random.randint(0, 86400, 500)
+    self.hms = [(s//3600, s//60 % 60, s % 60) for s in self.seconds.tolist()]
+
+  def test_detect_format(self):
+    self.assertEqual(DatesTimes.detect_format(["2020-01-02T03:04:05"]), "ISO")
+    self.assertEqual(DatesTimes.detect_format(["2020 123    45"]), "VSR")
+    self.assertEqual(DatesTimes.detect_format(["123/12:34:45"]), "script")
+    self.assertEqual(DatesTimes.detect_format(["16/237 08:45:01"]), "WVSR")
+    self.assertEqual(DatesTimes.detect_format(["123_12:34:45"]), "macro")
+    self.assertEqual(DatesTimes.detect_format([b"12:34:45", b"header"]),
+                     "logtime")
+    # most of the sample decides
+    self.assertEqual(DatesTimes.detect_format(["12:34:45", "123_12:34:45",
+                                               "123_12:34:46"]), "macro")
+    self.assertIsNone(DatesTimes.detect_format(["junk", ""]))
+    self.assertIsNone(DatesTimes.detect_format([]))
+
+  def test_VSR(self):
+    strings = ["%04d %03d %5d" % row for row in zip(self.year.tolist(),
+                                                    self.doy.tolist(),
+                                                    self.seconds.tolist())]
+    column = DatesTimes.parse_column(strings)
+    self.assertEqual(column.format, "VSR")
+    self.assertFalse(column.unmatched.any())
+    expected = DatesTimes.VSR_array_to_timestamp(self.year, self.doy,
+                                                 self.seconds)
+    self.assertEqual(column.times.tolist(), expected.tolist())
+
+  def test_script_times(self):
+    year = 2016
+    script = ["%03d/%02d:%02d:%02d" % ((doy,) + hms)
+              for doy, hms in zip(self.doy.tolist(), self.hms)]
+    column = DatesTimes.parse_column(script, year=year)
+    self.assertEqual(column.format, "script")
+    self.assertEqual(column.times.tolist(),
+                     [DatesTimes.VSR_script_time_to_timestamp(year, s)
+                      for s in script])
+    macro = [s.replace("/", "_") for s in script]
+    column = DatesTimes.parse_column(numpy.array(macro, dtype="S"), year=year)
+    self.assertEqual(column.format, "macro")
+    self.assertEqual(column.times.tolist(),
+                     [DatesTimes.macro_log_time_to_UnixTime(year, s)
+                      for s in macro])
+    wvsr = ["16/" + s.replace("/", " ") for s in script]
+    column = DatesTimes.parse_column(wvsr)
+    self.assertEqual(column.format, "WVSR")
+    self.assertEqual(column.times.tolist(),
+                     [DatesTimes.WVSR_script_time_to_timestamp(*s.split())
+                      for s in wvsr])
+    self.assertRaises(ValueError, DatesTimes.parse_column, script)
+
+  def test_logtimes(self):
+    lines = ["%02d:%02d:%02d" % hms for hms in self.hms]
+    lines[7] = "header"
+    lines[9] = "25:00:00"
+    column = DatesTimes.parse_column(lines, year=2020, doy=366)
+    self.assertEqual(column.format, "logtime")
+    self.assertEqual(numpy.flatnonzero(column.unmatched).tolist(), [7, 9])
+    del lines[9]
+    expected = list(DatesTimes.iter_logtimes(io.StringIO("\n".join(lines)),
+                                             2020, 366))
+    self.assertEqual(column.times[~column.unmatched].tolist(), expected)
+
+  def test_ISO(self):
+    strings = ["2020-01-02T03:04:05", "2020-123T12:00", "not a time",
+               "20200102T030405"]
+    column = DatesTimes.parse_column(numpy.array(strings).reshape(2, 2))
+    self.assertEqual(column.format, "ISO")
+    self.assertEqual(column.unmatched.tolist(), [[False, False],
+                                                 [True, False]])
+    expected = DatesTimes.ISOtime_array(strings, dtype="int64")/1e6
+    self.assertEqual(column.times.ravel()[[0, 1, 3]].tolist(),
+                     expected[[0, 1, 3]].tolist())
+
+  def test_unmatched(self):
+    strings = ["2020 123 12345", "2020 123 1 345", "2020 366 00001",
+               "2020 367 00001", "2021 366 00001", "2020 123 86400",
+               "2020 123 12345 ", "2020/123 12345", ""]
+    column = DatesTimes.parse_column(strings)
+    self.assertEqual(column.format, "VSR")
+    self.assertEqual(numpy.flatnonzero(~column.unmatched).tolist(), [0, 2])
+    self.assertTrue(numpy.isnan(column.times[column.unmatched]).all())
+    column = DatesTimes.parse_column(["junk"])
+    self.assertIsNone(column.format)
+    self.assertTrue(column.unmatched.all())
+    column = DatesTimes.parse_column([])
+    self.assertIsNone(column.format)
+    self.assertEqual(column.times.shape, (0,))
+
+  def test_buffer(self):
+    column = DatesTimes.parse_column(b"12:00:00\n13:00:00\n", year=2020, doy=1)
+    self.assertEqual(column.times.tolist(),
+                     DatesTimes.VSR_array_to_timestamp(2020, 1,
+                                                       [43200, 46800]).tolist())
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,96 @@
+"""
+unittest for the DatesTimes array formatters
+"""
+import unittest
+import datetime
+import numpy
+import DatesTimes
+from DatesTimes import formatters
+
+class testFormatters(unittest.TestCase):
+
+  def test_named_formats(self):
+    times = numpy.array([1270956345, 0, 4102444799, -1])
+    for name, pattern in formatters.named_formats.items():
+      text = DatesTimes.format_times(times, name)
+      self.assertEqual(text.dtype, numpy.dtype("S%d" % len(
+                                 DatesTimes.format_times([0], name)[0])))
+      for UnixTime, string in zip(times.tolist(), text.tolist()):
+        dt = datetime.datetime(1970, 1, 1) + datetime.timedelta(
+                                                       seconds=UnixTime)
+        expected = dt.strftime(pattern.replace("%5S", "%%5d").replace(
+                                                         "%3f", "000"))
+        if "%5d" in expected:
+          expected = expected % (UnixTime % 86400)
+        self.assertEqual(string.decode(), expected)
+
+  def test_scalar_equivalents(self):
+    UnixTime = 1270956345
+    self.assertEqual(DatesTimes.format_times([UnixTime], "VSR_script_time")[0],
+                     DatesTimes.VSR_script_time(101, 3, 25, 45).encode())
+    self.assertEqual(DatesTimes.format_times([UnixTime], "ISOtime")[0],
+                     DatesTimes.VSR_timestring_to_ISOtime(
+                                               (2010, 101, 12345)).encode())
+    self.assertEqual(DatesTimes.format_times([UnixTime], "date_string")[0],
+                     DatesTimes.make_date_string((2010, 4, 11)).encode())
+
+  def test_directives(self):
+    fmt = DatesTimes.compile_format("%5S|%05S|%2S|%3f|%%\n")
+    self.assertEqual(fmt.width, 21)
+    self.assertEqual(fmt.format([59.25, 86399.5], unit="s").tobytes(),
+                     b"   59|00059|59|250|%\n86399|86399|99|500|%\n")
+    self.assertEqual(fmt.format(numpy.array([59250], dtype="int64"),
+                                unit="ms")[0], b"   59|00059|59|250|%\n")
+    times = numpy.array([["2020-06-19T12:34:56.789"]], dtype="datetime64[ms]")
+    self.assertEqual(DatesTimes.format_times(times, "with_ms"),
+                     numpy.array([[b"2020-06-19 12:34:56.789"]]))
+    self.assertEqual(DatesTimes.format_times(
+                       DatesTimes.TimeArray.from_unix([1.5]), "%S.%1f")[0],
+                     b"01.5")
+    self.assertIs(DatesTimes.compile_format("%Y"),
+                  DatesTimes.compile_format("%Y"))
+    self.assertRaises(ValueError, DatesTimes.TimeFormat, "%Q")
+    self.assertRaises(ValueError, DatesTimes.TimeFormat, "%3Y")
+    self.assertRaises(ValueError, DatesTimes.format_times, [0], "%Y", "h")
+
+  def test_float_fractions(self):
+    # fractions which floats do not hold exactly are rounded to microseconds
+    # as datetime rounds them
+    times = [1592570096.001, 1592570096.007, 1592570096.123, 0.999,
+             1592570096.9999996, -0.0000001, -1.001]
+    random = numpy.random.RandomState(6)
+    times += (random.randint(0, 2*10**12, 1000)/1000.).tolist()
+    for UnixTime, string in zip(times,
+                                DatesTimes.format_times(times, "with_ms")):
+      dt = datetime.datetime.fromtimestamp(UnixTime, datetime.timezone.utc)
+      self.assertEqual(string.decode(),
+                       dt.strftime("%Y-%m-%d %H:%M:%S.%f")[:-3])
+    self.assertEqual(DatesTimes.format_times([1.007], "%S.%6f", "s")[0],
+                     b"01.007000")
+    self.assertEqual(DatesTimes.format_times([1007.], "%S.%3f", "ms")[0],
+                     b"01.007")
+
+  def test_missing_times(self):
+    self.assertEqual(DatesTimes.format_times([numpy.nan, 0.], "%Y %j\n")
+                     .tolist(), [b"NaT     \n", b"1970 001\n"])
+    times = numpy.array(["NaT", "2020-06-19"], dtype="datetime64[s]")
+    self.assertEqual(DatesTimes.format_times(times, "date_string").tolist(),
+                     [b"NaT       ", b"2020-06-19"])
+    self.assertEqual(str(times[0]), "NaT")
+    array = DatesTimes.TimeArray.from_unix([numpy.nan, 1.5])
+    self.assertEqual(DatesTimes.format_times(array, "%S.%1f").tolist(),
+                     [b"NaT ", b"01.5"])
+    self.assertEqual(DatesTimes.format_times(array, "%S").tolist(),
+                     [b"  ", b"01"])
+
+  def test_civil_from_days(self):
+    days = numpy.array([-719162, -1, 0, 11016, 47481, 2932896])
+    civil = DatesTimes.day_table.civil_from_days(days)
+    for i, day in enumerate(days.tolist()):
+      date = datetime.date.fromordinal(day + 719163)
+      self.assertEqual([column[i] for column in civil],
+                       [date.year, date.month, date.day,
+                        date.timetuple().tm_yday])
+
+if __name__ == "__main__":
+  unittest.main()
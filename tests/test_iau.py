@@ -0,0 +1,49 @@
+"""
+unittest for IAU names of whole catalogs
+"""
+import unittest
+import numpy
+import DatesTimes
+
+class testIAUNames(unittest.TestCase):
+
+  def test_scalar_signs(self):
+    self.assertEqual(DatesTimes.deg_to_IAU_str((12.5, 0.)), "1230+0000")
+    self.assertEqual(DatesTimes.deg_to_IAU_str((12.5, -0.5)), "1230-0030")
+    self.assertEqual(DatesTimes.deg_to_IAU_str((12.5, -30.25)), "1230-3015")
+    self.assertEqual(DatesTimes.deg_to_IAU_str((187.5, -0.5), "d"),
+                     "18730-0030")
+
+  def test_matches_scalar(self):
+    random = numpy.random.RandomState(3)
+    hours = numpy.concatenate((random.uniform(0, 24, 3000), [0, 12.25, 23.99]))
+    degrees = numpy.concatenate((random.uniform(0, 360, 3000),
+                                 [0.05, 12.25, 359.94]))
+    latitude = numpy.concatenate((random.uniform(-90, 90, 3000),
+                                  [0., -0.5, -0.04]))
+    # ties at the rounding of the 'g' format
+    latitude[:100] = numpy.round(latitude[:100], 2)
+    for format, longitude in (("h", hours), ("d", degrees), ("g", degrees)):
+      names = DatesTimes.deg_to_IAU_str((longitude, latitude), format)
+      expected = [DatesTimes.deg_to_IAU_str((lon, lat), format).encode()
+                  for lon, lat in zip(longitude.tolist(), latitude.tolist())]
+      self.assertEqual(names.tolist(), expected)
+    names = DatesTimes.IAU_names([[12.5]], [[-30.25]], prefix="J")
+    self.assertEqual(names.tolist(), [[b"J1230-3015"]])
+    self.assertRaises(ValueError, DatesTimes.IAU_names, [-1.], [0.])
+
+  def test_name_index(self):
+    index = DatesTimes.IAUNameIndex.from_positions([12.5, 1., 12.51, 12.5],
+                                                   [-30.25, 2., -30.26, 45.],
+                                                   prefix="J")
+    self.assertEqual(index["J0100+0200"], 1)
+    self.assertIn(b"J1230-3015", index)
+    self.assertNotIn("J0000+0000", index)
+    self.assertEqual(index.rows("J1230-3015"), [0, 2])
+    self.assertEqual(index.rows("J1230+4500"), [3])
+    self.assertEqual(index.rows("J0000+0000"), [])
+    self.assertEqual(list(index.lookup(["J1230-3015", "J0000+0000",
+                                        "J1230+4500"])), [0, -1, 3])
+
+if __name__ == "__main__":
+  unittest.main()
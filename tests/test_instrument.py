@@ -0,0 +1,57 @@
+"""
+unittest for the instrumentation of DatesTimes functions
+"""
+import unittest
+import io
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import DatesTimes
+from DatesTimes import instrument
+
+class testInstrument(unittest.TestCase):
+
+  def tearDown(self):
+    instrument.disable()
+    instrument.statistics.clear()
+
+  def test_enable_and_disable(self):
+    original = DatesTimes.VSR_to_datetime
+    instrument.enable(["VSR_to_datetime", "make_VSR_timestring"])
+    self.assertEqual(instrument.enabled(),
+                     ["VSR_to_datetime", "make_VSR_timestring"])
+    self.assertIsNot(DatesTimes.VSR_to_datetime, original)
+    # calls through aliases and from other functions are counted
+    DatesTimes.VSR_timestamp()
+    DatesTimes.VSR_to_timetuple((2010, 101, 12345))
+    DatesTimes.VSR_to_datetime((2010, 101, 12345))
+    stats = instrument.report()
+    self.assertEqual(stats["VSR_to_datetime"]["calls"], 2)
+    self.assertEqual(stats["make_VSR_timestring"]["calls"], 1)
+    self.assertEqual(sum(stats["VSR_to_datetime"]["histogram"].values()), 2)
+    output = io.StringIO()
+    instrument.dump(output)
+    self.assertEqual(json.loads(output.getvalue()), stats)
+    instrument.disable()
+    self.assertIs(DatesTimes.VSR_to_datetime, original)
+    instrument.reset()
+    self.assertEqual(instrument.report(), {})
+    self.assertIn("calendar_date", instrument.instrumentable())
+
+  def test_environment(self):
+    with tempfile.TemporaryDirectory() as directory:
+      output = os.path.join(directory, "stats.json")
+      environment = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path),
+                         DATESTIMES_INSTRUMENT="day_of_year,calendar_date",
+                         DATESTIMES_INSTRUMENT_FILE=output)
+      subprocess.run([sys.executable, "-c",
+                      "import DatesTimes; DatesTimes.day_of_year(2020, 6, 19)"],
+                     env=environment, check=True)
+      with open(output) as f:
+        stats = json.load(f)
+    self.assertEqual(stats["day_of_year"]["calls"], 1)
+
+if __name__ == "__main__":
+  unittest.main()
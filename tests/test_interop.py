@@ -0,0 +1,58 @@
+"""
+unittest for sharing times with pandas and Arrow
+"""
+import unittest
+import importlib
+import numpy
+import DatesTimes
+
+def installed(name):
+  try:
+    importlib.import_module(name)
+  except ImportError:
+    return False
+  return True
+
+class testInterop(unittest.TestCase):
+
+  def setUp(self):
+    self.unix = numpy.array([0., 1592570096.5, numpy.nan])
+
+  def test_as_time_array(self):
+    times = DatesTimes.as_time_array(self.unix)
+    self.assertIs(DatesTimes.as_time_array(times), times)
+    numpy.testing.assert_array_equal(
+      DatesTimes.as_time_array(times.mjd[:2], "mjd").ns, times.ns[:2])
+    vsr = DatesTimes.as_time_array(([2020], [171], [45296.5]), "vsr")
+    self.assertEqual(vsr.unix[0], 1592570096.5)
+    self.assertRaises(ValueError, DatesTimes.as_time_array, self.unix, "jd")
+
+  @unittest.skipIf(installed("pandas"), "pandas is installed")
+  def test_missing_pandas(self):
+    self.assertRaises(ImportError, DatesTimes.to_pandas, self.unix)
+
+  @unittest.skipUnless(installed("pandas"), "needs pandas")
+  def test_pandas(self):
+    times = DatesTimes.TimeArray.from_unix(self.unix)
+    index = DatesTimes.to_pandas(times)
+    self.assertTrue(numpy.shares_memory(index.asi8, times.ns))
+    back = DatesTimes.from_pandas(index)
+    self.assertTrue(numpy.shares_memory(back.ns, times.ns))
+    self.assertTrue(index.isna()[2])
+    self.assertEqual(str(DatesTimes.to_pandas(self.unix[:2], tz="UTC")[1]),
+                     "2020-06-19 12:34:56.500000+00:00")
+
+  @unittest.skipUnless(installed("pyarrow"), "needs pyarrow")
+  def test_arrow(self):
+    times = DatesTimes.TimeArray.from_unix(self.unix)
+    array = DatesTimes.to_arrow(times)
+    self.assertEqual(array.null_count, 1)
+    self.assertEqual(array.buffers()[1].address, times.ns.ctypes.data)
+    back = DatesTimes.from_arrow(array)
+    numpy.testing.assert_array_equal(back.ns, times.ns)
+    array = DatesTimes.to_arrow(times[:2])
+    back = DatesTimes.from_arrow(array)
+    self.assertTrue(numpy.shares_memory(back.ns, times.ns))
+
+if __name__ == "__main__":
+  unittest.main()
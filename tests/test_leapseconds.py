@@ -0,0 +1,66 @@
+"""
+unittest for the DatesTimes leap second table
+"""
+import unittest
+import os
+import tempfile
+import numpy
+import DatesTimes
+from DatesTimes import leapseconds
+
+IERS = """#  File expires on 28 June 2026
+#    MJD        Date        TAI-UTC (s)
+#           day month year
+    41317.0    1  1 1972       10
+    41499.0    1  7 1972       11
+    57754.0    1  1 2017       37
+"""
+
+NIST = """#	leap-seconds.list
+#@	3991593600
+2272060800	10	# 1 Jan 1972
+2287785600	11	# 1 Jul 1972
+3692217600	37	# 1 Jan 2017
+"""
+
+class testLeapSeconds(unittest.TestCase):
+
+  def tearDown(self):
+    leapseconds.table = leapseconds.from_dates(leapseconds.bundled)
+
+  def test_offsets(self):
+    self.assertEqual(DatesTimes.TAI_minus_UTC(1483228799), 36)
+    self.assertEqual(DatesTimes.TAI_minus_UTC(1483228800), 37)
+    self.assertEqual(DatesTimes.TAI_minus_UTC(0), 10)
+    times = numpy.array([0, 78796799, 78796800, 1483228800.5])
+    self.assertEqual(list(DatesTimes.TAI_minus_UTC(times)), [10, 10, 11, 37])
+    self.assertEqual(list(DatesTimes.TAI_minus_UTC(times)),
+                     [DatesTimes.TAI_minus_UTC(t) for t in times.tolist()])
+
+  def test_conversions(self):
+    self.assertEqual(DatesTimes.UTC_to_GPS(DatesTimes.leapseconds.GPS_epoch), 0)
+    self.assertEqual(DatesTimes.UTC_to_GPS(1483228800), 1167264018)
+    times = numpy.linspace(0, 2e9, 1001)
+    self.assertTrue((DatesTimes.GPS_to_UTC(DatesTimes.UTC_to_GPS(times))
+                     == times).all())
+    # the leap second before 2017 has no UNIX time of its own
+    self.assertEqual(list(DatesTimes.TAI_to_UTC([1483228835, 1483228836,
+                                                 1483228837])),
+                     [1483228799, 1483228800, 1483228800])
+
+  def test_load(self):
+    for text, expires in ((IERS, 1782604800), (NIST, 1782604800)):
+      with tempfile.NamedTemporaryFile("w", suffix=".txt",
+                                       delete=False) as f:
+        f.write(text)
+      try:
+        table = DatesTimes.load_leap_seconds(f.name)
+      finally:
+        os.unlink(f.name)
+      self.assertEqual(table.starts, [63072000, 78796800, 1483228800])
+      self.assertEqual(table.offsets, [10, 11, 37])
+      self.assertEqual(table.expires, expires)
+      self.assertEqual(DatesTimes.TAI_minus_UTC(1e9), 11)
+
+if __name__ == "__main__":
+  unittest.main()
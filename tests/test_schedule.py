@@ -0,0 +1,65 @@
+"""
+unittest for the DSN schedule index
+"""
+import unittest
+import numpy
+import DatesTimes
+
+SCHEDULE = """DATE      BOT  EOT  ANT     PROJECT
+2020-366  2200 0130 DSS-43  VGR2
+2020-366  2330 2400 DSS-14  MRO
+# comment
+2021-001  0100 0300 DSS-63  JUNO
+"""
+
+class testSchedule(unittest.TestCase):
+
+  def setUp(self):
+    self.index = DatesTimes.parse_schedule(SCHEDULE.splitlines())
+    self.midnight = int(DatesTimes.VSR_array_to_timestamp(2021, 1, 0))
+
+  def test_queries(self):
+    index = self.index
+    self.assertEqual(len(index), 3)
+    self.assertEqual([p[4] for p in index.at(self.midnight - 60)],
+                     ["VGR2", "MRO"])
+    self.assertEqual([p[4] for p in index.at(self.midnight)], ["VGR2"])
+    self.assertEqual([p[4] for p in index.at(self.midnight + 5400)], ["JUNO"])
+    self.assertEqual([p[4] for p in index.overlapping(self.midnight,
+                                                      self.midnight + 3600)],
+                     ["VGR2"])
+    self.assertEqual(list(index.active(self.midnight
+                                       + numpy.array([-7201, -60, 0, 5000,
+                                                      5400, 20000]))),
+                     [-1, 1, 0, 2, 2, -1])
+
+  def test_matches_linear_scan(self):
+    random = numpy.random.RandomState(2)
+    starts = random.uniform(0, 10**6, 300)
+    ends = starts + random.exponential(20000, 300)
+    index = DatesTimes.ScheduleIndex(starts[:200], ends[:200])
+    # an out of order week, and one after the rest
+    index.append(starts[200:250], ends[200:250])
+    index.append(starts[250:] + 10**6, ends[250:] + 10**6)
+    starts[250:] += 10**6
+    ends[250:] += 10**6
+    times = random.uniform(0, 2*10**6, 2000)
+    active = index.active(times)
+    for time, row in zip(times, active):
+      rows = numpy.flatnonzero((starts <= time) & (time < ends))
+      self.assertEqual(sorted(index.at(time)), list(rows))
+      expected = rows[numpy.argmax(starts[rows])] if len(rows) else -1
+      self.assertEqual(row, expected)
+    rows = numpy.flatnonzero((starts < 5*10**5) & (ends > 4*10**5))
+    self.assertEqual(sorted(index.overlapping(4*10**5, 5*10**5)), list(rows))
+
+  def test_append_lines_and_errors(self):
+    DatesTimes.parse_schedule(["2021-002 0000 0100 DSS-43 VGR2"],
+                              index=self.index)
+    self.assertEqual(self.index.at(self.midnight + 86400)[0][0], "2021-002")
+    self.assertRaises(ValueError, DatesTimes.parse_schedule,
+                      ["2021-002 0060 0100"])
+    self.assertRaises(ValueError, self.index.append, [2], [1])
+
+if __name__ == "__main__":
+  unittest.main()
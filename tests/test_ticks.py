@@ -0,0 +1,50 @@
+"""
+unittest for the asyncio stream of VSR ticks
+"""
+import unittest
+import asyncio
+import DatesTimes
+
+class FakeClock(object):
+  """
+  A UNIX clock which advances only when slept on, plus extra delays
+  """
+  def __init__(self, now, delays=()):
+    self.now = now
+    self.delays = list(delays)
+
+  def __call__(self):
+    return self.now
+
+  async def sleep(self, seconds):
+    self.now += seconds + (self.delays.pop(0) if self.delays else 0)
+
+def ticks(clock, count, period=1):
+  async def collect():
+    return [tick async for tick in DatesTimes.VSR_ticks(count, period, clock,
+                                                         clock.sleep)]
+  return asyncio.run(collect())
+
+class testTicks(unittest.TestCase):
+
+  def test_new_year(self):
+    midnight = int(DatesTimes.VSR_array_to_timestamp(2021, 1, 0))
+    result = ticks(FakeClock(midnight - 1.7), 3)
+    self.assertEqual([tick.string for tick in result],
+                     ["2020 366 86398", "2020 366 86399", "2021 001     0"])
+    self.assertEqual(result[1].time, midnight)
+    self.assertEqual(result[2][1:4], (2021, 1, 0))
+    # labelled as make_VSR_timestring() labels the time
+    self.assertEqual(result[0].string,
+                     DatesTimes._render_VSR_timestring(midnight - 1))
+
+  def test_missed_ticks(self):
+    result = ticks(FakeClock(1000.2, [0, 2.5]), 3)
+    self.assertEqual([tick.time for tick in result], [1001, 1004, 1005])
+    self.assertEqual([tick.missed for tick in result], [0, 2, 0])
+    self.assertEqual([tick.time for tick in ticks(FakeClock(1000.2), 2, 5)],
+                     [1005, 1010])
+    self.assertRaises(ValueError, ticks, FakeClock(0), 1, 0.5)
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,71 @@
+"""
+unittest for DatesTimes.TimeArray
+"""
+import unittest
+import numpy
+import DatesTimes
+
+class testTimeArray(unittest.TestCase):
+
+  def setUp(self):
+    self.year = numpy.array([2020, 2020, 1969])
+    self.doy = numpy.array([171, 172, 365])
+    self.seconds = numpy.array([45296.5, 0, 86399.25])
+    self.times = DatesTimes.TimeArray.from_vsr(self.year, self.doy,
+                                               self.seconds)
+
+  def test_views(self):
+    times = self.times
+    unix = DatesTimes.VSR_array_to_timestamp(self.year, self.doy, self.seconds)
+    self.assertEqual(list(times.unix), list(unix))
+    numpy.testing.assert_allclose(times.mjd, DatesTimes.UnixTime_to_MJD(unix))
+    numpy.testing.assert_allclose(times.jd, times.mjd + 2400000.5)
+    numpy.testing.assert_allclose(times.mpl, DatesTimes.UnixTime_to_MPL(unix))
+    for column, expected in zip(times.vsr,
+                                (self.year, self.doy, self.seconds)):
+      self.assertEqual(list(column), list(expected))
+    self.assertEqual(times.iso[0], "2020-06-19T12:34:56.500000")
+    self.assertTrue(numpy.shares_memory(times.datetime64, times.ns))
+    self.assertIs(times.unix, times.unix)
+
+  def test_integer_keys(self):
+    mjd = self.times.mjd
+    for key in (0, -1, numpy.int64(1)):
+      item = self.times[key]
+      self.assertIsInstance(item, DatesTimes.TimeArray)
+      self.assertEqual(len(item), 1)
+      self.assertEqual(list(item.ns), [self.times.ns[key]])
+      self.assertEqual(list(item.mjd), [mjd[key]])
+    self.assertTrue(numpy.shares_memory(self.times[1].ns, self.times.ns))
+    self.assertRaises(IndexError, self.times.__getitem__, 3)
+    grid = DatesTimes.TimeArray(self.times.ns.reshape(3, 1))
+    self.assertEqual(grid[0].shape, (1,))
+    self.assertEqual(grid[0, 0].shape, (1,))
+
+  def test_small_integer_seconds(self):
+    rows = numpy.array([[2010, 15, 16212], [2010, 16, 16212]],
+                       dtype=numpy.int32)
+    self.assertEqual(list(DatesTimes.TimeArray.from_vsr(rows).unix),
+                     [1263529812, 1263616212])
+
+  def test_slicing(self):
+    mjd = self.times.mjd
+    part = self.times[1:]
+    self.assertEqual(len(part), 2)
+    self.assertTrue(numpy.shares_memory(part.ns, self.times.ns))
+    self.assertTrue(numpy.shares_memory(part.mjd, mjd))
+    self.assertEqual(list(part.vsr[1]), [172, 365])
+
+  def test_constructors(self):
+    unix = self.times.unix
+    for times in (DatesTimes.TimeArray.from_unix(unix),
+                  DatesTimes.TimeArray.from_mjd(self.times.mjd),
+                  DatesTimes.TimeArray.from_mpl(self.times.mpl),
+                  DatesTimes.TimeArray.from_datetime64(self.times.datetime64)):
+      numpy.testing.assert_allclose(times.unix, unix, atol=1e-5)
+    times = DatesTimes.TimeArray.from_iso(["2020-06-19T12:34:56", "junk"])
+    self.assertEqual(times.unix[0], 1592570096)
+    self.assertTrue(numpy.isnan(times.unix[1]))
+
+if __name__ == "__main__":
+  unittest.main()
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+A stream of VSR time stamps, one at each second of UT, for asyncio
+
+A recorder which calls make_VSR_timestring() after time.sleep(1) drifts by
+the time each pass takes, and incr_VSR_timestring() does not handle
+midnight.  VSR_ticks() sleeps until absolute deadlines on whole seconds of
+the system clock, so the error does not accumulate, and renders the stamp
+for each deadline before sleeping::
+
+  async for tick in VSR_ticks():
+    record(tick.string)
+    if tick.missed:
+      logger.warning("%d seconds missed before %s", tick.missed, tick.string)
+
+A tick is labelled as make_VSR_timestring() labels the time, with the second
+which has just ended, so the tick at 00:00:00 on 2021 day 1 is
+'2020 366 86399'.  The year and day change with the label.
+
+If the loop is busy past the next deadline the ticks which were due are not
+delivered late; the next tick says how many were skipped.
+"""
+import asyncio
+from collections import namedtuple
+import math
+import time as T
+
+Tick = namedtuple("Tick", "time year doy seconds string missed")
+Tick.__doc__ = """
+One VSR time stamp
+
+  time    - the UNIX time of the deadline, a whole second
+  year    - year of the second which has just ended
+  doy     - day of year of that second
+  seconds - second of the day of that second
+  string  - 'YYYY DDD SSSSS'
+  missed  - number of ticks skipped before this one
+"""
+
+class _Labels(object):
+  """
+  VSR labels of whole UNIX seconds, with the date worked out once a day
+  """
+  def __init__(self):
+    self.day = None
+
+  def __call__(self, deadline):
+    """
+    (year, doy, seconds, string) for the second ending at 'deadline'
+    """
+    second = deadline - 1
+    day, seconds = divmod(second, 86400)
+    if day != self.day:
+      date = T.gmtime(day*86400)
+      self.day = day
+      self.year = date.tm_year
+      self.doy = date.tm_yday
+      self.prefix = "%04d %03d " % (self.year, self.doy)
+    return self.year, self.doy, seconds, self.prefix + ("%5d" % seconds)
+
+async def VSR_ticks(count=None, period=1, clock=T.time, sleep=asyncio.sleep):
+  """
+  Generates a Tick at every 'period' seconds of the UT clock
+
+  @param count : number of ticks; no limit if None
+  @type  count : int
+
+  @param period : whole seconds between ticks; the ticks fall on multiples
+                  of it
+  @type  period : int
+
+  @param clock : returns the UNIX time
+  @type  clock : function
+
+  @param sleep : coroutine function which waits for some seconds
+  @type  sleep : function
+
+  @return: asynchronous generator of Tick
+  """
+  if int(period) != period or period < 1:
+    raise ValueError("the period must be a whole number of seconds")
+  period = int(period)
+  labels = _Labels()
+  deadline = (math.floor(clock())//period + 1)*period
+  delivered = 0
+  while count is None or delivered < count:
+    missed = 0
+    year, doy, seconds, string = labels(deadline)
+    delay = deadline - clock()
+    if delay > 0:
+      await sleep(delay)
+    late = clock() - deadline
+    if late >= period:
+      # too late for this deadline; skip to the last one which has passed
+      missed = int(late//period)
+      deadline += missed*period
+      year, doy, seconds, string = labels(deadline)
+    yield Tick(deadline, year, doy, seconds, string, missed)
+    delivered += 1
+    deadline += period
@@ -0,0 +1,226 @@
+# -*- coding: utf-8 -*-
+"""
+Times held once as int64 nanoseconds with the other representations derived
+
+A pipeline often needs the same instants as UNIX times, MJDs, matplotlib
+dates and VSR tuples.  A TimeArray stores only the nanoseconds since
+1970-01-01 00:00:00 UT; each of the other forms is computed when it is first
+asked for and kept::
+
+  In [1]: t = TimeArray.from_vsr([2020, 2020], [171, 172], [45296.5, 0])
+  In [2]: t.mjd
+  Out[2]: array([59019.52426505, 59020.        ])
+  In [3]: t[1:].vsr
+  Out[3]: (array([2020]), array([172]), array([0.]))
+
+Slicing returns a TimeArray which shares the nanosecond buffer and the views
+already computed, so nothing is copied for basic slices.  The derived arrays
+are shared, not copied, and should be treated as read-only.
+"""
+import numpy
+
+from . import (MJD_to_UnixTime, MPLtime_to_UnixTime, UnixTime_to_MJD,
+               UnixTime_to_MPL, ISOtime_array, _NaT, _VSR_columns,
+               _unix_day_array)
+
+ns_per_sec = 1000000000
+ns_per_day = 86400*ns_per_sec
+
+class TimeArray(object):
+  """
+  Array of times as int64 nanoseconds since the UNIX epoch
+
+  Public attributes::
+
+    ns - the int64 nanoseconds, which may be a view of another array
+
+  The properties unix, mjd, jd, mpl, datetime64, vsr and iso give the times
+  in other forms.  NaT in the nanoseconds gives NaN in the float forms.
+  """
+  __slots__ = ("ns", "_views")
+
+  def __init__(self, ns):
+    """
+    @param ns : nanoseconds since 1970-01-01 00:00:00 UT
+    @type  ns : int64 array-like; int64 arrays are used without a copy
+    """
+    self.ns = numpy.asarray(ns, dtype=numpy.int64)
+    self._views = {}
+
+  @classmethod
+  def from_unix(cls, UnixTime):
+    """
+    TimeArray from UNIX times in seconds; NaN gives NaT
+    """
+    UnixTime = numpy.asarray(UnixTime, dtype=float)
+    ns = numpy.rint(UnixTime*ns_per_sec)
+    nan = numpy.isnan(ns)
+    if nan.any():
+      ns[nan] = 0
+      ns = ns.astype(numpy.int64)
+      ns[nan] = _NaT
+      return cls(ns)
+    return cls(ns.astype(numpy.int64))
+
+  @classmethod
+  def from_mjd(cls, MJD):
+    """
+    TimeArray from modified Julian dates
+    """
+    return cls.from_unix(MJD_to_UnixTime(numpy.asarray(MJD, dtype=float)))
+
+  @classmethod
+  def from_mpl(cls, MPLtime):
+    """
+    TimeArray from matplotlib date numbers
+    """
+    return cls.from_unix(MPLtime_to_UnixTime(numpy.asarray(MPLtime,
+                                                           dtype=float)))
+
+  @classmethod
+  def from_datetime64(cls, times):
+    """
+    TimeArray from datetime64 values of any unit
+    """
+    times = numpy.asarray(times).astype("datetime64[ns]")
+    return cls(times.view(numpy.int64))
+
+  @classmethod
+  def from_vsr(cls, year, doy=None, seconds=None):
+    """
+    TimeArray from VSR times as parallel arrays or an N x 3 array
+
+    The arguments are as for VSR_array_to_timestamp().
+    """
+    year, doy, seconds = _VSR_columns(year, doy, seconds)
+    ns = _unix_day_array(year, doy)*ns_per_day
+    if seconds.dtype.kind in "iu":
+      ns += seconds*ns_per_sec
+    else:
+      ns += numpy.rint(seconds*ns_per_sec).astype(numpy.int64)
+    return cls(ns)
+
+  @classmethod
+  def from_iso(cls, ISOtimes, record_length=None):
+    """
+    TimeArray from ISO time strings, as accepted by ISOtime_array()
+    """
+    microseconds = ISOtime_array(ISOtimes, dtype="int64",
+                                 record_length=record_length)
+    return cls(numpy.where(microseconds == _NaT, _NaT, microseconds*1000))
+
+  def __len__(self):
+    return len(self.ns)
+
+  def __getitem__(self, key):
+    """
+    TimeArray of the selected times, sharing the views already computed
+
+    An integer selects a TimeArray of one time, so the result is always an
+    array.
+    """
+    if isinstance(key, (int, numpy.integer)) and self.ns.ndim == 1:
+      index = range(len(self.ns))[key]
+      key = slice(index, index + 1)
+    item = TimeArray.__new__(TimeArray)
+    item.ns = self.ns[key]
+    item._views = {}
+    for name, value in self._views.items():
+      if name == "vsr":
+        item._views[name] = tuple(column[key] for column in value)
+      else:
+        item._views[name] = value[key]
+    if item.ns.ndim == 0:
+      # every axis was indexed by an integer
+      item.ns = item.ns.reshape(1)
+      for name, value in item._views.items():
+        if name == "vsr":
+          item._views[name] = tuple(numpy.reshape(column, 1)
+                                    for column in value)
+        else:
+          item._views[name] = numpy.reshape(value, 1)
+    return item
+
+  def __repr__(self):
+    return "TimeArray(%s)" % numpy.array2string(self.datetime64,
+                                                separator=", ")
+
+  @property
+  def shape(self):
+    return self.ns.shape
+
+  def _view(self, name, compute):
+    """
+    The view 'name', computed with 'compute()' the first time
+    """
+    try:
+      return self._views[name]
+    except KeyError:
+      value = self._views[name] = compute()
+      return value
+
+  @property
+  def unix(self):
+    """
+    UNIX times in seconds, float64
+    """
+    return self._view("unix", self._unix)
+
+  def _unix(self):
+    UnixTime = self.ns/ns_per_sec
+    nat = self.ns == _NaT
+    if nat.any():
+      UnixTime[nat] = numpy.nan
+    return UnixTime
+
+  @property
+  def mjd(self):
+    """
+    Modified Julian dates, float64
+    """
+    return self._view("mjd", lambda: UnixTime_to_MJD(self.unix))
+
+  @property
+  def jd(self):
+    """
+    Julian dates, float64
+    """
+    return self._view("jd", lambda: self.mjd + 2400000.5)
+
+  @property
+  def mpl(self):
+    """
+    matplotlib date numbers (days since 0001-01-01 plus one), float64
+    """
+    return self._view("mpl", lambda: UnixTime_to_MPL(self.unix))
+
+  @property
+  def datetime64(self):
+    """
+    datetime64[ns] view of the nanoseconds; no copy is made
+    """
+    return self._view("datetime64", lambda: self.ns.view("datetime64[ns]"))
+
+  @property
+  def vsr(self):
+    """
+    VSR times as a tuple of arrays (year, doy, seconds of day)
+    """
+    return self._view("vsr", self._vsr)
+
+  def _vsr(self):
+    days = self.ns // ns_per_day
+    seconds = (self.ns - days*ns_per_day)/ns_per_sec
+    date = days.astype("datetime64[D]")
+    year_start = date.astype("datetime64[Y]")
+    year = year_start.astype(numpy.int64) + 1970
+    doy = (date - year_start).astype(numpy.int64) + 1
+    return year, doy, seconds
+
+  @property
+  def iso(self):
+    """
+    ISO time strings to the microsecond, like 2020-06-19T12:34:56.500000
+    """
+    return self._view("iso", lambda: numpy.datetime_as_string(
+                                   self.datetime64.astype("datetime64[us]")))